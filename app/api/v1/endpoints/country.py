@@ -6,11 +6,12 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.db.session import get_db
 
 from app.db.repository.country import (
-    get_all_countrys,
     get_country_by_name,
     get_country_by_code
 )
 
+from app.services.lookup import get_lookup_registry
+
 from typing import List
 
 
@@ -19,10 +20,9 @@ router = APIRouter()
 
 @router.get('/', response_model=List[CountryResponse])
 async def fetch_all_countrys(
-    lang: str,
-    db: AsyncSession = Depends(get_db)
+    lang: str
 ):
-    countrys = await get_all_countrys(db, lang)
+    countrys = get_lookup_registry().get_countries(lang)
 
     return countrys
 
@@ -1,6 +1,6 @@
 import re
+import json
 import aiofiles
-import asyncio
 from datetime import datetime, time
 
 from fastapi import (
@@ -12,10 +12,9 @@ from fastapi import (
     status,
     UploadFile,
     File,
-    Form
+    Form,
+    Response
 )
-from fastapi.responses import FileResponse
-from icalendar import Calendar, Event as ICalEvent
 
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import IntegrityError
@@ -26,88 +25,449 @@ import os
 import mimetypes
 import xml.etree.ElementTree as ET
 
-from PIL import Image as PILImage
-
 from app.core.config import settings
-from app.db.session import get_db
+from app.db.session import get_db, AsyncSessionLocal
 
 from app.db.repository.event import (
+    EVENT_DEFAULT_FIELDS,
+    EVENT_LIST_FIELDS,
+    FACET_FILTERS,
     add_event_image,
-    add_event_link_image,
-    add_event_link_type,
-    get_events_by_filter,
-    get_events_sort_by,
+    add_event_link_types,
+    get_events_by_filter_document,
+    get_events_by_filter_stmt,
+    get_events_sort_by_document,
+    get_events_sort_by_stmt,
+    get_events_near,
+    get_events_validator,
+    get_event_facets,
     get_simple_event_by_id,
     get_simple_event_date_by_id,
     add_event
 )
 
 from app.db.repository.event_date import (
-    add_event_date,
+    add_event_dates,
+    sync_event_dates,
+    refresh_event_date_references,
     get_event_by_event_date_id,
+    get_events_by_event_date_ids,
+    get_event_date_validator,
+    get_event_dates_validator,
     get_event_detail_by_event_date_id
 )
 
-from app.db.repository.genre_type import (
-    get_genre_types_by_event_id,
-    add_genre_link_type,
-    delete_genre_link_type
-)
-
-from app.db.repository.event_type import (
-    get_event_types_by_event_id,
-    delete_event_link_type
-)
+from app.db.repository.genre_type import add_genre_link_types
+from app.db.repository.link import sync_links
 
 from app.db.repository.image import (
     get_main_image_id_by_event_id
 )
 
+from app.db.repository.event_search import refresh_event_search
+from app.db.repository.event_import import import_events
+
+from app.models.event_link_types import EventLinkTypes
+from app.models.genre_link_types import GenreLinkTypes
 from app.models.user import User
 
 from app.schemas.image import ImageCreate
 from app.schemas.event import (
     EventCreate,
     EventResponse,
-    EventQueryResponse
+    EventQueryPage,
+    EventNearResponse,
+    EventFacetsResponse,
+    EventImportResponse
 )
 
-from app.schemas.event_date import EventDateResponse
+from app.schemas.event_date import EventDateBatchResponse, EventDateResponse
 
 from app.enum.sort_order import SortOrder
+from app.core.cursor import encode_cursor, decode_cursor
+from app.core.parser import parse_date_range
+from app.core.recurrence import (
+    MAX_SERIES_DATES,
+    expand_recurrence,
+    get_recurrence_rule
+)
 
 from app.services.auth import get_current_user
+from app.services.batch import get_batch_response, parse_batch_ids
+from app.services.calendar import (
+    calendar_cache,
+    event_feed_response,
+    render_calendar
+)
+from app.services.event_import import get_import_format, parse_import_rows
+from app.services.fields import parse_fields
+from app.services.image_pipeline import image_pipeline
+from app.services.conditional import (
+    conditional_response,
+    get_etag,
+    get_validator_headers,
+    is_not_modified
+)
+from app.services.lookup import get_lookup_registry
+from app.services.response_cache import (
+    EVENT_CACHE_TAGS,
+    encode_response,
+    response_cache
+)
+from app.services.streaming import get_stream_format, streaming_response
 from app.services.validators import validate_image
 
 
 router = APIRouter()
 
-MAX_IMAGE_PX_SIZE = 1920
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+EVENT_PAGE_SIZE = 50
+MAX_EVENT_PAGE_SIZE = 200
+EVENT_NEAR_RADIUS = 5000
+MAX_EVENT_NEAR_RADIUS = 100000
 
+# facet -> lookup table naming its type ids
+FACET_TYPE_TABLES = {
+    'event_types': 'event_type',
+    'genre_types': 'genre_type',
+    'venue_types': 'venue_type'
+}
 
-@router.get('/{event_date_id}', response_model=EventDateResponse)
-async def fetch_event_by_event_date_id(
+
+def parse_cursor(cursor: Optional[str], size: int):
+    if not cursor:
+        return None
+
+    try:
+        return decode_cursor(cursor, size)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+
+def encode_event_page(document: str, next_cursor: Optional[str]) -> bytes:
+    '''
+    Embed the events array built by Postgres into an EventQueryPage body
+    without parsing it.
+    '''
+    return b''.join([
+        b'{"events":',
+        document.encode(),
+        b',"next_cursor":',
+        json.dumps(next_cursor).encode(),
+        b'}'
+    ])
+
+
+def get_event_fields(fields: Optional[List[str]], teaser: bool):
+    '''
+    The requested list columns, teaser mode returns the short event_teaser
+    in place of the full event_description.
+    '''
+    selected = parse_fields(fields, EVENT_LIST_FIELDS)
+
+    if not teaser:
+        return selected
+
+    selected = selected or EVENT_DEFAULT_FIELDS
+
+    if 'event_description' not in selected:
+        return selected
+
+    return tuple(
+        name for name in EVENT_LIST_FIELDS
+        if name == 'event_teaser'
+        or (name in selected and name != 'event_description')
+    )
+
+
+def get_active_filters(filters: dict):
+    active_filters = {
+        key: value for key, value in filters.items()
+        if value not in [None, '']
+    }
+
+    for key in ['date', 'date_start', 'date_end']:
+        if key in active_filters:
+            try:
+                parse_date_range(active_filters[key])
+            except ValueError as e:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=str(e)
+                )
+
+    return active_filters
+
+
+@router.get('/sort', response_model=EventQueryPage)
+async def fetch_events_sort_by(
     request: Request,
-    lang: str,
-    event_date_id: int,
+    order_by: SortOrder = SortOrder.asc,
+    limit: Optional[int] = Query(None, ge=1, le=MAX_EVENT_PAGE_SIZE),
+    cursor: Optional[str] = Query(None),
+    format: Optional[str] = Query(None),
+    fields: Optional[List[str]] = Query(None),
+    teaser: bool = Query(False)
+):
+    base_url = str(request.base_url)
+    stream_format = get_stream_format(request, format)
+    selected = get_event_fields(fields, teaser)
+
+    # streamed responses return every row unless a limit is given
+    if stream_format:
+        stmt, params = get_events_sort_by_stmt(
+            order_by, base_url,
+            limit=limit,
+            cursor=parse_cursor(cursor, 3),
+            fields=selected
+        )
+
+        return streaming_response(stmt, stream_format, 'events', params)
+
+    limit = limit or EVENT_PAGE_SIZE
+    after = parse_cursor(cursor, 3)
+
+    async def render():
+        async with AsyncSessionLocal() as session:
+            page = await get_events_sort_by_document(
+                session, order_by, base_url,
+                limit=limit + 1,
+                cursor=after,
+                fields=selected
+            )
+
+        if page['count'] < 1:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f'No events found for order_by: {order_by}'
+            )
+
+        next_cursor = None
+
+        if page['count'] > limit:
+            next_cursor = encode_cursor(
+                page['event_created_at'],
+                page['event_id'],
+                page['event_date_id']
+            )
+
+        return encode_event_page(page['document'], next_cursor)
+
+    async def validate(session):
+        return await get_events_validator(session)
+
+    return await conditional_response(
+        request, validate, render, EVENT_CACHE_TAGS
+    )
+
+
+@router.get('/near', response_model=List[EventNearResponse])
+async def fetch_events_near(
+    request: Request,
+    lat: float = Query(..., ge=-90, le=90),
+    lon: float = Query(..., ge=-180, le=180),
+    radius: int = Query(EVENT_NEAR_RADIUS, ge=1, le=MAX_EVENT_NEAR_RADIUS),
+    date: Optional[str] = Query(None),
+    lang: str = Query('de'),
+    limit: int = Query(EVENT_PAGE_SIZE, ge=1, le=MAX_EVENT_PAGE_SIZE),
     db: AsyncSession = Depends(get_db)
 ):
+    if date:
+        try:
+            parse_date_range(date)
+        except ValueError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(e)
+            )
+
     base_url = str(request.base_url)
+    events = await get_events_near(
+        db, lat, lon, radius, base_url, lang, date, limit
+    )
 
-    event = await get_event_by_event_date_id(db, base_url, event_date_id, lang)
+    return events
 
-    if not event:
+
+@router.get('/facets', response_model=EventFacetsResponse)
+async def fetch_event_facets(
+    request: Request,
+    city: Optional[str] = Query(None),
+    postal_code: Optional[str] = Query(None),
+    venue_id: Optional[List[int]] = Query(None),
+    event_id: Optional[List[int]] = Query(None),
+    space_id: Optional[List[int]] = Query(None),
+    event_type_id: Optional[List[int]] = Query(None),
+    venue_type_id: Optional[List[int]] = Query(None),
+    genre_type_id: Optional[List[int]] = Query(None),
+    date: Optional[str] = Query(None),
+    date_start: Optional[str] = Query(None),
+    date_end: Optional[str] = Query(None),
+    lang: str = Query('de')
+):
+    active_filters = get_active_filters({
+        'city': city,
+        'postal_code': postal_code,
+        'id': event_id,
+        'venue_id': venue_id,
+        'space_id': space_id,
+        'event_type_id': event_type_id,
+        'venue_type_id': venue_type_id,
+        'genre_type_id': genre_type_id,
+        'date': date,
+        'date_start': date_start,
+        'date_end': date_end
+    })
+
+    async def render():
+        async with AsyncSessionLocal() as session:
+            rows = await get_event_facets(session, active_filters, lang)
+
+        registry = get_lookup_registry()
+        facets = {}
+
+        for row in rows:
+            value = row['value']
+
+            if row['facet'] in FACET_TYPE_TABLES:
+                value = registry.get_type_name(
+                    FACET_TYPE_TABLES[row['facet']], row['type_id'], lang
+                )
+
+            facets.setdefault(row['facet'], []).append({
+                'id': row['type_id'],
+                'value': value,
+                'count': row['count']
+            })
+
+        return encode_response(EventFacetsResponse, facets)
+
+    # each facet counts the rows passing every other filter, the union of
+    # those rows is what passes the filters which are no facet
+    base_filters = {
+        name: value for name, value in active_filters.items()
+        if name not in FACET_FILTERS
+    }
+
+    async def validate(session):
+        return await get_events_validator(session, base_filters, lang)
+
+    return await conditional_response(
+        request, validate, render, EVENT_CACHE_TAGS,
+        lang=lang
+    )
+
+
+@router.get('/calendar.ics')
+async def fetch_events_calendar(
+    request: Request,
+    city: Optional[str] = Query(None),
+    postal_code: Optional[str] = Query(None),
+    venue_id: Optional[List[int]] = Query(None),
+    event_id: Optional[List[int]] = Query(None),
+    space_id: Optional[List[int]] = Query(None),
+    event_type_id: Optional[List[int]] = Query(None),
+    venue_type_id: Optional[List[int]] = Query(None),
+    genre_type_id: Optional[List[int]] = Query(None),
+    date: Optional[str] = Query(None),
+    date_start: Optional[str] = Query(None),
+    date_end: Optional[str] = Query(None),
+    lang: str = Query('de'),
+    db: AsyncSession = Depends(get_db)
+):
+    active_filters = get_active_filters({
+        'city': city,
+        'postal_code': postal_code,
+        'id': event_id,
+        'venue_id': venue_id,
+        'space_id': space_id,
+        'event_type_id': event_type_id,
+        'venue_type_id': venue_type_id,
+        'genre_type_id': genre_type_id,
+        'date': date,
+        'date_start': date_start,
+        'date_end': date_end
+    })
+
+    if not active_filters:
         raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=(
-                f'No event date found for event_date_id: {event_date_id}'
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail='At least one filter parameter is required')
+
+    return await event_feed_response(
+        request, db, active_filters, 'Open Uranus', lang
+    )
+
+
+@router.get('/batch', response_model=EventDateBatchResponse)
+async def fetch_events_by_event_date_ids(
+    request: Request,
+    lang: str,
+    ids: List[str] = Query(...)
+):
+    base_url = str(request.base_url)
+    event_date_ids = parse_batch_ids(ids)
+
+    async def render():
+        async with AsyncSessionLocal() as session:
+            events = await get_events_by_event_date_ids(
+                session, base_url, event_date_ids, lang
             )
+
+        rows = {event['event_date_id']: event for event in events}
+
+        return encode_response(
+            EventDateBatchResponse,
+            get_batch_response(event_date_ids, rows)
         )
 
-    return event
+    async def validate(session):
+        return await get_event_dates_validator(session, event_date_ids, lang)
+
+    return await conditional_response(
+        request, validate, render, EVENT_CACHE_TAGS,
+        lang=lang
+    )
+
+
+@router.get('/{event_date_id}', response_model=EventDateResponse)
+async def fetch_event_by_event_date_id(
+    request: Request,
+    lang: str,
+    event_date_id: int
+):
+    base_url = str(request.base_url)
+
+    async def render():
+        async with AsyncSessionLocal() as session:
+            event = await get_event_by_event_date_id(
+                session, base_url, event_date_id, lang
+            )
+
+        if not event:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=(
+                    f'No event date found for event_date_id: {event_date_id}'
+                )
+            )
+
+        return encode_response(EventDateResponse, event)
 
+    async def validate(session):
+        return await get_event_date_validator(session, event_date_id, lang)
 
-@router.get('/', response_model=List[EventQueryResponse])
+    return await conditional_response(
+        request, validate, render, EVENT_CACHE_TAGS,
+        detail=True,
+        lang=lang
+    )
+
+
+@router.get('/', response_model=EventQueryPage)
 async def fetch_events_by_filter(
     request: Request,
     city: Optional[str] = Query(None),
@@ -118,9 +478,14 @@ async def fetch_events_by_filter(
     event_type_id: Optional[List[int]] = Query(None),
     venue_type_id: Optional[List[int]] = Query(None),
     genre_type_id: Optional[List[int]] = Query(None),
+    date: Optional[str] = Query(None),
     date_start: Optional[str] = Query(None),
     date_end: Optional[str] = Query(None),
-    db: AsyncSession = Depends(get_db)
+    limit: Optional[int] = Query(None, ge=1, le=MAX_EVENT_PAGE_SIZE),
+    cursor: Optional[str] = Query(None),
+    format: Optional[str] = Query(None),
+    fields: Optional[List[str]] = Query(None),
+    teaser: bool = Query(False)
 ):
     filters = {
         'city': city,
@@ -131,14 +496,12 @@ async def fetch_events_by_filter(
         'event_type_id': event_type_id,
         'venue_type_id': venue_type_id,
         'genre_type_id': genre_type_id,
+        'date': date,
         'date_start': date_start,
         'date_end': date_end
     }
 
-    active_filters = {
-        key: value for key, value in filters.items()
-        if value not in [None, '']
-    }
+    active_filters = get_active_filters(filters)
 
     if not active_filters:
         raise HTTPException(
@@ -146,33 +509,74 @@ async def fetch_events_by_filter(
             detail='At least one filter parameter is required')
 
     base_url = str(request.base_url)
-    events = await get_events_by_filter(db, active_filters, base_url)
-
-    if len(events) < 1:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f'No events found for filters: {active_filters}'
+    stream_format = get_stream_format(request, format)
+    selected = get_event_fields(fields, teaser)
+
+    if stream_format:
+        stmt, params = get_events_by_filter_stmt(
+            active_filters, base_url,
+            limit=limit,
+            cursor=parse_cursor(cursor, 2),
+            fields=selected
         )
 
-    return events
+        return streaming_response(stmt, stream_format, 'events', params)
+
+    limit = limit or EVENT_PAGE_SIZE
+    after = parse_cursor(cursor, 2)
 
+    async def render():
+        async with AsyncSessionLocal() as session:
+            page = await get_events_by_filter_document(
+                session, active_filters, base_url,
+                limit=limit + 1,
+                cursor=after,
+                fields=selected
+            )
+
+        if page['count'] < 1:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f'No events found for filters: {active_filters}'
+            )
+
+        next_cursor = None
+
+        if page['count'] > limit:
+            next_cursor = encode_cursor(
+                page['event_date_start'],
+                page['event_date_id']
+            )
+
+        return encode_event_page(page['document'], next_cursor)
+
+    async def validate(session):
+        return await get_events_validator(session, active_filters)
 
-async def process_uploaded_file(file: UploadFile, ext: str) -> dict:
+    return await conditional_response(
+        request, validate, render, EVENT_CACHE_TAGS
+    )
+
+
+async def store_uploaded_file(file: UploadFile, ext: str) -> dict:
     '''
-    Process the uploaded file and return metadata including file path,
-    dimensions, and MIME type. Resize image if longest dimension exceeds
-    MAX_IMAGE_PX_SIZE.
+    Store the uploaded file as it is and return its metadata. SVG sizes
+    are read right away, raster images are left to the image pipeline
+    and start out as processing without a size.
     '''
     source_name = f'{uuid.uuid4()}.{ext}'
     file_path = os.path.join(settings.UPLOAD_DIR, source_name)
 
-    # Use aiofiles for async file operations
     async with aiofiles.open(file_path, 'wb') as buffer:
-        content = await file.read()
-        await buffer.write(content)
+        while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+            await buffer.write(chunk)
 
     mime_type, _ = mimetypes.guess_type(file_path)
 
+    width = None
+    height = None
+    image_status = 'processing'
+
     if ext == 'svg':
         async with aiofiles.open(file_path, 'r') as svg_file:
             svg_content = await svg_file.read()
@@ -187,42 +591,78 @@ async def process_uploaded_file(file: UploadFile, ext: str) -> dict:
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail='Invalid SVG file format.'
             )
-    else:
-        # Use asyncio.to_thread to run PIL operations asynchronously
-        def process_image(path):
-            with PILImage.open(path) as img:
-                original_width, original_height = img.size
-
-                # Check if resizing is needed
-                if original_width > MAX_IMAGE_PX_SIZE or original_height > MAX_IMAGE_PX_SIZE:
-                    # Calculate new dimensions maintaining aspect ratio
-                    if original_width >= original_height:
-                        new_width = MAX_IMAGE_PX_SIZE
-                        new_height = int(original_height *
-                                         (MAX_IMAGE_PX_SIZE / original_width))
-                    else:
-                        new_height = MAX_IMAGE_PX_SIZE
-                        new_width = int(original_width *
-                                        (MAX_IMAGE_PX_SIZE / original_height))
-
-                    # Resize and save
-                    img = img.resize((new_width, new_height), PILImage.LANCZOS)
-                    img.save(path)
-
-                    return new_width, new_height
-
-                return original_width, original_height
 
-        width, height = await asyncio.to_thread(process_image, file_path)
+        image_status = 'ready'
 
     return {
         'source_name': source_name,
         'mime_type': mime_type,
         'width': width,
-        'height': height
+        'height': height,
+        'status': image_status
     }
 
 
+def get_series_dates(
+    date_start: datetime,
+    date_end: Optional[datetime],
+    recurrence_rule: Optional[str],
+    event_dates: Optional[List[datetime]]
+):
+    '''
+    Expand a recurrence rule or an explicit list of start times into the
+    (start, end) dates of the event, every date keeps the duration of the
+    first one. Returns the rule text to store alongside.
+    '''
+    if recurrence_rule and event_dates:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail='Pass either a recurrence rule or a list of dates'
+        )
+
+    date_start = date_start.replace(tzinfo=None)
+    duration = date_end.replace(tzinfo=None) - date_start if date_end else None
+    rule = None
+
+    if recurrence_rule:
+        try:
+            rule = get_recurrence_rule(recurrence_rule, date_start)
+        except ValueError as e:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(e)
+            )
+
+        starts = expand_recurrence(rule)
+    else:
+        starts = sorted({
+            date_start,
+            *[value.replace(tzinfo=None) for value in event_dates or []]
+        })
+
+        if len(starts) > MAX_SERIES_DATES:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f'An event has at most {MAX_SERIES_DATES} dates'
+            )
+
+    return rule, [
+        (start, start + duration if duration else None) for start in starts
+    ]
+
+
+# foreign keys of an event write reported back by name
+EVENT_REFERENCE_COLUMNS = [
+    'organizer_id',
+    'venue_id',
+    'space_id',
+    'event_type_id',
+    'genre_type_id',
+    'image_type_id',
+    'license_type_id'
+]
+
+
 def handle_integrity_error(e: IntegrityError, column_name_list: List[str]):
     '''
     Handle IntegrityError exceptions and raise
@@ -267,6 +707,8 @@ async def update_event_by_event_date_id(
     event_date_start: datetime = Form(...),
     event_date_end: Optional[datetime] = Form(None),
     event_entry_time: Optional[time] = Form(None),
+    event_recurrence_rule: Optional[str] = Form(None),
+    event_dates: Optional[List[datetime]] = Form(None),
     event_image_alt: Optional[str] = Form(None),
     event_image_caption: Optional[str] = Form(None),
     file: Optional[UploadFile] = File(None),
@@ -294,11 +736,20 @@ async def update_event_by_event_date_id(
             detail=f'No event found for event_id: {event_id}'
         )
 
-    # Process image if provided
+    series = None
+
+    if event_recurrence_rule or event_dates:
+        series = get_series_dates(
+            event_date_start, event_date_end,
+            event_recurrence_rule, event_dates
+        )
+
+    # Store image if provided, it is resized in the background
     file_metadata = None
+    image_id = None
 
     if file:
-        file_metadata = await process_uploaded_file(file, ext)
+        file_metadata = await store_uploaded_file(file, ext)
 
     try:
         # Update event date
@@ -320,41 +771,29 @@ async def update_event_by_event_date_id(
         # Perform database flush to commit these changes before further operations
         await db.flush()
 
-        # Handle event types - using stored event_id instead of event.id
-        current_event_types = await get_event_types_by_event_id(db, event_id)
-
-        # TODO: same as below by genre type
-        current_event_type_ids = [
-            event_type['EventLinkTypes'].event_type_id
-            for event_type in current_event_types
-        ]
+        # the series is diffed from the edited date on, earlier dates stay
+        if series:
+            rule, dates = series
+            event.recurrence_rule = rule
 
-        ids_to_add = set(event_type_id) - set(current_event_type_ids)
-        ids_to_remove = set(current_event_type_ids) - set(event_type_id)
-
-        for type_id in ids_to_remove:
-            await delete_event_link_type(db, event_id, type_id)
-
-        for type_id in ids_to_add:
-            await add_event_link_type(db, event_id, type_id)
-
-        current_genre_types = await get_genre_types_by_event_id(db, event_id)
-
-        current_genre_type_ids = [
-            genre_type.genre_type_id
-            for genre_type in current_genre_types
-        ]
-
-        genre_ids_to_add = \
-            set(event_genre_type_id) - set(current_genre_type_ids)
-        genre_ids_to_remove = \
-            set(current_genre_type_ids) - set(event_genre_type_id)
+            # the edited date stays in the series, maybe at a new start
+            anchor = await sync_event_dates(
+                db, event_id, event_date_id, event_venue_id, event_space_id,
+                dates, since=event_date.date_start
+            )
 
-        for genre_type_id in genre_ids_to_remove:
-            await delete_genre_link_type(db, event_id, genre_type_id)
+            if anchor:
+                event_date_start, event_date_end = anchor
 
-        for genre_type_id in genre_ids_to_add:
-            await add_genre_link_type(db, event_id, genre_type_id)
+        # each link table is synced to the submitted ids in one statement
+        await sync_links(
+            db, EventLinkTypes.event_id, EventLinkTypes.event_type_id,
+            event_id, event_type_id
+        )
+        await sync_links(
+            db, GenreLinkTypes.event_id, GenreLinkTypes.genre_type_id,
+            event_id, event_genre_type_id
+        )
 
         # Add image data after other updates
         if file and file_metadata:
@@ -371,12 +810,11 @@ async def update_event_by_event_date_id(
                     image_caption=event_image_caption,
                     image_mime_type=file_metadata['mime_type'],
                     image_width=file_metadata['width'],
-                    image_height=file_metadata['height']
+                    image_height=file_metadata['height'],
+                    image_status=file_metadata['status']
                 )
 
-                new_image = await add_event_image(db, new_image_data)
-
-                await add_event_link_image(db, event_id, new_image.id)
+                image_id = await add_event_image(db, event_id, new_image_data)
             else:
                 image = image_row['Image']
 
@@ -390,14 +828,26 @@ async def update_event_by_event_date_id(
                 image.mime_type = file_metadata['mime_type']
                 image.width = file_metadata['width']
                 image.height = file_metadata['height']
+                image.status = file_metadata['status']
+
+                image_id = image.id
+
+        await db.flush()
+        await refresh_event_date_references(db, event_ids=[event_id])
+        await refresh_event_search(db, event_ids=[event_id])
 
         # Commit all changes
         await db.commit()
+        response_cache.invalidate('event')
+
+        # the pipeline updates the committed row when the file is done
+        if image_id and file_metadata['status'] == 'processing':
+            image_pipeline.submit(image_id, file_metadata['source_name'])
 
     except IntegrityError as e:
         # Roll back in case of error
         await db.rollback()
-        handle_integrity_error(e, ['organizer_id', 'venue_id', 'space_id'])
+        handle_integrity_error(e, EVENT_REFERENCE_COLUMNS)
 
     return EventResponse(
         event_id=event_id,
@@ -409,10 +859,55 @@ async def update_event_by_event_date_id(
         event_space_id=event_space_id,
         event_date_start=event_date_start,
         event_date_end=event_date_end,
-        event_genre_type_id=event_genre_type_id
+        event_genre_type_id=event_genre_type_id,
+        event_image_id=image_id,
+        event_image_status=file_metadata['status'] if image_id else None
     )
 
 
+@router.post('/bulk', response_model=EventImportResponse)
+async def import_event_rows(
+    request: Request,
+    format: Optional[str] = Query(None),
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db)
+):
+    format = get_import_format(request, format)
+    body = await request.body()
+
+    try:
+        text = body.decode('utf-8-sig')
+    except UnicodeDecodeError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail='Import body must be UTF-8'
+        )
+
+    # all rows or none, the client fixes the listed rows and resends
+    rows, errors = parse_import_rows(text, format)
+
+    if not errors:
+        try:
+            event_ids, errors = await import_events(db, rows)
+        except IntegrityError as e:
+            await db.rollback()
+
+            handle_integrity_error(e, ['organizer_id', 'venue_id', 'space_id'])
+
+    if errors:
+        await db.rollback()
+
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=[error.model_dump() for error in errors]
+        )
+
+    await db.commit()
+    response_cache.invalidate('event')
+
+    return EventImportResponse(imported=len(event_ids), event_ids=event_ids)
+
+
 @router.post('/', response_model=EventResponse)
 async def create_event(
     event_title: str = Form(...),
@@ -426,6 +921,8 @@ async def create_event(
     event_image_license_type_id: Optional[int] = Form(None),
     event_date_start: datetime = Form(...),
     event_date_end: Optional[datetime] = Form(None),
+    event_recurrence_rule: Optional[str] = Form(None),
+    event_dates: Optional[List[datetime]] = Form(None),
     event_image_alt: Optional[str] = Form(None),
     event_image_caption: Optional[str] = Form(None),
     file: Optional[UploadFile] = File(None),
@@ -433,11 +930,16 @@ async def create_event(
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db)
 ):
-    # Process image if provided
+    rule, dates = get_series_dates(
+        event_date_start, event_date_end, event_recurrence_rule, event_dates
+    )
+
+    # Store image if provided, it is resized in the background
     file_metadata = None
+    image_id = None
 
     if file:
-        file_metadata = await process_uploaded_file(file, ext)
+        file_metadata = await store_uploaded_file(file, ext)
 
     event_data = {
         'event_title': event_title,
@@ -453,9 +955,14 @@ async def create_event(
 
     event = EventCreate(**event_data)
 
+    # one transaction without refreshes, a failing link leaves no event
     try:
-        new_event = await add_event(db, event)
-        new_event_date = await add_event_date(db, event, new_event)
+        new_event = await add_event(db, event, rule)
+
+        # every date of a series goes in with one INSERT
+        new_event_dates = await add_event_dates(
+            db, new_event['id'], event_venue_id, event_space_id, dates
+        )
 
         if file and file_metadata:
             image_data = ImageCreate(
@@ -468,36 +975,44 @@ async def create_event(
                 image_caption=event_image_caption,
                 image_mime_type=file_metadata['mime_type'],
                 image_width=file_metadata['width'],
-                image_height=file_metadata['height']
+                image_height=file_metadata['height'],
+                image_status=file_metadata['status']
             )
 
-            new_image = await add_event_image(db, image_data)
-            await add_event_link_image(db, new_event.id, new_image.id)
+            image_id = await add_event_image(db, new_event['id'], image_data)
 
-        for type_id in event_type_id:
-            await add_event_link_type(db, new_event.id, type_id)
-
-        for genre_type_id in event_genre_type_id:
-            await add_genre_link_type(db, new_event.id, genre_type_id)
+        await add_event_link_types(db, new_event['id'], event_type_id)
+        await add_genre_link_types(
+            db, new_event['id'], event_genre_type_id or []
+        )
 
+        await refresh_event_date_references(db, event_ids=[new_event['id']])
+        await refresh_event_search(db, event_ids=[new_event['id']])
         await db.commit()
+        response_cache.invalidate('event')
+
+        if image_id and file_metadata['status'] == 'processing':
+            image_pipeline.submit(image_id, file_metadata['source_name'])
 
     except IntegrityError as e:
         await db.rollback()
 
-        handle_integrity_error(e, ['organizer_id', 'venue_id'])
+        handle_integrity_error(e, EVENT_REFERENCE_COLUMNS)
 
     return EventResponse(
-        event_id=new_event.id,
-        event_date_id=new_event_date.id,
-        event_title=new_event.title,
-        event_description=new_event.description,
-        event_organizer_id=new_event.organizer_id,
-        event_venue_id=new_event.venue_id,
-        event_space_id=new_event.space_id,
-        event_date_start=new_event_date.date_start,
-        event_date_end=new_event_date.date_end,
-        event_genre_type_id=event_genre_type_id
+        event_id=new_event['id'],
+        event_date_id=new_event_dates[0]['id'],
+        event_title=new_event['title'],
+        event_description=new_event['description'],
+        event_organizer_id=new_event['organizer_id'],
+        event_venue_id=new_event['venue_id'],
+        event_space_id=new_event['space_id'],
+        event_date_start=dates[0][0],
+        event_date_end=dates[0][1],
+        event_date_ids=[row['id'] for row in new_event_dates],
+        event_genre_type_id=event_genre_type_id,
+        event_image_id=image_id,
+        event_image_status=file_metadata['status'] if image_id else None
     )
 
 
@@ -518,6 +1033,7 @@ async def delete_event_by_id(
     try:
         await db.delete(venue)
         await db.commit()
+        response_cache.invalidate('event')
     except Exception as e:
         await db.rollback()
         raise HTTPException(
@@ -528,26 +1044,9 @@ async def delete_event_by_id(
     return {'message': 'Venue deleted successfully'}
 
 
-@router.get('/sort', response_model=List[EventQueryResponse])
-async def fetch_events_sort_by(
-    request: Request,
-    order_by: SortOrder = SortOrder.asc,
-    db: AsyncSession = Depends(get_db)
-):
-    base_url = str(request.base_url)
-    events = await get_events_sort_by(db, order_by, base_url)
-
-    if len(events) < 1:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f'No events found for order_by: {order_by}'
-        )
-
-    return events
-
-
-@router.get('/{event_date_id}/calendar', response_class=FileResponse)
+@router.get('/{event_date_id}/calendar')
 async def get_event_calendar(
+    request: Request,
     event_date_id: int,
     db: AsyncSession = Depends(get_db)
 ):
@@ -562,37 +1061,29 @@ async def get_event_calendar(
             detail=f'No event date found for event_date_id: {event_date_id}'
         )
 
-    # Validate that the required attributes are present
-    required_attributes = ['event_title', 'event_description',
-                           'event_date_start', 'event_venue_address']
-    for attr in required_attributes:
-        if not hasattr(event, attr):
-            raise HTTPException(
-                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                detail=f'Missing required attribute "{attr}" in event data.'
-            )
+    modified_at = event['event_modified_at']
+    etag = get_etag(('calendar', event_date_id), {'modified_at': modified_at})
 
-    cal = Calendar()
-    ical_event = ICalEvent()
-    ical_event.add('summary', event.event_title)
-    ical_event.add('description', event.event_description)
-    ical_event.add('dtstart', event.event_date_start)
+    headers = get_validator_headers(etag, modified_at, detail=True)
+    headers['Content-Disposition'] = (
+        f'attachment; filename="event_uranus_{event_date_id}.ics"'
+    )
 
-    if event.event_date_end:
-        ical_event.add('dtend', event.event_date_end)
+    if is_not_modified(request, etag, modified_at, detail=True):
+        return Response(
+            status_code=status.HTTP_304_NOT_MODIFIED,
+            headers=headers
+        )
 
-    ical_event.add('location', event.event_venue_address)
-    cal.add_component(ical_event)
+    async def render():
+        return render_calendar([event])
 
-    ics_file_path = os.path.join(
-        settings.TEMP_DIR, f'event_uranus_{event_date_id}.ics'
+    body = await calendar_cache.get_or_render(
+        (event_date_id, modified_at), render, EVENT_CACHE_TAGS
     )
 
-    with open(ics_file_path, 'wb') as ics_file:
-        ics_file.write(cal.to_ical())
-
-    return FileResponse(
-        ics_file_path,
+    return Response(
+        content=body,
         media_type='text/calendar',
-        filename=f'event_uranus_{event_date_id}.ics'
+        headers=headers
     )
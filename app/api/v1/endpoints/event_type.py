@@ -1,12 +1,8 @@
-from fastapi import APIRouter, Depends, Query
-
-from sqlalchemy.ext.asyncio import AsyncSession
-
-from app.db.session import get_db
+from fastapi import APIRouter, Query
 
 from app.schemas.event_type_response import EventTypeResponse
 
-from app.db.repository.event_type import get_all_event_types
+from app.services.lookup import get_lookup_registry
 
 from typing import List, Optional
 
@@ -16,9 +12,8 @@ router = APIRouter()
 
 @router.get('/', response_model=List[EventTypeResponse])
 async def fetch_all_event_types(
-    lang: Optional[str] = Query(None),
-    db: AsyncSession = Depends(get_db)
+    lang: Optional[str] = Query(None)
 ):
-    event_types = await get_all_event_types(db, lang)
+    event_types = get_lookup_registry().get_types('event_type', lang)
 
     return event_types
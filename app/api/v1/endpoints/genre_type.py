@@ -1,8 +1,6 @@
-from fastapi import APIRouter, Depends
-from sqlalchemy.ext.asyncio import AsyncSession
-from app.db.session import get_db
+from fastapi import APIRouter
 from app.schemas.genre_type_response import GenreTypeResponse
-from app.db.repository.genre_type import get_all_genre_types
+from app.services.lookup import get_lookup_registry
 from typing import List, Optional
 
 
@@ -11,9 +9,8 @@ router = APIRouter()
 
 @router.get('/', response_model=List[GenreTypeResponse])
 async def fetch_all_genre_types(
-    lang: Optional[str] = None,
-    db: AsyncSession = Depends(get_db)
+    lang: Optional[str] = None
 ):
-    genre_types = await get_all_genre_types(db, lang)
+    genre_types = get_lookup_registry().get_types('genre_type', lang)
 
     return genre_types
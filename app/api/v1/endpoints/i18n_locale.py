@@ -1,12 +1,8 @@
-from fastapi import APIRouter, Depends, Query
-
-from sqlalchemy.ext.asyncio import AsyncSession
-
-from app.db.session import get_db
+from fastapi import APIRouter
 
 from app.schemas.i18n_locale import I18nLocaleResponse
 
-from app.db.repository.i18n_locale import get_all_i18n_locales
+from app.services.lookup import get_lookup_registry
 
 from typing import List, Optional
 
@@ -16,9 +12,8 @@ router = APIRouter()
 
 @router.get('/', response_model=List[I18nLocaleResponse])
 async def fetch_all_i18n_locales(
-    lang: Optional[str] = None,
-    db: AsyncSession = Depends(get_db)
+    lang: Optional[str] = None
 ):
-    i18n_locales = await get_all_i18n_locales(db, lang)
+    i18n_locales = get_lookup_registry().locales
 
     return i18n_locales
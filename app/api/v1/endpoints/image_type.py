@@ -1,12 +1,8 @@
-from fastapi import APIRouter, Depends, Query
-
-from sqlalchemy.ext.asyncio import AsyncSession
-
-from app.db.session import get_db
+from fastapi import APIRouter, Query
 
 from app.schemas.image_type_response import ImageTypeResponse
 
-from app.db.repository.image_type import get_all_image_types
+from app.services.lookup import get_lookup_registry
 
 from typing import List, Optional
 
@@ -16,9 +12,8 @@ router = APIRouter()
 
 @router.get('/', response_model=List[ImageTypeResponse])
 async def fetch_all_image_types(
-    lang: Optional[str] = Query(None),
-    db: AsyncSession = Depends(get_db)
+    lang: Optional[str] = Query(None)
 ):
-    image_types = await get_all_image_types(db, lang)
+    image_types = get_lookup_registry().get_types('image_type', lang)
 
     return image_types
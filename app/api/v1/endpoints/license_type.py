@@ -1,12 +1,8 @@
-from fastapi import APIRouter, Depends, Query
-
-from sqlalchemy.ext.asyncio import AsyncSession
-
-from app.db.session import get_db
+from fastapi import APIRouter, Query
 
 from app.schemas.license_type_response import LicenseTypeResponse
 
-from app.db.repository.license_type import get_all_license_types
+from app.services.lookup import get_lookup_registry
 
 from typing import List, Optional
 
@@ -16,9 +12,8 @@ router = APIRouter()
 
 @router.get('/', response_model=List[LicenseTypeResponse])
 async def fetch_all_license_types(
-    lang: Optional[str] = Query(None),
-    db: AsyncSession = Depends(get_db)
+    lang: Optional[str] = Query(None)
 ):
-    licence_types = await get_all_license_types(db, lang)
+    licence_types = get_lookup_registry().get_types('license_type', lang)
 
     return licence_types
@@ -1,22 +1,35 @@
-from fastapi import APIRouter, Depends, status, HTTPException
+from fastapi import APIRouter, Depends, Query, Request, status, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
 
 from app.db.repository.user import get_organizer_user_roles_by_organizer_id
-from app.db.session import get_db
+from app.db.session import get_db, AsyncSessionLocal
 
 from app.services.auth import get_current_user
+from app.services.batch import get_batch_response, parse_batch_ids
+from app.services.calendar import event_feed_response
+from app.services.conditional import conditional_response
+from app.services.response_cache import (
+    ORGANIZER_CACHE_TAGS,
+    encode_response,
+    response_cache
+)
 
 from app.db.repository.organizer import (
     get_organizer_stats,
     get_organizer_by_id,
+    get_organizers_by_ids,
+    get_organizer_validator,
     add_user_organizer,
     add_organizer,
     delete_organizer_by_id,
     get_all_organizers
 )
 
+from app.db.repository.event_search import refresh_event_search
+
 from app.schemas.organizer import (
+    OrganizerBatchResponse,
     OrganizerCreate,
     OrganizerSchema,
     OrganizerUserRoleResponse
@@ -44,6 +57,7 @@ async def create_organizer(
     new_user_organizer = await add_user_organizer(
         db, current_user.user_id, new_organizer.id, 1
     )
+    response_cache.invalidate('organizer')
 
     return OrganizerSchema(
         organizer_id=new_organizer.id,
@@ -75,33 +89,91 @@ async def fetch_organizer_stats(
     return stats
 
 
+@router.get('/batch', response_model=OrganizerBatchResponse)
+async def fetch_organizers_by_ids(
+    request: Request,
+    ids: List[str] = Query(...)
+):
+    organizer_ids = parse_batch_ids(ids)
+
+    async def render():
+        async with AsyncSessionLocal() as session:
+            organizers = await get_organizers_by_ids(session, organizer_ids)
+
+        rows = {organizer.organizer_id: organizer for organizer in organizers}
+
+        return encode_response(
+            OrganizerBatchResponse,
+            get_batch_response(organizer_ids, rows)
+        )
+
+    async def validate(session):
+        return await get_organizer_validator(
+            session, organizer_ids=organizer_ids
+        )
+
+    return await conditional_response(
+        request, validate, render, ORGANIZER_CACHE_TAGS
+    )
+
+
 @router.get(
     '/{organizer_id}',
     response_model=OrganizerSchema,
 )
 async def fetch_organizer_by_id(
+    request: Request,
+    organizer_id: int
+):
+    async def render():
+        async with AsyncSessionLocal() as session:
+            organizer = await get_organizer_by_id(session, organizer_id)
+
+        if not organizer:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f'Organizer with id {organizer_id} not found'
+            )
+
+        return encode_response(OrganizerSchema, OrganizerSchema(
+            organizer_id=organizer.id,
+            organizer_name=organizer.name,
+            organizer_description=organizer.description,
+            organizer_contact_email=organizer.contact_email,
+            organizer_contact_phone=organizer.contact_phone,
+            organizer_website_url=organizer.website_url,
+            organizer_street=organizer.street,
+            organizer_house_number=organizer.house_number,
+            organizer_postal_code=organizer.postal_code,
+            organizer_city=organizer.city
+        ))
+
+    async def validate(session):
+        return await get_organizer_validator(session, organizer_id)
+
+    return await conditional_response(
+        request, validate, render, ORGANIZER_CACHE_TAGS,
+        detail=True
+    )
+
+
+@router.get('/{organizer_id}/calendar.ics')
+async def fetch_organizer_calendar(
+    request: Request,
     organizer_id: int,
+    lang: str = Query('de'),
     db: AsyncSession = Depends(get_db)
 ):
     organizer = await get_organizer_by_id(db, organizer_id)
-    print(organizer)
+
     if not organizer:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f'Organizer with id {organizer_id} not found'
         )
 
-    return OrganizerSchema(
-        organizer_id=organizer.id,
-        organizer_name=organizer.name,
-        organizer_description=organizer.description,
-        organizer_contact_email=organizer.contact_email,
-        organizer_contact_phone=organizer.contact_phone,
-        organizer_website_url=organizer.website_url,
-        organizer_street=organizer.street,
-        organizer_house_number=organizer.house_number,
-        organizer_postal_code=organizer.postal_code,
-        organizer_city=organizer.city
+    return await event_feed_response(
+        request, db, {'organizer_id': [organizer_id]}, organizer.name, lang
     )
 
 
@@ -131,8 +203,11 @@ async def update_organizer_by_id(
     organizer.city = organizer_schema.organizer_city
 
     try:
+        await db.flush()
+        await refresh_event_search(db, organizer_ids=[organizer_id])
         await db.commit()
         await db.refresh(organizer)
+        response_cache.invalidate('organizer')
     except Exception as e:
         await db.rollback()
 
@@ -174,6 +249,7 @@ async def remove_organizer(
 
     try:
         await delete_organizer_by_id(db, organizer)
+        response_cache.invalidate('organizer')
     except Exception as e:
         await db.rollback()
 
@@ -189,17 +265,26 @@ async def remove_organizer(
 
 @router.get('/', response_model=List[OrganizerSchema])
 async def fetch_all_organizers(
-    db: AsyncSession = Depends(get_db)
+    request: Request
 ):
-    organizers = await get_all_organizers(db)
+    async def render():
+        async with AsyncSessionLocal() as session:
+            organizers = await get_all_organizers(session)
 
-    if not organizers:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail='No organizers found'
-        )
+        if not organizers:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail='No organizers found'
+            )
+
+        return encode_response(List[OrganizerSchema], organizers)
 
-    return organizers
+    async def validate(session):
+        return await get_organizer_validator(session)
+
+    return await conditional_response(
+        request, validate, render, ORGANIZER_CACHE_TAGS
+    )
 
 
 @router.get(
@@ -1,21 +1,30 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from typing import List
 
-from app.db.session import get_db
+from app.db.session import get_db, AsyncSessionLocal
 
 from app.db.repository.space import (
     get_all_spaces,
     get_space_by_id,
     get_space_by_venue_id,
+    get_space_validator,
     add_space,
     update_space
 )
 
+from app.db.repository.event_search import refresh_event_search
+
 from app.schemas.space import SpaceCreate, SpaceResponse
 from app.models.user import User
 from app.services.auth import get_current_user
+from app.services.conditional import conditional_response
+from app.services.response_cache import (
+    SPACE_CACHE_TAGS,
+    encode_response,
+    response_cache
+)
 
 
 router = APIRouter()
@@ -23,25 +32,46 @@ router = APIRouter()
 
 @router.get('/', response_model=List[SpaceResponse])
 async def fetch_all_spaces(
-    db: AsyncSession = Depends(get_db)
+    request: Request
 ):
-    spaces = await get_all_spaces(db)
+    async def render():
+        async with AsyncSessionLocal() as session:
+            spaces = await get_all_spaces(session)
 
-    return spaces
+        return encode_response(List[SpaceResponse], spaces)
+
+    async def validate(session):
+        return await get_space_validator(session)
+
+    return await conditional_response(
+        request, validate, render, SPACE_CACHE_TAGS
+    )
 
 
 @router.get('/{space_id}', response_model=SpaceResponse)
 async def fetch_space_by_id(
-    space_id: int,
-    db: AsyncSession = Depends(get_db)
+    request: Request,
+    space_id: int
 ):
-    space = await get_space_by_id(db, space_id)
+    async def render():
+        async with AsyncSessionLocal() as session:
+            space = await get_space_by_id(session, space_id)
 
-    if space is None:
-        raise HTTPException(
-            status_code=404, detail=f'No space found for space_id: {space_id}')
+        if space is None:
+            raise HTTPException(
+                status_code=404,
+                detail=f'No space found for space_id: {space_id}'
+            )
 
-    return space
+        return encode_response(SpaceResponse, space)
+
+    async def validate(session):
+        return await get_space_validator(session, space_id)
+
+    return await conditional_response(
+        request, validate, render, SPACE_CACHE_TAGS,
+        detail=True
+    )
 
 
 @router.get('/venue/{venue_id}', response_model=List[SpaceResponse])
@@ -65,6 +95,7 @@ async def create_space(
     db: AsyncSession = Depends(get_db)
 ):
     new_space = await add_space(db, space_data)
+    response_cache.invalidate('space')
 
     return SpaceResponse(
         space_id=new_space.id,
@@ -90,8 +121,13 @@ async def update_space_by_id(
         raise HTTPException(
             status_code=404, detail=f'No space found for space_id: {space_id}')
 
+    # the space row and its event_search rows change in one transaction
     updated_space = await update_space(db, space_id, space_data)
 
+    await refresh_event_search(db, space_ids=[space_id])
+    await db.commit()
+    response_cache.invalidate('space')
+
     return SpaceResponse(
         space_id=updated_space.id,
         space_venue_id=updated_space.venue_id,
@@ -1,8 +1,6 @@
-from fastapi import APIRouter, Depends, Query
-from sqlalchemy.ext.asyncio import AsyncSession
-from app.db.session import get_db
+from fastapi import APIRouter, Query
 from app.schemas.space_type_response import SpaceTypeResponse
-from app.db.repository.space_type import get_all_space_types
+from app.services.lookup import get_lookup_registry
 from typing import List, Optional
 
 
@@ -11,9 +9,8 @@ router = APIRouter()
 
 @router.get('/', response_model=List[SpaceTypeResponse])
 async def fetch_all_space_types(
-    lang: Optional[str] = Query(None),
-    db: AsyncSession = Depends(get_db)
+    lang: Optional[str] = Query(None)
 ):
-    space_types = await get_all_space_types(db, lang)
+    space_types = get_lookup_registry().get_types('space_type', lang)
 
     return space_types
@@ -6,11 +6,12 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from app.db.session import get_db
 
 from app.db.repository.state import (
-    get_all_states,
     get_state_by_name,
     get_state_by_code
 )
 
+from app.services.lookup import get_lookup_registry
+
 from typing import List
 
 
@@ -18,10 +19,8 @@ router = APIRouter()
 
 
 @router.get('/', response_model=List[StateResponse])
-async def fetch_all_states(
-    db: AsyncSession = Depends(get_db)
-):
-    states = await get_all_states(db)
+async def fetch_all_states():
+    states = get_lookup_registry().states
 
     return states
 
@@ -0,0 +1,61 @@
+from fastapi import (
+    APIRouter,
+    HTTPException,
+    Depends,
+    Path,
+    Query,
+    Response,
+    status
+)
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.session import get_db
+
+from app.db.repository.tile import get_venue_tile, get_event_tile
+
+from app.enum.tile_layer import TileLayer
+from app.services.tile_cache import tile_cache, MAX_TILE_ZOOM, TILE_TTL
+
+
+router = APIRouter()
+
+MVT_MEDIA_TYPE = 'application/vnd.mapbox-vector-tile'
+
+# browsers and proxies revalidate sooner than the server side cache
+TILE_MAX_AGE = 300
+
+
+@router.get('/{layer}/{z}/{x}/{y}.mvt', response_class=Response)
+async def fetch_tile(
+    layer: TileLayer,
+    z: int = Path(..., ge=0, le=MAX_TILE_ZOOM),
+    x: int = Path(..., ge=0),
+    y: int = Path(..., ge=0),
+    lang: str = Query('de', pattern=r'^[a-z]{2}$'),
+    db: AsyncSession = Depends(get_db)
+):
+    if x >= 2 ** z or y >= 2 ** z:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f'No tile {z}/{x}/{y}'
+        )
+
+    # venues look the same in every locale
+    variant = lang if layer == TileLayer.events else 'all'
+
+    tile = await tile_cache.get(layer.value, variant, z, x, y)
+
+    if tile is None:
+        if layer == TileLayer.venues:
+            tile = await get_venue_tile(db, z, x, y)
+        else:
+            tile = await get_event_tile(db, z, x, y, lang)
+
+        await tile_cache.set(layer.value, variant, z, x, y, tile)
+
+    headers = {
+        'Cache-Control': f'public, max-age={min(TILE_TTL[layer.value], TILE_MAX_AGE)}'
+    }
+
+    return Response(content=tile, media_type=MVT_MEDIA_TYPE, headers=headers)
@@ -1,6 +1,13 @@
-import json
-
-from fastapi import APIRouter, HTTPException, Depends, status, Form
+from fastapi import (
+    APIRouter,
+    HTTPException,
+    Depends,
+    Query,
+    Request,
+    Response,
+    status,
+    Form
+)
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from shapely.wkb import loads
@@ -11,44 +18,91 @@ from decimal import Decimal
 from typing import List, Optional
 from datetime import date
 
-from geojson import Feature, FeatureCollection
-
-from app.db.session import get_db
+from app.core.config import settings
+from app.db.session import get_db, AsyncSessionLocal
 
 from app.models.user import User
 
 from app.models.venue import Venue
-from app.schemas.venue_response import VenueResponse, VenueGeoJSONPoint
+from app.models.venue_link_types import VenueLinkTypes
+from app.schemas.venue_response import (
+    VenueBatchResponse,
+    VenueResponse,
+    VenueGeoJSONPoint,
+    VenueNearbyResponse
+)
 from app.schemas.venue_junk_response import VenueJunkResponse
 from app.schemas.venue_bounds_response import VenueBoundsResponse
 
 from app.services.auth import get_current_user
+from app.services.batch import get_batch_response, parse_batch_ids
+from app.services.calendar import event_feed_response
+from app.services.conditional import conditional_response
+from app.services.fields import parse_fields
+from app.services.response_cache import (
+    VENUE_CACHE_TAGS,
+    encode_response,
+    response_cache
+)
+from app.services.streaming import get_stream_format, streaming_response
+from app.services.tile_cache import invalidate_venue_tiles
 
 from app.db.repository.venue import (
-    get_all_venues,
+    VENUE_LIST_FIELDS,
+    get_all_venues_document,
+    get_all_venues_stmt,
     get_venue_by_id,
+    get_venues_by_ids,
+    get_venue_validator,
     get_venue_stats,
     get_simple_venue_by_id,
     get_venues_within_bounds,
+    get_venue_clusters_within_bounds,
+    get_venues_near_venue,
     get_venues_by_name_junk,
     add_venue,
     add_user_venue
 )
 
-from app.db.repository.venue_type import (
-    get_venue_types_by_venue_id,
-    add_venue_link_type,
-    delete_venue_link_type
-)
+from app.db.repository.link import sync_links
+
+from app.db.repository.event_search import refresh_event_search
 
 router = APIRouter()
 
+NEARBY_RADIUS = 2000
+MAX_NEARBY_RADIUS = 50000
+NEARBY_LIMIT = 20
+MAX_NEARBY_LIMIT = 200
+
 
 @router.get('/', response_model=List[VenueResponse])
-async def fetch_all_venues(db: AsyncSession = Depends(get_db)):
-    venues = await get_all_venues(db)
+async def fetch_all_venues(
+    request: Request,
+    format: Optional[str] = None,
+    fields: Optional[List[str]] = Query(None)
+):
+    stream_format = get_stream_format(request, format)
+    selected = parse_fields(fields, VENUE_LIST_FIELDS)
 
-    return venues
+    if stream_format:
+        return streaming_response(
+            get_all_venues_stmt(fields=selected), stream_format, 'venues'
+        )
+
+    # Postgres builds the whole document, no per row work in Python
+    async def render():
+        async with AsyncSessionLocal() as session:
+            document = await get_all_venues_document(session, selected)
+
+        return document.encode()
+
+    async def validate(session):
+        return await get_venue_validator(session)
+
+    return await conditional_response(
+        request, validate, render, VENUE_CACHE_TAGS
+    )
 
 
 @router.get('/junk', response_model=List[VenueJunkResponse])
@@ -67,51 +121,127 @@ async def fetch_venues_by_name_junk(
     return venue
 
 
+@router.get('/bounds', response_model=VenueBoundsResponse)
+async def fetch_venues_within_bounds(
+    xmin: Decimal,
+    ymin: Decimal,
+    xmax: Decimal,
+    ymax: Decimal,
+    zoom: Optional[int] = Query(None, ge=0, le=22),
+    db: AsyncSession = Depends(get_db)
+):
+    # below the cluster zoom venues are merged into grid clusters
+    if zoom is not None and zoom < settings.VENUE_CLUSTER_MAX_ZOOM:
+        collection = await get_venue_clusters_within_bounds(
+            db, xmin, ymin, xmax, ymax, zoom
+        )
+    else:
+        collection = await get_venues_within_bounds(
+            db, xmin, ymin, xmax, ymax
+        )
+
+    if collection['count'] < 1:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f'No venues found for bounds xmin: {xmin}, ymin; {ymin}, xmax: {xmax}, ymax: {ymax}'
+        )
+
+    return Response(
+        content=collection['document'],
+        media_type='application/json'
+    )
+
+
+@router.get('/batch', response_model=VenueBatchResponse)
+async def fetch_venues_by_ids(
+    request: Request,
+    ids: List[str] = Query(...)
+):
+    venue_ids = parse_batch_ids(ids)
+
+    async def render():
+        async with AsyncSessionLocal() as session:
+            venues = await get_venues_by_ids(session, venue_ids)
+
+        rows = {venue['venue_id']: venue for venue in venues}
+
+        return encode_response(
+            VenueBatchResponse,
+            get_batch_response(venue_ids, rows)
+        )
+
+    async def validate(session):
+        return await get_venue_validator(session, venue_ids=venue_ids)
+
+    return await conditional_response(
+        request, validate, render, VENUE_CACHE_TAGS
+    )
+
+
 @router.get('/{venue_id}', response_model=VenueResponse)
 async def fetch_venue_by_id(
+    request: Request,
+    venue_id: int
+):
+    async def render():
+        async with AsyncSessionLocal() as session:
+            venue = await get_venue_by_id(session, venue_id)
+
+        if not venue:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f'No venue found for venue_id: {venue_id}'
+            )
+
+        return encode_response(VenueResponse, venue)
+
+    async def validate(session):
+        return await get_venue_validator(session, venue_id)
+
+    return await conditional_response(
+        request, validate, render, VENUE_CACHE_TAGS,
+        detail=True
+    )
+
+
+@router.get('/{venue_id}/nearby', response_model=List[VenueNearbyResponse])
+async def fetch_venues_nearby(
     venue_id: int,
+    radius: int = Query(NEARBY_RADIUS, ge=1, le=MAX_NEARBY_RADIUS),
+    limit: int = Query(NEARBY_LIMIT, ge=1, le=MAX_NEARBY_LIMIT),
     db: AsyncSession = Depends(get_db)
 ):
-    venue = await get_venue_by_id(db, venue_id)
+    venue = await get_simple_venue_by_id(db, venue_id)
 
-    if not venue:
+    if not venue or venue.wkb_geometry is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f'No venue found for venue_id: {venue_id}'
         )
 
-    return venue
+    venues = await get_venues_near_venue(db, venue_id, radius, limit)
 
+    return venues
 
-@router.get('/bounds', response_model=VenueBoundsResponse)
-async def fetch_venues_within_bounds(
-    xmin: Decimal,
-    ymin: Decimal,
-    xmax: Decimal,
-    ymax: Decimal,
+
+@router.get('/{venue_id}/calendar.ics')
+async def fetch_venue_calendar(
+    request: Request,
+    venue_id: int,
+    lang: str = Query('de'),
     db: AsyncSession = Depends(get_db)
 ):
-    rows = await get_venues_within_bounds(db, xmin, ymin, xmax, ymax)
+    venue = await get_simple_venue_by_id(db, venue_id)
 
-    if len(rows) < 1:
+    if not venue:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
-            detail=f'No venues found for bounds xmin: {xmin}, ymin; {ymin}, xmax: {xmax}, ymax: {ymax}'
-        )
-
-    features = [
-        Feature(
-            id=row['id'],
-            geometry=json.loads(row['geojson']),
-            properties={'label': f'{row['name']}'}
+            detail=f'No venue found for venue_id: {venue_id}'
         )
 
-        for row in rows
-    ]
-
-    venues = FeatureCollection(features)
-
-    return venues
+    return await event_feed_response(
+        request, db, {'venue_id': [venue_id]}, venue.name, lang
+    )
 
 
 @router.post('/', response_model=VenueResponse)
@@ -157,8 +287,14 @@ async def create_venue(
     await add_user_venue(db, current_user.user_id, new_venue.id)
 
     if venue_type_ids:
-        for type_id in venue_type_ids:
-            await add_venue_link_type(db, new_venue.id, type_id)
+        await sync_links(
+            db, VenueLinkTypes.venue_id, VenueLinkTypes.venue_type_id,
+            new_venue.id, venue_type_ids
+        )
+        await db.commit()
+
+    await invalidate_venue_tiles(new_venue.wkb_geometry)
+    response_cache.invalidate('venue')
 
     geom = loads(bytes(new_venue.wkb_geometry.data))
     geojson = VenueGeoJSONPoint(type='Point', coordinates=[geom.x, geom.y])
@@ -215,29 +351,16 @@ async def update_venue(
     venue.opened_at = venue_opened_at
     venue.closed_at = venue_closed_at
 
-    await db.commit()
-    await db.refresh(venue)
-
-    current_venue_types = await get_venue_types_by_venue_id(db, venue_id)
-    print(current_venue_types)
-
-    current_venue_type_ids = [
-        venue_type['VenueLinkTypes'].venue_type_id
-        for venue_type in current_venue_types
-    ]
-
-    # Handle None value for venue_type_ids
-    if venue_type_ids is None:
-        venue_type_ids = []
-
-    ids_to_add = set(venue_type_ids) - set(current_venue_type_ids)
-    ids_to_remove = set(current_venue_type_ids) - set(venue_type_ids)
+    await sync_links(
+        db, VenueLinkTypes.venue_id, VenueLinkTypes.venue_type_id,
+        venue.id, venue_type_ids
+    )
 
-    for type_id in ids_to_add:
-        await add_venue_link_type(db, venue.id, type_id)
+    await refresh_event_search(db, venue_ids=[venue.id])
+    await db.commit()
 
-    for type_id in ids_to_remove:
-        await delete_venue_link_type(db, venue.id, type_id)
+    await invalidate_venue_tiles(venue.wkb_geometry)
+    response_cache.invalidate('venue')
 
     # Convert geometry to GeoJSON format
     geom = loads(bytes(venue.wkb_geometry.data))
@@ -273,9 +396,14 @@ async def delete_venue_by_id(
             detail=f'No venue found for venue_id: {venue_id}'
         )
 
+    wkb_geometry = venue.wkb_geometry
+
     await db.delete(venue)
     await db.commit()
 
+    await invalidate_venue_tiles(wkb_geometry)
+    response_cache.invalidate('venue')
+
     return {'message': 'Venue deleted successfully'}
 
 
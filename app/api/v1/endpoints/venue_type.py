@@ -1,13 +1,9 @@
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Query
 from typing import List, Optional
 
-from sqlalchemy.ext.asyncio import AsyncSession
-
-from app.db.session import get_db
-
 from app.schemas.venue_type_response import VenueTypeResponse
 
-from app.db.repository.venue_type import get_all_venue_types
+from app.services.lookup import get_lookup_registry
 
 
 router = APIRouter()
@@ -15,9 +11,8 @@ router = APIRouter()
 
 @router.get('/', response_model=List[VenueTypeResponse])
 async def fetch_all_venue_types(
-    lang: Optional[str] = Query(None),
-    db: AsyncSession = Depends(get_db)
+    lang: Optional[str] = Query(None)
 ):
-    venue_types = await get_all_venue_types(db, lang)
+    venue_types = get_lookup_registry().get_types('venue_type', lang)
 
     return venue_types
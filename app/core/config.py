@@ -1,5 +1,5 @@
 from pydantic_settings import BaseSettings
-from typing import ClassVar
+from typing import ClassVar, Optional
 import os
 
 
@@ -12,6 +12,11 @@ class Settings(BaseSettings):
     ALGORITHM: str = 'HS256'
     UPLOAD_DIR: str = os.getenv('UPLOAD_DIR')
     TEMP_DIR: str = os.getenv('TEMP_DIR')
+    TILE_CACHE_DIR: Optional[str] = os.getenv('TILE_CACHE_DIR')
+    SNAPSHOT_DIR: Optional[str] = os.getenv('SNAPSHOT_DIR')
+    VENUE_CLUSTER_MAX_ZOOM: int = os.getenv('VENUE_CLUSTER_MAX_ZOOM', 14)
+    GEOJSON_PRECISION: int = os.getenv('GEOJSON_PRECISION', 6)
+    IMAGE_WORKERS: int = os.getenv('IMAGE_WORKERS', 2)
     ALLOWED_EXTENSIONS: ClassVar[set] = {
         'png', 'jpg', 'jpeg', 'gif', 'webp', 'svg'
     }
@@ -0,0 +1,55 @@
+import base64
+import binascii
+import json
+
+from datetime import datetime
+
+from app.services.batch import MAX_BATCH_ID
+
+
+def encode_cursor(*values) -> str:
+    '''
+    Encode the sort key of the last row of a page into an opaque,
+    url safe cursor string. The first value is expected to be a datetime,
+    all following values are integer ids used as tie breakers.
+    '''
+    payload = [
+        value.isoformat() if isinstance(value, datetime) else value
+        for value in values
+    ]
+
+    raw = json.dumps(payload, separators=(',', ':')).encode('utf-8')
+
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor: str, size: int) -> tuple:
+    '''
+    Decode a cursor created by encode_cursor back into its sort key.
+    Raises a ValueError if the cursor is malformed, has the wrong size or
+    an id outside the id columns.
+    '''
+    padding = '=' * (-len(cursor) % 4)
+
+    try:
+        raw = base64.urlsafe_b64decode(cursor + padding)
+        payload = json.loads(raw)
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise ValueError(f'Invalid cursor: {cursor}')
+
+    if not isinstance(payload, list) or len(payload) != size:
+        raise ValueError(f'Invalid cursor: {cursor}')
+
+    date_value, *id_values = payload
+
+    try:
+        parsed_date = datetime.fromisoformat(date_value)
+        parsed_ids = [int(id_value) for id_value in id_values]
+    except (TypeError, ValueError):
+        raise ValueError(f'Invalid cursor: {cursor}')
+
+    # the id columns are int32, asyncpg fails on anything outside
+    if any(not 0 < id_value <= MAX_BATCH_ID for id_value in parsed_ids):
+        raise ValueError(f'Invalid cursor: {cursor}')
+
+    return (parsed_date, *parsed_ids)
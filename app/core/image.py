@@ -0,0 +1,56 @@
+import os
+
+from pathlib import Path
+
+from PIL import Image as PILImage
+
+
+MAX_IMAGE_PX_SIZE = 1920
+
+# widths of the scaled down copies written next to every raster image
+IMAGE_VARIANT_WIDTHS = (320, 960)
+
+
+def get_variant_name(source_name: str, width: int) -> str:
+    stem, ext = os.path.splitext(source_name)
+
+    return f'{stem}-{width}w{ext}'
+
+
+def save_image(img, path: Path, format: str):
+    # the upload directory is served directly, never expose a half file
+    temp_path = path.with_name(f'.{path.name}.tmp')
+    img.save(temp_path, format=format)
+    os.replace(temp_path, path)
+
+
+def process_image_file(path: str) -> tuple:
+    '''
+    Scale a stored upload down to MAX_IMAGE_PX_SIZE in place and write its
+    width variants next to it. Runs in a worker process of the image
+    pipeline and returns the final width and height.
+    '''
+    path = Path(path)
+
+    with PILImage.open(path) as img:
+        format = img.format
+        size = img.size
+
+        # JPEG decodes at a fraction of its size when that is all we need
+        img.draft(img.mode, (MAX_IMAGE_PX_SIZE, MAX_IMAGE_PX_SIZE))
+        img.thumbnail((MAX_IMAGE_PX_SIZE, MAX_IMAGE_PX_SIZE), PILImage.LANCZOS)
+
+        if img.size != size:
+            save_image(img, path, format)
+
+        for width in IMAGE_VARIANT_WIDTHS:
+            if width >= img.width:
+                continue
+
+            variant = img.copy()
+            variant.thumbnail((width, img.height), PILImage.LANCZOS)
+
+            variant_path = path.with_name(get_variant_name(path.name, width))
+            save_image(variant, variant_path, format)
+
+        return img.size
@@ -1,30 +1,126 @@
 import re
 
-from datetime import datetime
+from datetime import datetime, timedelta
 
 
 
-def parse_date(date_str: str):
-    date_str = date_str.strip()
+DATE_FORMATS = [
+    (r'^\d{4}$', '%Y', 'year'),
+    (r'^\d{2}\.\d{4}$', '%m.%Y', 'month'),
+    (r'^\d{4}-\d{2}$', '%Y-%m', 'month'),
+    (r'^\d{2}\.\d{2}\.\d{4}$', '%d.%m.%Y', 'day'),
+    (r'^\d{4}-\d{2}-\d{2}$', '%Y-%m-%d', 'day')
+]
+
+# longest relative window next<N>d
+MAX_NEXT_DAYS = 366
+
+
+def next_period_start(start: datetime, unit: str):
+    if unit == 'year':
+        return start.replace(year=start.year + 1)
+
+    if unit == 'month':
+        if start.month == 12:
+            return start.replace(year=start.year + 1, month=1)
+
+        return start.replace(month=start.month + 1)
+
+    return start + timedelta(days=1)
+
+
+def parse_period(date_str: str, now: datetime):
+    '''
+    Resolve a year, month, day or relative window to its half-open
+    [start, end) period.
+    '''
+    today = now.replace(hour=0, minute=0, second=0, microsecond=0)
+
+    if date_str == 'today':
+        return today, today + timedelta(days=1)
+
+    if date_str == 'tomorrow':
+        return today + timedelta(days=1), today + timedelta(days=2)
+
+    if date_str == 'weekend':
+        # the running weekend on saturday and sunday, else the next one
+        saturday = today + timedelta(days=(5 - today.weekday()) % 7)
+
+        if today.weekday() == 6:
+            saturday = today - timedelta(days=1)
+
+        return saturday, saturday + timedelta(days=2)
+
+    match = re.match(r'^next(\d+)d$', date_str)
+
+    if match:
+        days = int(match.group(1))
+
+        if not 1 <= days <= MAX_NEXT_DAYS:
+            raise ValueError(
+                f'next<N>d takes 1 to {MAX_NEXT_DAYS} days: {date_str}'
+            )
+
+        return today, today + timedelta(days=days)
+
+    for pattern, date_format, unit in DATE_FORMATS:
+        if re.match(pattern, date_str):
+            # the period after 31.12.9999 does not exist
+            try:
+                start = datetime.strptime(date_str, date_format)
+
+                return start, next_period_start(start, unit)
+            except (ValueError, OverflowError):
+                raise ValueError(f'Invalid date format: {date_str}')
+
+    raise ValueError(f'Unknown date format: {date_str}')
+
+
+def parse_date_range(date_str: str, now: datetime = None):
+    '''
+    Parse a date filter into a half-open [start, end) range, either bound
+    may be None. Accepts a period with an optional operator (>=05.2025),
+    an explicit range (2025-05-01..2025-05-31, open ends allowed) and the
+    relative windows today, tomorrow, weekend and next<N>d.
+    '''
+    date_str = date_str.strip().lower()
+    now = now or datetime.now()
+
+    if '..' in date_str:
+        range_start, range_end = (
+            value.strip() for value in date_str.split('..', 1)
+        )
+
+        if not range_start and not range_end:
+            raise ValueError(f'Unknown date format: {date_str}')
+
+        start = parse_period(range_start, now)[0] if range_start else None
+        end = parse_period(range_end, now)[1] if range_end else None
+
+        if start and end and start >= end:
+            raise ValueError(f'Empty date range: {date_str}')
+
+        return start, end
+
+    # Match optional operators (<, >, =) before the period
+    match = re.match(r'^([<>]=?|=)?\s*(.+)$', date_str)
 
-    # Match optional operators (<, >, =) before the date
-    match = re.match(r'([<>]=?|=)?\s*(\d{4}|\d{2}\.\d{4}|\d{2}\.\d{2}\.\d{4})$', date_str)
-    
     if not match:
         raise ValueError(f'Unknown date format: {date_str}')
 
-    operator, date_value = match.groups()
-    operator = operator or '='  # Default to '=' if no operator is provided
+    operator, period = match.groups()
 
-    # Parse date formats
-    try:
-        if re.match(r'^\d{4}$', date_value):  # Year only
-            return datetime.strptime(date_value, '%Y'), operator
-        elif re.match(r'^\d{2}\.\d{4}$', date_value):  # Month.Year
-            return datetime.strptime(date_value, '%m.%Y'), operator
-        elif re.match(r'^\d{2}\.\d{2}\.\d{4}$', date_value):  # Day.Month.Year
-            return datetime.strptime(date_value, '%d.%m.%Y'), operator
-    except ValueError:
-        raise ValueError(f'Invalid date format: {date_str}')
+    start, end = parse_period(period, now)
 
-    raise ValueError(f'Unknown date format: {date_str}')
+    if operator in [None, '=']:
+        return start, end
+    elif operator == '>':
+        return end, None
+    elif operator == '>=':
+        return start, None
+    elif operator == '<':
+        return None, start
+    elif operator == '<=':
+        return None, end
+
+    raise ValueError(f'Invalid operator: {operator}')
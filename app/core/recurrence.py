@@ -0,0 +1,112 @@
+import re
+
+from datetime import MAXYEAR, datetime, timedelta
+from typing import List, Optional
+
+from dateutil.rrule import rrulestr
+
+
+# open ended series are materialised this far ahead and extended by
+# tools/extend_event_series.py
+RECURRENCE_HORIZON_DAYS = 180
+MAX_SERIES_DATES = 366
+
+# weekdays and leap years of the Gregorian calendar repeat every 400 years
+CALENDAR_CYCLE_YEARS = 400
+
+
+def get_recurrence_rule(rule: str, date_start: datetime) -> str:
+    '''
+    Validate an RRULE value like FREQ=WEEKLY;BYDAY=MO and anchor it at the
+    first date of the series, the stored text expands on its own later.
+    Series dates are naive, an UNTIL in UTC keeps its clock time like the
+    submitted dates do. A rule that never matches is rejected.
+    '''
+    rule = rule.strip().removeprefix('RRULE:')
+    rule = re.sub(r'(UNTIL=\d{8}(?:T\d{6})?)Z', r'\1', rule, flags=re.I)
+
+    # BYEASTER does not repeat with the calendar, see get_bounded_rule
+    if 'BYEASTER' in rule.upper():
+        raise ValueError(f'Invalid recurrence rule: {rule}')
+
+    text = f'DTSTART:{date_start:%Y%m%dT%H%M%S}\nRRULE:{rule}'
+
+    try:
+        bounded_rule, _ = get_bounded_rule(text, date_start)
+    except (ValueError, TypeError):
+        raise ValueError(f'Invalid recurrence rule: {rule}')
+
+    if next(iter(bounded_rule), None) is None:
+        raise ValueError(f'Recurrence rule never matches: {rule}')
+
+    return text
+
+
+def get_series_start(text: str) -> datetime:
+    dtstart = text.split('\n', 1)[0].removeprefix('DTSTART:')
+
+    return datetime.strptime(dtstart, '%Y%m%dT%H%M%S')
+
+
+def get_bounded_rule(text: str, until: datetime):
+    '''
+    dateutil only notices that a rule never matches when it reaches year
+    9999, FREQ=DAILY;BYMONTH=2;BYMONTHDAY=30 blocks for seconds whatever
+    UNTIL says. The rule is moved as many whole calendar cycles ahead as
+    fit before that year, it matches the same days there and any search
+    past until ends within one cycle. Returns the rule and the years to
+    subtract from its dates.
+    '''
+    # one cycle stays free after until, so every date the rule has left
+    # comes before year 9999
+    free_years = MAXYEAR - CALENDAR_CYCLE_YEARS - until.year
+    years = max(free_years // CALENDAR_CYCLE_YEARS, 0) * CALENDAR_CYCLE_YEARS
+
+    shifted = re.sub(
+        r'(DTSTART:|UNTIL=)(\d{4})',
+        lambda match: f'{match.group(1)}{int(match.group(2)) + years}',
+        text,
+        flags=re.I
+    )
+
+    return rrulestr(shifted), years
+
+
+def shift_years(date: datetime, years: int) -> datetime:
+    return date.replace(year=date.year + years)
+
+
+def expand_recurrence(
+    text: str,
+    after: Optional[datetime] = None,
+    until: Optional[datetime] = None
+) -> List[datetime]:
+    '''
+    Start times of a stored rule later than after and up to the horizon,
+    at most MAX_SERIES_DATES per call. As in RFC 5545 the series start
+    belongs to the series even when the rule does not match it.
+    '''
+    series_start = get_series_start(text)
+    until = until or datetime.now() + timedelta(days=RECURRENCE_HORIZON_DAYS)
+    rule, years = get_bounded_rule(text, until)
+
+    dates = []
+
+    if after is None or series_start > after:
+        dates.append(series_start)
+
+    if after:
+        occurrences = rule.xafter(shift_years(after, years), inc=False)
+    else:
+        occurrences = iter(rule)
+
+    for occurrence in occurrences:
+        date_start = shift_years(occurrence, -years)
+
+        if date_start > until or len(dates) >= MAX_SERIES_DATES:
+            break
+
+        if date_start != series_start:
+            dates.append(date_start)
+
+    return dates
@@ -11,10 +11,13 @@ async def get_all_countrys(db: AsyncSession, lang: str):
             Country.code.label('country_code'),
             Country.iso_639_1.label('country_iso_639_1'),
         )
-        .where(Country.iso_639_1 == lang)
-        .order_by(Country.name)
     )
 
+    if lang:
+        stmt = stmt.where(Country.iso_639_1 == lang)
+
+    stmt = stmt.order_by(Country.name)
+
     countrys = await db.execute(stmt)
     result = countrys.mappings().all()
 
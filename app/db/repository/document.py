@@ -0,0 +1,88 @@
+from sqlalchemy import Integer, JSON, String, Text, bindparam, cast, literal
+from sqlalchemy.future import select
+from sqlalchemy.sql import func
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+from geoalchemy2.functions import ST_AsGeoJSON
+
+from app.core.config import settings
+
+
+def get_geojson(geometry, precision: int = None):
+    return cast(
+        ST_AsGeoJSON(geometry, precision or settings.GEOJSON_PRECISION),
+        JSON
+    )
+
+
+def get_json_object(columns):
+    # keys are typed, json_build_object takes arguments of any type
+    arguments = []
+
+    for column in columns:
+        arguments += [literal(column.name, String), column]
+
+    return func.json_build_object(*arguments)
+
+
+def get_json_array(value, *order_by):
+    # an empty aggregate is NULL, the document is an empty array instead
+    if order_by:
+        value = aggregate_order_by(value, *order_by)
+
+    return func.coalesce(func.json_agg(value), func.json_build_array())
+
+
+def get_ordered_rows(stmt, order_by: list, fields: tuple = None):
+    '''
+    Number the rows of a select in its sort order and return the subquery
+    with the JSON object of each row. Only the given fields go into the
+    object, the select may carry more columns for the caller.
+    '''
+    rows = (
+        stmt
+        .add_columns(func.row_number().over(order_by=order_by).label('ordinal'))
+        .subquery('rows')
+    )
+
+    row = get_json_object([
+        column for column in rows.c
+        if column.name != 'ordinal' and (fields is None or column.name in fields)
+    ])
+
+    return rows, row
+
+
+def get_json_array_stmt(stmt, order_by: list, fields: tuple = None):
+    rows, row = get_ordered_rows(stmt, order_by, fields)
+
+    return select(cast(get_json_array(row, rows.c.ordinal), Text))
+
+
+def get_json_page_stmt(
+    stmt,
+    order_by: list,
+    cursor_columns: list,
+    fields: tuple = None
+):
+    '''
+    Turn a select fetching one row more than its page into a single row:
+    the page as JSON text built by Postgres, the number of rows fetched and
+    the sort key of the last row of the page for the next cursor. The limit
+    bind parameter of the select is the page size plus one.
+    '''
+    rows, row = get_ordered_rows(stmt, order_by, fields)
+
+    ordinal = rows.c.ordinal
+    limit = bindparam('limit', type_=Integer)
+
+    return select(
+        cast(func.coalesce(
+            func.json_agg(aggregate_order_by(row, ordinal)).filter(ordinal < limit),
+            func.json_build_array()
+        ), Text).label('document'),
+        func.count().label('count'),
+        *[
+            func.max(rows.c[name]).filter(ordinal == limit - 1).label(name)
+            for name in cursor_columns
+        ]
+    )
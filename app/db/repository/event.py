@@ -1,4 +1,9 @@
 import re
+import operator
+
+from datetime import datetime
+from typing import List
+from functools import lru_cache, reduce
 
 from fastapi import HTTPException, status
 
@@ -6,440 +11,799 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.future import select
-from sqlalchemy.orm import aliased
 from sqlalchemy.sql import func
-from sqlalchemy import asc, desc, or_, case, cast, JSON, exists
+from sqlalchemy import and_, asc, desc, or_, case, cast, JSON, exists
+from sqlalchemy import false, insert, literal, not_, null, true, union_all
+from sqlalchemy import any_, bindparam, DateTime, Integer, String
+from sqlalchemy.dialects.postgresql import ARRAY
 from geoalchemy2.functions import ST_AsGeoJSON
 
 from app.models.user_organizer_links import UserOrganizerLinks
 from app.schemas.event import EventCreate, EventUpdate
 from app.schemas.image import ImageCreate
 
-from app.models.i18n_locale import I18nLocale
 from app.models.organizer import Organizer
 from app.models.event import Event
 from app.models.event_date import EventDate
+from app.models.event_search import EventSearch
 from app.models.event_link_types import EventLinkTypes
-from app.models.event_type import EventType
-from app.models.space import Space
-from app.models.venue_link_types import VenueLinkTypes
-from app.models.venue_type import VenueType
 from app.models.venue import Venue
-from app.models.genre_link_types import GenreLinkTypes
-from app.models.genre_type import GenreType
-from app.models.space_type import SpaceType
 
-from app.models.event_date_link_images import EventDateLinkImages
 from app.models.event_link_images import EventLinkImages
 from app.models.image import Image
 
 from app.models.user_role import UserRole
 
-from app.enum.sort_order import SortOrder
-from app.core.parser import parse_date
+from app.db.repository.document import get_json_page_stmt
+from app.db.repository.validator import get_validator_columns, with_time_zone
 
+from app.core.config import settings
+from app.enum.sort_order import SortOrder
+from app.core.parser import parse_date_range
+
+
+# date filter -> (column compared with the range start, column compared
+# with the range end), date matches every event overlapping the range
+DATE_FILTERS = {
+    'date': (EventSearch.event_date_end, EventSearch.event_date_start),
+    'date_start': (EventSearch.event_date_start, EventSearch.event_date_start),
+    'date_end': (EventSearch.event_date_end, EventSearch.event_date_end)
+}
+
+# filter name -> (event_search column, comparison against an array bind)
+ARRAY_FILTERS = {
+    'venue_id': (EventSearch.venue_id, 'any'),
+    'id': (EventSearch.event_id, 'any'),
+    'space_id': (EventSearch.space_id, 'any'),
+    'organizer_id': (EventSearch.organizer_id, 'any'),
+    'event_type_id': (EventSearch.event_type_ids, 'overlap'),
+    'venue_type_id': (EventSearch.venue_type_ids, 'overlap'),
+    'genre_type_id': (EventSearch.genre_type_ids, 'overlap')
+}
+
+SCALAR_FILTERS = {
+    'city': EventSearch.venue_city,
+    'postal_code': EventSearch.venue_postcode
+}
+
+# filter name -> facet it narrows, counted without that filter
+FACET_FILTERS = {
+    'event_type_id': 'event_types',
+    'genre_type_id': 'genre_types',
+    'venue_type_id': 'venue_types',
+    'city': 'cities',
+    'date': 'days'
+}
+
+# facet -> event_search array column unnested into type ids
+ARRAY_FACETS = {
+    'event_types': 'event_type_ids',
+    'genre_types': 'genre_type_ids',
+    'venue_types': 'venue_type_ids'
+}
+
+
+# output columns of the event lists in their canonical order, the teaser
+# is only returned on request
+EVENT_LIST_FIELDS = (
+    'event_id',
+    'event_date_id',
+    'venue_id',
+    'venue_name',
+    'venue_postcode',
+    'venue_city',
+    'event_title',
+    'event_description',
+    'event_teaser',
+    'event_date_start',
+    'event_created_at',
+    'event_type',
+    'genre_type',
+    'organizer_name',
+    'space_name',
+    'space_type',
+    'venue_type',
+    'image_url',
+    'geojson'
+)
+
+EVENT_DEFAULT_FIELDS = tuple(
+    name for name in EVENT_LIST_FIELDS if name != 'event_teaser'
+)
+
+
+def get_event_search_columns(precision: int = 15, fields: tuple = None):
+    fields = fields or EVENT_DEFAULT_FIELDS
+    base_url = bindparam('base_url', type_=String)
+    uploads_url = func.concat(base_url, 'uploads/')
+
+    columns = {
+        'image_url': func.nullif(
+            func.concat(uploads_url, EventSearch.image_source_name),
+            uploads_url).label('image_url'),
+        'geojson': cast(
+            ST_AsGeoJSON(EventSearch.wkb_geometry, precision), JSON
+        ).label('geojson')
+    }
+
+    # columns left out are never computed, the image url and the GeoJSON
+    # of a compact list cost nothing
+    return [
+        columns.get(name, getattr(EventSearch, name))
+        for name in EVENT_LIST_FIELDS if name in fields
+    ]
+
+
+def get_filter_clause(column_name: str, variant):
+    if column_name in DATE_FILTERS:
+        start_column, end_column = DATE_FILTERS[column_name]
+        has_start, has_end = variant
+        clauses = []
+
+        if has_start:
+            clauses.append(start_column >= bindparam(
+                f'{column_name}_from', type_=DateTime))
+
+        if has_end:
+            clauses.append(end_column < bindparam(
+                f'{column_name}_to', type_=DateTime))
+
+        return and_(*clauses)
+
+    if column_name in SCALAR_FILTERS:
+        return SCALAR_FILTERS[column_name] == bindparam(column_name)
+
+    column_attr, comparison = ARRAY_FILTERS[column_name]
+    values = bindparam(column_name, type_=ARRAY(Integer))
+
+    if comparison == 'overlap':
+        return column_attr.overlap(values)
+
+    return column_attr == any_(values)
+
+
+def get_filter_clauses(filter_shape: tuple):
+    return [
+        get_filter_clause(column_name, variant)
+        for column_name, variant in filter_shape
+    ]
+
+
+EVENT_FILTER_ORDER = [EventSearch.event_date_start, EventSearch.event_date_id]
+
+
+@lru_cache(maxsize=256)
+def build_events_by_filter_stmt(
+    shape: tuple,
+    precision: int = 15,
+    fields: tuple = None
+):
+    '''
+    Build the event filter select for a filter shape. Every value is a bind
+    parameter and multi value filters bind a single array, so one statement
+    serves all requests of the same shape and compiles only once.
+    '''
+    filter_shape, has_cursor, has_limit = shape
 
-async def get_events_by_filter(db: AsyncSession, filters: dict, base_url: str, lang: str = 'de'):
-    filtered_i18n = (
-        select(I18nLocale.id, I18nLocale.iso_639_1)
-        .where(I18nLocale.iso_639_1 == lang)
-        .cte('FilteredI18n')
+    stmt = (
+        select(*get_event_search_columns(precision, fields))
+        .where(EventSearch.iso_639_1 == bindparam('lang'))
+        .where(*get_filter_clauses(filter_shape))
+        .order_by(*EVENT_FILTER_ORDER)
     )
 
-    venue_types = (
-        select(VenueType.type_id.label('venue_type_id'),
-               VenueType.name.label('venue_name'), filtered_i18n.c.iso_639_1)
-        .join(filtered_i18n, filtered_i18n.c.id == VenueType.i18n_locale_id)
-        .cte('VenueTypes')
-    )
+    # Keyset pagination, the leading date bound keeps the
+    # event_search_date_start_idx usable for every page
+    if has_cursor:
+        cursor_date_start = bindparam('cursor_date_start', type_=DateTime)
 
-    event_types = (
-        select(EventType.type_id.label('event_type_id'),
-               EventType.name.label('event_name'), filtered_i18n.c.iso_639_1)
-        .join(filtered_i18n, filtered_i18n.c.id == EventType.i18n_locale_id)
-        .cte('EventTypes')
-    )
+        stmt = stmt.where(
+            EventSearch.event_date_start >= cursor_date_start,
+            or_(
+                EventSearch.event_date_start > cursor_date_start,
+                EventSearch.event_date_id > bindparam('cursor_event_date_id')
+            )
+        )
 
-    genre_types = (
-        select(GenreType.type_id.label('genre_type_id'),
-               GenreType.name.label('genre_name'), filtered_i18n.c.iso_639_1)
-        .join(filtered_i18n, filtered_i18n.c.id == GenreType.i18n_locale_id)
-        .cte('GenreTypes')
-    )
+    if has_limit:
+        stmt = stmt.limit(bindparam('limit', type_=Integer))
 
-    space_types = (
-        select(SpaceType.type_id.label('space_type_id'),
-               SpaceType.name.label('space_type'))
-        .join(filtered_i18n, filtered_i18n.c.id == SpaceType.i18n_locale_id)
-        .cte('SpaceTypes')
-    )
+    return stmt
 
-    # Aliases
-    cet = aliased(event_types)
-    get = aliased(genre_types)
-    gvt = aliased(venue_types)
-    spt = aliased(space_types)
 
-    stmt = (
-        select(
-            Event.id.label('event_id'),
-            EventDate.id.label('event_date_id'),
-            Venue.id.label('venue_id'),
-            Venue.name.label('venue_name'),
-            Venue.postal_code.label('venue_postcode'),
-            Venue.city.label('venue_city'),
-            Event.title.label('event_title'),
-            Event.description.label('event_description'),
-            EventDate.date_start.label('event_date_start'),
-            Event.created_at.label('event_created_at'),
-            func.string_agg(func.distinct(cet.c.event_name),
-                            ', ').label('event_type'),
-            func.string_agg(func.distinct(get.c.genre_name),
-                            ', ').label('genre_type'),
-            Organizer.name.label('organizer_name'),
-            Space.name.label('space_name'),
-            spt.c.space_type,
-            func.string_agg(func.distinct(gvt.c.venue_name),
-                            ', ').label('venue_type'),
-            func.nullif(
-                func.concat(base_url, 'uploads/', Image.source_name),
-                base_url + 'uploads/').label('image_url'),
-            cast(ST_AsGeoJSON(Venue.wkb_geometry, 15), JSON).label('geojson')
+def get_events_by_filter_params(
+    filters: dict,
+    base_url: str,
+    lang: str = 'de',
+    limit: int = None,
+    cursor: tuple = None
+):
+    filter_shape = []
+    params = {'base_url': base_url, 'lang': lang}
 
-        )
-        .select_from(Event)
-        .join(EventDate, Event.id == EventDate.event_id)
-        .outerjoin(Venue, Venue.id == func.coalesce(
-            EventDate.venue_id, Event.venue_id)
-        )
-        .outerjoin(Space, Space.id == func.coalesce(
-            EventDate.space_id, Event.space_id)
-        )
-        .outerjoin(
-            EventLinkTypes,
-            EventLinkTypes.event_id == Event.id
-        )
-        .outerjoin(EventType, EventType.id == EventLinkTypes.event_type_id)
-        .outerjoin(cet, cet.c.event_type_id == EventLinkTypes.event_type_id)
-        .outerjoin(GenreLinkTypes, GenreLinkTypes.event_id == Event.id)
-        .outerjoin(GenreType, GenreType.id == GenreLinkTypes.genre_type_id)
-        .outerjoin(get, get.c.genre_type_id == GenreLinkTypes.genre_type_id)
-        .outerjoin(
-            VenueLinkTypes,
-            VenueLinkTypes.venue_id == Venue.id
-        )
-        .outerjoin(gvt, gvt.c.venue_type_id == VenueLinkTypes.venue_type_id)
-        .outerjoin(spt, spt.c.space_type_id == Space.space_type_id)
-        .outerjoin(Organizer, Organizer.id == Event.organizer_id)
-        .outerjoin(
-            EventDateLinkImages,
-            (EventDateLinkImages.event_date_id == EventDate.id) &
-            (EventDateLinkImages.main_image)
-        )
-        .outerjoin(
-            EventLinkImages,
-            (EventLinkImages.event_id == Event.id) &
-            (EventLinkImages.main_image)
-        )
-        .outerjoin(
-            Image,
-            Image.id == func.coalesce(
-                EventDateLinkImages.image_id, EventLinkImages.image_id))
-        .group_by(
-            Event.id,
-            EventDate.id,
-            Venue.id,
-            Event.title,
-            Event.description,
-            Organizer.name,
-            Venue.name,
-            Venue.postal_code,
-            Venue.city,
-            EventDate.date_start,
-            Event.created_at,
-            Space.name,
-            spt.c.space_type,
-            Image.source_name
-        )
-        .order_by(EventDate.date_start)
+    for column_name, filter_value in sorted(filters.items()):
+        if column_name in DATE_FILTERS:
+            range_start, range_end = parse_date_range(filter_value)
+
+            filter_shape.append((
+                column_name,
+                (range_start is not None, range_end is not None)
+            ))
+            params[f'{column_name}_from'] = range_start
+            params[f'{column_name}_to'] = range_end
+
+        elif column_name in SCALAR_FILTERS or column_name in ARRAY_FILTERS:
+            filter_shape.append((column_name, None))
+            params[column_name] = filter_value
+
+    if cursor:
+        params['cursor_date_start'], params['cursor_event_date_id'] = cursor
+
+    if limit:
+        params['limit'] = limit
+
+    shape = (tuple(filter_shape), bool(cursor), bool(limit))
+
+    return shape, params
+
+
+def get_events_by_filter_stmt(
+    filters: dict,
+    base_url: str,
+    lang: str = 'de',
+    limit: int = None,
+    cursor: tuple = None,
+    fields: tuple = None
+):
+    shape, params = get_events_by_filter_params(
+        filters, base_url, lang, limit, cursor
     )
 
-    # Dictionary to group values by column name
-    column_filters = {}
-
-    # Apply multiple filters dynamically
-    for column_name, filter_value in filters.items():
-        if column_name in ['date_start', 'date_end']:
-            parsed_date, date_operator = parse_date(filter_value)
-
-            if date_operator == '=':
-                stmt = stmt.where(EventDate.date_start == parsed_date)
-            elif date_operator == '>':
-                stmt = stmt.where(EventDate.date_start > parsed_date)
-            elif date_operator == '<':
-                stmt = stmt.where(EventDate.date_start < parsed_date)
-            elif date_operator == '>=':
-                stmt = stmt.where(EventDate.date_start >= parsed_date)
-            elif date_operator == '<=':
-                stmt = stmt.where(EventDate.date_start <= parsed_date)
-            else:
-                raise ValueError(f'Invalid operator: {date_operator}')
-
-        elif column_name in ['city', 'postal_code']:
-            column_attr = getattr(Venue, column_name)
-            stmt = stmt.where(column_attr == filter_value)
-
-        elif column_name == 'venue_id':
-            column_attr = Venue.id
-            column_filters.setdefault(column_attr, []).extend(filter_value)
-
-        elif column_name == 'event_type_id':
-            column_attr = cet.c.event_type_id
-            column_filters.setdefault(column_attr, []).extend(filter_value)
-
-        elif column_name == 'venue_type_id':
-            column_attr = gvt.c.venue_type_id
-            column_filters.setdefault(column_attr, []).extend(filter_value)
-
-        elif column_name == 'genre_type_id':
-            column_attr = get.c.genre_type_id
-            column_filters.setdefault(column_attr, []).extend(filter_value)
-
-        elif column_name in ['id', 'space_id']:
-            column_attr = getattr(Event, column_name)
-            column_filters.setdefault(column_attr, []).extend(filter_value)
-
-    # Apply OR conditions for grouped filters
-    for column_attr, values in column_filters.items():
-        stmt = stmt.where(or_(*[column_attr == value for value in values]))
+    return build_events_by_filter_stmt(shape, fields=fields), params
 
-    result = await db.execute(stmt)
+
+async def get_events_by_filter(
+    db: AsyncSession,
+    filters: dict,
+    base_url: str,
+    lang: str = 'de',
+    limit: int = None,
+    cursor: tuple = None
+):
+    stmt, params = get_events_by_filter_stmt(
+        filters, base_url, lang, limit, cursor
+    )
+
+    result = await db.execute(stmt, params)
     events = result.mappings().all()
 
     return events
 
 
-async def get_events_sort_by(db: AsyncSession, order: dict, base_url: str, lang: str = 'de'):
-    order_function = asc if order == SortOrder.asc else desc
+def get_page_fields(fields: tuple, cursor_columns: tuple):
+    # the select carries the sort key even when it is not requested
+    if fields is None:
+        return None
+
+    return tuple(sorted(set(fields).union(cursor_columns)))
+
 
-    filtered_i18n = (
-        select(I18nLocale.id, I18nLocale.iso_639_1)
-        .where(I18nLocale.iso_639_1 == lang)
-        .cte('FilteredI18n')
+EVENT_FILTER_CURSOR = ('event_date_start', 'event_date_id')
+
+
+@lru_cache(maxsize=256)
+def build_events_by_filter_document_stmt(shape: tuple, fields: tuple = None):
+    stmt = build_events_by_filter_stmt(
+        shape,
+        settings.GEOJSON_PRECISION,
+        get_page_fields(fields, EVENT_FILTER_CURSOR)
     )
 
-    venue_types = (
-        select(VenueType.type_id.label('venue_type_id'),
-               VenueType.name.label('venue_name'), filtered_i18n.c.iso_639_1)
-        .join(filtered_i18n, filtered_i18n.c.id == VenueType.i18n_locale_id)
-        .cte('VenueTypes')
+    return get_json_page_stmt(
+        stmt, EVENT_FILTER_ORDER, EVENT_FILTER_CURSOR, fields
     )
 
-    event_types = (
-        select(EventType.type_id.label('event_type_id'),
-               EventType.name.label('event_name'), filtered_i18n.c.iso_639_1)
-        .join(filtered_i18n, filtered_i18n.c.id == EventType.i18n_locale_id)
-        .cte('EventTypes')
+
+async def get_events_by_filter_document(
+    db: AsyncSession,
+    filters: dict,
+    base_url: str,
+    lang: str = 'de',
+    limit: int = None,
+    cursor: tuple = None,
+    fields: tuple = None
+):
+    '''
+    A page of filtered events as JSON text built by Postgres, limit is the
+    page size plus one. Returns the document, the number of rows fetched
+    and the sort key of the last row of the page.
+    '''
+    shape, params = get_events_by_filter_params(
+        filters, base_url, lang, limit, cursor
     )
 
-    genre_types = (
-        select(GenreType.type_id.label('genre_type_id'),
-               GenreType.name.label('genre_name'), filtered_i18n.c.iso_639_1)
-        .join(filtered_i18n, filtered_i18n.c.id == GenreType.i18n_locale_id)
-        .cte('GenreTypes')
+    result = await db.execute(
+        build_events_by_filter_document_stmt(shape, fields), params
     )
 
-    space_types = (
-        select(SpaceType.type_id.label('space_type_id'),
-               SpaceType.name.label('space_type'))
-        .join(filtered_i18n, filtered_i18n.c.id == SpaceType.i18n_locale_id)
-        .cte('SpaceTypes')
+    return result.mappings().first()
+
+
+@lru_cache(maxsize=256)
+def build_events_validator_stmt(filter_shape: tuple):
+    '''
+    Row count and last change of the filtered event_search rows, answered
+    from the indexes without building any of the response columns.
+    '''
+    return (
+        select(*get_validator_columns(EventSearch.modified_at))
+        .where(EventSearch.iso_639_1 == bindparam('lang'))
+        .where(*get_filter_clauses(filter_shape))
     )
 
-    # Aliases
-    cet = aliased(event_types)
-    get = aliased(genre_types)
-    gvt = aliased(venue_types)
-    spt = aliased(space_types)
 
-    stmt = (
+async def get_events_validator(
+    db: AsyncSession,
+    filters: dict = None,
+    lang: str = 'de'
+):
+    (filter_shape, _, _), params = get_events_by_filter_params(
+        filters or {}, None, lang
+    )
+    params.pop('base_url')
+
+    stmt = build_events_validator_stmt(filter_shape)
+
+    result = await db.execute(stmt, params)
+    validator = result.mappings().first()
+
+    return validator
+
+
+@lru_cache(maxsize=256)
+def build_event_facets_stmt(filter_shape: tuple):
+    '''
+    Count the matching event dates per facet value in one scan of
+    event_search. Facet filters are evaluated as flags instead of being
+    applied, each facet counts the rows passing every other filter so a
+    selection does not hide its own alternatives.
+    '''
+    facet_clauses = {}
+    clauses = [EventSearch.iso_639_1 == bindparam('lang')]
+
+    for column_name, variant in filter_shape:
+        clause = get_filter_clause(column_name, variant)
+        facet = FACET_FILTERS.get(column_name)
+
+        # null comparisons count as a failed filter
+        if facet:
+            facet_clauses[facet] = func.coalesce(clause, false())
+        else:
+            clauses.append(clause)
+
+    # a row failing two facet filters counts for no facet at all
+    if len(facet_clauses) > 1:
+        misses = [
+            cast(not_(clause), Integer) for clause in facet_clauses.values()
+        ]
+        clauses.append(reduce(operator.add, misses) <= 1)
+
+    matches = (
         select(
-            Event.id.label('event_id'),
-            Venue.id.label('venue_id'),
-            Venue.name.label('venue_name'),
-            Venue.postal_code.label('venue_postcode'),
-            Venue.city.label('venue_city'),
-            Event.title.label('event_title'),
-            Event.description.label('event_description'),
-            EventDate.date_start.label('event_date_start'),
-            Event.created_at.label('event_created_at'),
-            func.string_agg(func.distinct(cet.c.event_name),
-                            ', ').label('event_type'),
-            func.string_agg(func.distinct(get.c.genre_name),
-                            ', ').label('genre_type'),
-            Organizer.name.label('organizer_name'),
-            Space.name.label('space_name'),
-            spt.c.space_type,
-            func.string_agg(func.distinct(gvt.c.venue_name),
-                            ', ').label('venue_type'),
-            func.nullif(func.concat(base_url, 'uploads/', Image.source_name),
-                        base_url + 'uploads/').label('image_url')
-        )
-        .select_from(Event)
-        .join(EventDate, Event.id == EventDate.event_id)
-        .join(Venue, Venue.id == func.coalesce(EventDate.venue_id, Event.venue_id), isouter=True)
-        .join(Space, Space.id == func.coalesce(EventDate.space_id, Event.space_id), isouter=True)
-        .join(EventLinkTypes, EventLinkTypes.event_id == Event.id, isouter=True)
-        .outerjoin(EventType, EventType.id == EventLinkTypes.event_type_id)
-        .outerjoin(cet, cet.c.event_type_id == EventLinkTypes.event_type_id)
-        .outerjoin(GenreLinkTypes, GenreLinkTypes.event_id == Event.id)
-        .outerjoin(GenreType, GenreType.id == GenreLinkTypes.genre_type_id)
-        .outerjoin(get, get.c.genre_type_id == GenreLinkTypes.genre_type_id)
-        .outerjoin(VenueLinkTypes, VenueLinkTypes.venue_id == Venue.id)
-        .outerjoin(gvt, gvt.c.venue_type_id == VenueLinkTypes.venue_type_id)
-        .outerjoin(spt, spt.c.space_type_id == Space.space_type_id)
-        .outerjoin(Organizer, Organizer.id == Event.organizer_id)
-        .outerjoin(EventDateLinkImages, (EventDateLinkImages.event_date_id == EventDate.id) & (EventDateLinkImages.main_image == True))
-        .outerjoin(EventLinkImages, (EventLinkImages.event_id == Event.id) & (EventLinkImages.main_image == True))
-        .outerjoin(Image, Image.id == func.coalesce(EventDateLinkImages.image_id, EventLinkImages.image_id))
-        .group_by(
-            Event.id,
-            Venue.id,
-            Event.title,
-            Event.description,
-            Organizer.name,
-            Venue.name,
-            Venue.postal_code,
-            Venue.city,
-            EventDate.date_start,
-            Event.created_at,
-            Space.name,
-            spt.c.space_type,
-            Image.source_name
+            EventSearch.event_type_ids,
+            EventSearch.genre_type_ids,
+            EventSearch.venue_type_ids,
+            EventSearch.venue_city,
+            func.date(EventSearch.event_date_start).label('day'),
+            *[
+                clause.label(f'{facet}_match')
+                for facet, clause in facet_clauses.items()
+            ]
         )
-        .order_by(order_function(Event.created_at))
+        .where(*clauses)
+        .cte('matches')
     )
 
-    result = await db.execute(stmt)
-    events = result.mappings().all()
+    def facet_select(facet, type_id, value, group, *from_clauses):
+        return (
+            select(
+                literal(facet).label('facet'),
+                type_id.label('type_id'),
+                value.label('value'),
+                func.count().label('count')
+            )
+            .select_from(matches, *from_clauses)
+            .where(group.isnot(None), *[
+                matches.c[f'{other}_match']
+                for other in facet_clauses if other != facet
+            ])
+            .group_by(group)
+        )
 
-    return events
+    selects = []
+
+    for facet, column_name in ARRAY_FACETS.items():
+        type_ids = func.unnest(matches.c[column_name]).table_valued(
+            'type_id').render_derived()
+
+        selects.append(facet_select(
+            facet, type_ids.c.type_id, null().cast(String),
+            type_ids.c.type_id, type_ids
+        ))
+
+    selects.append(facet_select(
+        'cities', null().cast(Integer), matches.c.venue_city,
+        matches.c.venue_city
+    ))
+    selects.append(facet_select(
+        'days', null().cast(Integer), cast(matches.c.day, String),
+        matches.c.day
+    ))
+
+    union = union_all(*selects).subquery()
+
+    return select(union).order_by(
+        union.c.facet,
+        union.c.count.desc(),
+        union.c.type_id,
+        union.c.value
+    )
 
 
-async def add_event_image(db: AsyncSession, image: ImageCreate):
-    new_image = Image(
-        user_id=image.image_user_id,
-        origin_name=image.image_origin_name,
-        mime_type=image.image_mime_type,
-        license_type_id=image.image_license_type_id,
-        copyright=image.image_copyright,
-        image_type_id=image.image_type_id,
-        alt_text=image.image_alt_text,
-        caption=image.image_caption,
-        source_name=image.image_source_name,
-        width=image.image_width,
-        height=image.image_height
+async def get_event_facets(
+    db: AsyncSession,
+    filters: dict,
+    lang: str = 'de'
+):
+    (filter_shape, _, _), params = get_events_by_filter_params(
+        filters, None, lang
     )
+    params.pop('base_url')
 
-    db.add(new_image)
+    stmt = build_event_facets_stmt(filter_shape)
 
-    try:
-        await db.commit()
-        await db.refresh(new_image)
+    result = await db.execute(stmt, params)
+    facets = result.mappings().all()
 
-        return new_image
-    except IntegrityError:
-        await db.rollback()
+    return facets
 
 
-async def add_event_link_image(db: AsyncSession, event_id: int, image_id: int):
-    new_event = EventLinkImages(
-        event_id=event_id,
-        image_id=image_id,
-        main_image=True
+@lru_cache(maxsize=256)
+def build_event_feed_stmt(filter_shape: tuple):
+    return (
+        select(
+            EventSearch.event_date_id,
+            EventSearch.event_title,
+            EventSearch.event_description,
+            EventSearch.event_date_start,
+            EventSearch.event_date_end,
+            func.concat_ws(
+                ', ',
+                EventSearch.venue_name,
+                func.concat_ws(
+                    ' ', EventSearch.venue_postcode, EventSearch.venue_city
+                )
+            ).label('event_venue_address'),
+            with_time_zone(
+                EventSearch.modified_at
+            ).label('event_modified_at')
+        )
+        .where(EventSearch.iso_639_1 == bindparam('lang'))
+        .where(*get_filter_clauses(filter_shape))
+        .order_by(EventSearch.event_date_start, EventSearch.event_date_id)
     )
 
-    db.add(new_event)
 
-    try:
-        await db.commit()
-        await db.refresh(new_event)
+def get_event_feed_stmt(filters: dict, lang: str = 'de'):
+    (filter_shape, _, _), params = get_events_by_filter_params(
+        filters, None, lang
+    )
+    params.pop('base_url')
 
-        return new_event
-    except IntegrityError:
-        await db.rollback()
+    return build_event_feed_stmt(filter_shape), params
 
 
-async def add_event_link_type(db: AsyncSession, event_id: int, type_id: int):
-    new_event_type_link = EventLinkTypes(
-        event_id=event_id,
-        event_type_id=type_id
-    )
+def get_events_sort_order(order: SortOrder):
+    order_function = asc if order == SortOrder.asc else desc
 
-    db.add(new_event_type_link)
+    return [
+        order_function(EventSearch.event_created_at),
+        order_function(EventSearch.event_id),
+        order_function(EventSearch.event_date_id)
+    ]
 
-    try:
-        await db.commit()
-        await db.refresh(new_event_type_link)
-        return new_event_type_link
-    except IntegrityError as e:
-        await db.rollback()
 
-        error_message = str(e.orig)
-        match = re.search(r'\(([a-zA-Z\_]+)\)=\((-?\d+)\)', error_message)
+@lru_cache(maxsize=16)
+def build_events_sort_by_stmt(
+    shape: tuple,
+    precision: int = 15,
+    fields: tuple = None
+):
+    order, has_cursor, has_limit = shape
 
-        if match:
-            column_name = match.group(1)
-            column_value = match.group(2)
+    stmt = (
+        select(*get_event_search_columns(precision, fields))
+        .where(EventSearch.iso_639_1 == bindparam('lang'))
+        .order_by(*get_events_sort_order(order))
+    )
 
-            if column_name in ['event_type_id', 'event_id']:
-                raise HTTPException(
-                    status_code=status.HTTP_409_CONFLICT,
-                    detail=f'The {column_name} ({column_value}) provided is invalid.'
+    # Keyset pagination on (created_at, event_id) with the event date id
+    # as tie breaker for events with several dates
+    if has_cursor:
+        cursor_created_at = bindparam('cursor_created_at', type_=DateTime)
+        cursor_event_id = bindparam('cursor_event_id')
+        cursor_event_date_id = bindparam('cursor_event_date_id')
+
+        if order == SortOrder.asc:
+            stmt = stmt.where(
+                EventSearch.event_created_at >= cursor_created_at,
+                or_(
+                    EventSearch.event_created_at > cursor_created_at,
+                    EventSearch.event_id > cursor_event_id,
+                    (EventSearch.event_id == cursor_event_id) &
+                    (EventSearch.event_date_id > cursor_event_date_id)
                 )
+            )
         else:
-            raise HTTPException(
-                status_code=status.HTTP_409_CONFLICT,
-                detail='Foreign key constraint violation.'
+            stmt = stmt.where(
+                EventSearch.event_created_at <= cursor_created_at,
+                or_(
+                    EventSearch.event_created_at < cursor_created_at,
+                    EventSearch.event_id < cursor_event_id,
+                    (EventSearch.event_id == cursor_event_id) &
+                    (EventSearch.event_date_id < cursor_event_date_id)
+                )
             )
 
+    if has_limit:
+        stmt = stmt.limit(bindparam('limit', type_=Integer))
 
-async def add_event(db: AsyncSession, event: EventCreate):
-    new_event = Event(
-        title=event.event_title,
-        description=event.event_description,
-        organizer_id=event.event_organizer_id,
-        venue_id=event.event_venue_id,
-        space_id=event.event_space_id
+    return stmt
+
+
+def get_events_sort_by_params(
+    order: SortOrder,
+    base_url: str,
+    lang: str = 'de',
+    limit: int = None,
+    cursor: tuple = None
+):
+    params = {'base_url': base_url, 'lang': lang}
+
+    if cursor:
+        (
+            params['cursor_created_at'],
+            params['cursor_event_id'],
+            params['cursor_event_date_id']
+        ) = cursor
+
+    if limit:
+        params['limit'] = limit
+
+    shape = (order, bool(cursor), bool(limit))
+
+    return shape, params
+
+
+def get_events_sort_by_stmt(
+    order: SortOrder,
+    base_url: str,
+    lang: str = 'de',
+    limit: int = None,
+    cursor: tuple = None,
+    fields: tuple = None
+):
+    shape, params = get_events_sort_by_params(
+        order, base_url, lang, limit, cursor
     )
 
-    db.add(new_event)
+    return build_events_sort_by_stmt(shape, fields=fields), params
 
-    try:
-        await db.commit()
-        await db.refresh(new_event)
 
-        return new_event
-    except IntegrityError as e:
-        await db.rollback()
+async def get_events_sort_by(
+    db: AsyncSession,
+    order: SortOrder,
+    base_url: str,
+    lang: str = 'de',
+    limit: int = None,
+    cursor: tuple = None
+):
+    stmt, params = get_events_sort_by_stmt(
+        order, base_url, lang, limit, cursor
+    )
 
-        error_message = str(e.orig)
-        match = re.search(r'\(([a-zA-Z\_]+)\)=\((-?\d+)\)', error_message)
+    result = await db.execute(stmt, params)
+    events = result.mappings().all()
 
-        if match:
-            column_name = match.group(1)
-            column_value = match.group(2)
+    return events
 
-            if column_name in ['venue_id', 'space_id', 'organizer_id']:
-                raise HTTPException(
-                    status_code=status.HTTP_409_CONFLICT,
-                    detail=f'The {column_name} ({column_value}) provided is invalid.'
-                )
-        else:
-            raise HTTPException(
-                status_code=status.HTTP_409_CONFLICT,
-                detail='Foreign key constraint violation.'
-            )
+
+EVENT_SORT_CURSOR = ('event_created_at', 'event_id', 'event_date_id')
+
+
+@lru_cache(maxsize=64)
+def build_events_sort_by_document_stmt(shape: tuple, fields: tuple = None):
+    order, _, _ = shape
+
+    stmt = build_events_sort_by_stmt(
+        shape,
+        settings.GEOJSON_PRECISION,
+        get_page_fields(fields, EVENT_SORT_CURSOR)
+    )
+
+    return get_json_page_stmt(
+        stmt, get_events_sort_order(order), EVENT_SORT_CURSOR, fields
+    )
+
+
+async def get_events_sort_by_document(
+    db: AsyncSession,
+    order: SortOrder,
+    base_url: str,
+    lang: str = 'de',
+    limit: int = None,
+    cursor: tuple = None,
+    fields: tuple = None
+):
+    shape, params = get_events_sort_by_params(
+        order, base_url, lang, limit, cursor
+    )
+
+    result = await db.execute(
+        build_events_sort_by_document_stmt(shape, fields), params
+    )
+
+    return result.mappings().first()
+
+
+async def get_events_near(
+    db: AsyncSession,
+    lat: float,
+    lon: float,
+    radius: int,
+    base_url: str,
+    lang: str = 'de',
+    date: str = None,
+    limit: int = None
+):
+    # geography(...) matches the event_search_wkb_geography_idx expression,
+    # the radius check and the KNN order both run on that index and the
+    # distance is only computed for the returned rows
+    point = func.geography(
+        func.ST_SetSRID(func.ST_MakePoint(lon, lat), 4326)
+    )
+    geography = func.geography(EventSearch.wkb_geometry)
+
+    stmt = (
+        select(
+            *get_event_search_columns(),
+            func.ST_Distance(geography, point).label('distance')
+        )
+        .where(
+            EventSearch.iso_639_1 == lang,
+            func.ST_DWithin(geography, point, radius)
+        )
+        .order_by(geography.op('<->')(point))
+    )
+
+    if date:
+        range_start, range_end = parse_date_range(date)
+    else:
+        range_start, range_end = datetime.now(), None
+
+    if range_start:
+        stmt = stmt.where(EventSearch.event_date_end >= range_start)
+
+    if range_end:
+        stmt = stmt.where(EventSearch.event_date_start < range_end)
+
+    if limit:
+        stmt = stmt.limit(limit)
+
+    result = await db.execute(stmt, {'base_url': base_url})
+    events = result.mappings().all()
+
+    return events
+
+
+async def add_event_image(db: AsyncSession, event_id: int, image: ImageCreate):
+    '''
+    Insert an image as the main image of an event inside the current
+    transaction, the caller commits. The image row and its link go in with
+    one statement, returns the new image id.
+    '''
+    new_image = (
+        insert(Image)
+        .values(
+            user_id=image.image_user_id,
+            origin_name=image.image_origin_name,
+            mime_type=image.image_mime_type,
+            license_type_id=image.image_license_type_id,
+            copyright=image.image_copyright,
+            image_type_id=image.image_type_id,
+            alt_text=image.image_alt_text,
+            caption=image.image_caption,
+            source_name=image.image_source_name,
+            width=image.image_width,
+            height=image.image_height,
+            status=image.image_status,
+            created_at=datetime.now()
+        )
+        .returning(Image.id)
+        .cte('new_image')
+    )
+
+    stmt = (
+        insert(EventLinkImages)
+        .from_select(
+            ['event_id', 'image_id', 'main_image'],
+            select(literal(event_id, Integer), new_image.c.id, true())
+        )
+        .returning(EventLinkImages.image_id)
+    )
+
+    result = await db.execute(stmt)
+
+    return result.scalar_one()
+
+
+async def add_event_link_types(
+    db: AsyncSession,
+    event_id: int,
+    type_ids: List[int]
+):
+    '''
+    Link event types with one multi row INSERT inside the current
+    transaction, the caller commits. The link table has no unique key,
+    repeated ids of the request are linked once.
+    '''
+    if not type_ids:
+        return
+
+    stmt = (
+        insert(EventLinkTypes)
+        .values([
+            {'event_id': event_id, 'event_type_id': type_id}
+            for type_id in dict.fromkeys(type_ids)
+        ])
+    )
+
+    await db.execute(stmt)
+
+
+async def add_event(
+    db: AsyncSession,
+    event: EventCreate,
+    recurrence_rule: str = None
+):
+    '''
+    Insert an event inside the current transaction, the caller commits.
+    Returns the new row without a refresh.
+    '''
+    stmt = (
+        insert(Event)
+        .values(
+            title=event.event_title,
+            description=event.event_description,
+            organizer_id=event.event_organizer_id,
+            venue_id=event.event_venue_id,
+            space_id=event.event_space_id,
+            recurrence_rule=recurrence_rule,
+            created_at=datetime.now()
+        )
+        .returning(
+            Event.id,
+            Event.title,
+            Event.description,
+            Event.organizer_id,
+            Event.venue_id,
+            Event.space_id
+        )
+    )
+
+    result = await db.execute(stmt)
+
+    return result.mappings().one()
 
 
 async def get_events_by_user_id(db: AsyncSession, user_id: int):
@@ -466,8 +830,8 @@ async def get_events_by_user_id(db: AsyncSession, user_id: int):
             ), else_=False
             ).label('can_edit')
         )
-        .join(Venue, Venue.id == Event.venue_id)
         .join(EventDate, EventDate.event_id == Event.id)
+        .join(Venue, Venue.id == EventDate.resolved_venue_id)
         .join(Organizer, Organizer.id == Event.organizer_id)
         .join(UserOrganizerLinks, UserOrganizerLinks.organizer_id == Organizer.id)
         .join(UserRole, UserRole.id == UserOrganizerLinks.user_role_id)
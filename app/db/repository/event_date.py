@@ -1,14 +1,14 @@
-import re
-
-from fastapi import HTTPException, status
-from sqlalchemy import func
+from datetime import datetime
+from typing import List, Optional
+from sqlalchemy import any_, bindparam, delete, func, insert, update
+from sqlalchemy import Integer
 from sqlalchemy.future import select
-from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.dialects.postgresql import array_agg
+from sqlalchemy.dialects.postgresql import ARRAY, array_agg
 
 from app.models.event_date import EventDate
 from app.models.event import Event
+from app.models.event_search import EventSearch
 from app.models.event_date_link_images import EventDateLinkImages
 from app.models.event_link_images import EventLinkImages
 from app.models.event_link_types import EventLinkTypes
@@ -20,54 +20,66 @@ from app.models.space import Space
 from app.models.venue import Venue
 from app.models.image import Image
 from app.models.venue_link_types import VenueLinkTypes
-from app.models.venue_type import VenueType
-from app.schemas.event import EventCreate
 
+from app.core.recurrence import expand_recurrence
+
+from app.db.repository.validator import (
+    get_modified_at,
+    get_validator_columns,
+    with_time_zone
+)
 
-async def add_event_date(
+
+async def refresh_event_date_references(
     db: AsyncSession,
-    event: EventCreate,
-    new_event: Event
+    event_ids: List[int] = None
 ):
-    # Remove timezone information
-    date_start = event.event_date_start.replace(tzinfo=None)
-    date_end = event.event_date_end.replace(
-        tzinfo=None) if event.event_date_end else None
-
-    new_event_date = EventDate(
-        date_start=date_start,
-        date_end=date_end,
-        event_id=new_event.id,
-        venue_id=event.event_venue_id,
-        space_id=event.event_space_id,
+    '''
+    Store the effective venue, space and main image on the event dates of
+    the given events inside the current transaction, the caller commits.
+    Without any ids every event date is updated.
+    '''
+    date_image_id = (
+        select(EventDateLinkImages.image_id)
+        .where(
+            EventDateLinkImages.event_date_id == EventDate.id,
+            EventDateLinkImages.main_image.is_(True)
+        )
+        .order_by(EventDateLinkImages.image_id)
+        .limit(1)
+        .scalar_subquery()
     )
 
-    db.add(new_event_date)
-
-    try:
-        await db.commit()
-        await db.refresh(new_event_date)
-        return new_event_date
-    except IntegrityError as e:
-        await db.rollback()
-
-        error_message = str(e.orig)
-        match = re.search(r'\(([a-zA-Z_]+)\)=\((-?\d+)\)', error_message)
-
-        if match:
-            column_name = match.group(1)
-            column_value = match.group(2)
-
-            if column_name in ['venue_id', 'space_id', 'organizer_id']:
-                raise HTTPException(
-                    status_code=status.HTTP_409_CONFLICT,
-                    detail=f'The {column_name} ({column_value}) provided is invalid.',
-                )
-        else:
-            raise HTTPException(
-                status_code=status.HTTP_409_CONFLICT,
-                detail='Foreign key constraint violation.',
-            )
+    event_image_id = (
+        select(EventLinkImages.image_id)
+        .where(
+            EventLinkImages.event_id == Event.id,
+            EventLinkImages.main_image.is_(True)
+        )
+        .order_by(EventLinkImages.image_id)
+        .limit(1)
+        .scalar_subquery()
+    )
+
+    stmt = (
+        update(EventDate)
+        .where(EventDate.event_id == Event.id)
+        .values(
+            resolved_venue_id=func.coalesce(
+                EventDate.venue_id, Event.venue_id),
+            resolved_space_id=func.coalesce(
+                EventDate.space_id, Event.space_id),
+            resolved_image_id=func.coalesce(date_image_id, event_image_id)
+        )
+    )
+
+    if event_ids is not None:
+        if not event_ids:
+            return
+
+        stmt = stmt.where(EventDate.event_id.in_(event_ids))
+
+    await db.execute(stmt)
 
 
 async def get_simple_event_date_by_id(db: AsyncSession, event_date_id: int):
@@ -79,24 +91,247 @@ async def get_simple_event_date_by_id(db: AsyncSession, event_date_id: int):
     return event
 
 
-async def get_event_by_event_date_id(
+async def add_event_dates(
+    db: AsyncSession,
+    event_id: int,
+    venue_id: int,
+    space_id: Optional[int],
+    dates: List[tuple]
+):
+    '''
+    Insert the (start, end) dates of a series with one multi row INSERT
+    inside the current transaction, the caller commits. Returns the new
+    rows ordered by start.
+    '''
+    if not dates:
+        return []
+
+    created_at = datetime.now()
+
+    stmt = (
+        insert(EventDate)
+        .values([{
+            'event_id': event_id,
+            'venue_id': venue_id,
+            'space_id': space_id,
+            'date_start': date_start,
+            'date_end': date_end,
+            'created_at': created_at
+        } for date_start, date_end in dates])
+        .returning(EventDate.id, EventDate.date_start)
+    )
+
+    result = await db.execute(stmt)
+
+    return sorted(result.mappings().all(), key=lambda row: row['date_start'])
+
+
+async def sync_event_dates(
+    db: AsyncSession,
+    event_id: int,
+    event_date_id: int,
+    venue_id: int,
+    space_id: Optional[int],
+    dates: List[tuple],
+    since: datetime
+):
+    '''
+    Diff the stored dates of an event starting at since against the wanted
+    (start, end) dates. Dates with a matching start keep their row and
+    links, only the missing ones are inserted and the rest deleted. The
+    edited event date is never deleted, when the series no longer holds
+    its start it moves to the first wanted date. Returns its (start, end).
+    '''
+    result = await db.execute(
+        select(EventDate.id, EventDate.date_start, EventDate.date_end)
+        .where(EventDate.event_id == event_id, EventDate.date_start >= since)
+    )
+    rows = result.all()
+
+    # dates before since are history and stay as they are
+    dates = sorted((date_start, date_end) for date_start, date_end in dates
+                   if date_start >= since)
+    wanted = dict(dates)
+
+    edited = next((row for row in rows if row.id == event_date_id), None)
+
+    if edited is None or not dates:
+        return None
+
+    anchor_start = edited.date_start
+
+    if anchor_start not in wanted:
+        anchor_start = dates[0][0]
+
+    # a row already holding the new start of the edited date makes way
+    current = {
+        row.date_start: row for row in rows
+        if row.id != event_date_id and row.date_start != anchor_start
+    }
+
+    stale_ids = [
+        row.id for row in rows
+        if row.id != event_date_id
+        and (row.date_start == anchor_start or row.date_start not in wanted)
+    ]
+    changed = [
+        {'id': row.id, 'date_end': wanted[date_start]}
+        for date_start, row in current.items()
+        if date_start in wanted and row.date_end != wanted[date_start]
+    ]
+    missing = [
+        (date_start, date_end) for date_start, date_end in dates
+        if date_start not in current and date_start != anchor_start
+    ]
+
+    anchor = (anchor_start, wanted[anchor_start])
+
+    if (edited.date_start, edited.date_end) != anchor:
+        changed.append({
+            'id': event_date_id,
+            'date_start': anchor_start,
+            'date_end': wanted[anchor_start]
+        })
+
+    if stale_ids:
+        await db.execute(delete(EventDate).where(EventDate.id.in_(stale_ids)))
+
+    if changed:
+        await db.execute(update(EventDate), changed)
+
+    await add_event_dates(db, event_id, venue_id, space_id, missing)
+
+    return anchor
+
+
+async def extend_event_series(
+    db: AsyncSession,
+    until: Optional[datetime] = None
+) -> List[int]:
+    '''
+    Materialise the dates of every open ended series up to the horizon,
+    new dates copy venue, space and duration of the last stored date.
+    Returns the ids of the extended events, the caller refreshes and
+    commits.
+    '''
+    last_dates = (
+        select(
+            EventDate.event_id,
+            EventDate.venue_id,
+            EventDate.space_id,
+            EventDate.date_start,
+            EventDate.date_end
+        )
+        .distinct(EventDate.event_id)
+        .order_by(EventDate.event_id, EventDate.date_start.desc())
+        .subquery()
+    )
+
+    result = await db.execute(
+        select(Event.recurrence_rule, last_dates)
+        .join(last_dates, last_dates.c.event_id == Event.id)
+        .where(Event.recurrence_rule.isnot(None))
+    )
+
+    event_ids = []
+
+    for row in result.mappings().all():
+        duration = None
+
+        if row['date_end']:
+            duration = row['date_end'] - row['date_start']
+
+        dates = [
+            (date_start, date_start + duration if duration else None)
+            for date_start in expand_recurrence(
+                row['recurrence_rule'], after=row['date_start'], until=until
+            )
+        ]
+
+        if dates:
+            await add_event_dates(
+                db, row['event_id'], row['venue_id'], row['space_id'], dates
+            )
+            event_ids.append(row['event_id'])
+
+    return event_ids
+
+
+async def get_event_date_validator(
     db: AsyncSession,
-    base_url: str,
     event_date_id: int,
     lang: str
 ):
+    # event_search rows are rebuilt by every write touching the event date
     stmt = (
+        select(*get_validator_columns(EventSearch.modified_at))
+        .where(
+            EventSearch.event_date_id == event_date_id,
+            EventSearch.iso_639_1 == lang
+        )
+    )
+
+    result = await db.execute(stmt)
+    validator = result.mappings().first()
+
+    return validator
+
+
+async def get_event_dates_validator(
+    db: AsyncSession,
+    event_date_ids: List[int],
+    lang: str
+):
+    stmt = (
+        select(*get_validator_columns(EventSearch.modified_at))
+        .where(
+            EventSearch.event_date_id == any_(bindparam(
+                'event_date_ids', event_date_ids, type_=ARRAY(Integer)
+            )),
+            EventSearch.iso_639_1 == lang
+        )
+    )
+
+    result = await db.execute(stmt)
+    validator = result.mappings().first()
+
+    return validator
+
+
+def get_event_date_stmt(base_url: str):
+    # each link set is aggregated in its own subquery instead of joining
+    # all of them and collapsing the cross product with a group by
+    event_type_ids = (
+        select(array_agg(EventType.id))
+        .join(EventLinkTypes, EventType.id == EventLinkTypes.event_type_id)
+        .where(EventLinkTypes.event_id == Event.id)
+        .scalar_subquery()
+    )
+
+    genre_type_ids = (
+        select(array_agg(GenreType.id))
+        .join(GenreLinkTypes, GenreType.id == GenreLinkTypes.genre_type_id)
+        .where(GenreLinkTypes.event_id == Event.id)
+        .scalar_subquery()
+    )
+
+    venue_type_id = (
+        select(VenueLinkTypes.venue_type_id)
+        .where(VenueLinkTypes.venue_id == Venue.id)
+        .order_by(VenueLinkTypes.venue_type_id)
+        .limit(1)
+        .scalar_subquery()
+    )
+
+    return (
         select(
+            EventDate.id.label('event_date_id'),
             Event.id.label('event_id'),
             Space.id.label('event_space_id'),
             Venue.id.label('event_venue_id'),
-            array_agg(
-                func.coalesce(EventType.id, None)
-            ).filter(EventType.id.isnot(None)).label('event_type_ids'),
-            VenueType.type_id.label('event_venue_type_id'),
-            array_agg(
-                func.coalesce(GenreType.id, None)
-            ).filter(GenreType.id.isnot(None)).label('event_genre_type_ids'),
+            event_type_ids.label('event_type_ids'),
+            venue_type_id.label('event_venue_type_id'),
+            genre_type_ids.label('event_genre_type_ids'),
             Event.title.label('event_title'),
             Event.description.label('event_description'),
             EventDate.date_start.label('event_date_start'),
@@ -108,61 +343,53 @@ async def get_event_by_event_date_id(
         )
         .select_from(Event)
         .join(EventDate, Event.id == EventDate.event_id)
-        .outerjoin(Venue, Venue.id == func.coalesce(
-            EventDate.venue_id, Event.venue_id)
-        )
-        .outerjoin(Space, Space.id == func.coalesce(
-            EventDate.space_id, Event.space_id)
-        )
-        .outerjoin(EventLinkTypes, EventLinkTypes.event_id == Event.id)
-        .outerjoin(EventType, EventType.id == EventLinkTypes.event_type_id)
-        .outerjoin(GenreLinkTypes, GenreLinkTypes.event_id == Event.id)
-        .outerjoin(GenreType, GenreType.id == GenreLinkTypes.genre_type_id)
-        .outerjoin(VenueLinkTypes, VenueLinkTypes.venue_id == Venue.id)
+        .outerjoin(Venue, Venue.id == EventDate.resolved_venue_id)
+        .outerjoin(Space, Space.id == EventDate.resolved_space_id)
         .outerjoin(Organizer, Organizer.id == Event.organizer_id)
-        .outerjoin(
-            EventDateLinkImages,
-            (EventDateLinkImages.event_date_id == EventDate.id)
-            & (EventDateLinkImages.main_image.is_(True)),
-        )
-        .outerjoin(
-            EventLinkImages,
-            (EventLinkImages.event_id == Event.id)
-            & (EventLinkImages.main_image.is_(True)),
-        )
-        .outerjoin(
-            Image,
-            Image.id == func.coalesce(
-                EventDateLinkImages.image_id, EventLinkImages.image_id
-            ),
-        )
-        .where(EventDate.id == event_date_id)
-        .group_by(
-            Event.id,
-            Space.id,
-            Venue.id,
-            VenueType.type_id,
-            GenreType.type_id,
-            Event.title,
-            Event.description,
-            EventDate.date_start,
-            Organizer.id,
-            Image.source_name,
-        )
+        .outerjoin(Image, Image.id == EventDate.resolved_image_id)
     )
 
+
+async def get_event_by_event_date_id(
+    db: AsyncSession,
+    base_url: str,
+    event_date_id: int,
+    lang: str
+):
+    stmt = get_event_date_stmt(base_url).where(EventDate.id == event_date_id)
+
     result = await db.execute(stmt)
     event = result.mappings().first()
 
     return event
 
 
+async def get_events_by_event_date_ids(
+    db: AsyncSession,
+    base_url: str,
+    event_date_ids: List[int],
+    lang: str
+):
+    # one array bind, the statement is the same for any number of ids
+    stmt = get_event_date_stmt(base_url).where(
+        EventDate.id == any_(
+            bindparam('event_date_ids', event_date_ids, type_=ARRAY(Integer))
+        )
+    )
+
+    result = await db.execute(stmt)
+    events = result.mappings().all()
+
+    return events
+
+
 async def get_event_detail_by_event_date_id(
     db: AsyncSession,
     event_date_id: int
 ):
     stmt = (
         select(
+            EventDate.id.label('event_date_id'),
             Event.title.label('event_title'),
             Event.description.label('event_description'),
             EventDate.date_start.label('event_date_start'),
@@ -172,10 +399,15 @@ async def get_event_detail_by_event_date_id(
                 Venue.house_number, ' ',
                 Venue.postal_code, ' ',
                 Venue.city
-            ).label('event_venue_address')
+            ).label('event_venue_address'),
+            with_time_zone(func.greatest(
+                get_modified_at(Event),
+                get_modified_at(EventDate),
+                get_modified_at(Venue)
+            )).label('event_modified_at')
         )
         .join(EventDate, Event.id == EventDate.event_id)
-        .join(Venue, Venue.id == EventDate.venue_id)
+        .join(Venue, Venue.id == EventDate.resolved_venue_id)
         .where(EventDate.id == event_date_id)
     )
 
@@ -0,0 +1,210 @@
+from datetime import datetime
+
+from sqlalchemy import Column, DateTime, Integer, MetaData, Table, Text
+from sqlalchemy import case, exists, insert, literal, null, text
+from sqlalchemy.future import select
+from sqlalchemy.sql import func
+from sqlalchemy.schema import CreateTable
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.dialects.postgresql import ARRAY, array
+
+from app.models.event_date import EventDate
+from app.models.event_link_types import EventLinkTypes
+from app.models.event_type import EventType
+from app.models.genre_link_types import GenreLinkTypes
+from app.models.genre_type import GenreType
+from app.models.organizer import Organizer
+from app.models.space import Space
+from app.models.venue import Venue
+from app.schemas.event import EventImportError
+
+from app.db.repository.event_date import refresh_event_date_references
+from app.db.repository.event_search import refresh_event_search
+
+
+# ids per refresh statement, asyncpg binds at most 32767 parameters
+IMPORT_REFRESH_CHUNK_SIZE = 5000
+
+event_import = Table(
+    'event_import',
+    MetaData(),
+    Column('row_number', Integer, primary_key=True, autoincrement=False),
+    Column('event_id', Integer, nullable=False),
+    Column('organizer_id', Integer, nullable=False),
+    Column('venue_id', Integer, nullable=False),
+    Column('space_id', Integer),
+    Column('title', Text, nullable=False),
+    Column('description', Text, nullable=False),
+    Column('date_start', DateTime, nullable=False),
+    Column('date_end', DateTime),
+    Column('event_type_ids', ARRAY(Integer), nullable=False),
+    Column('genre_type_ids', ARRAY(Integer), nullable=False),
+    prefixes=['TEMPORARY'],
+    postgresql_on_commit='DROP'
+)
+
+# event.id is GENERATED ALWAYS, the pre assigned ids need the override
+EVENT_INSERT = text('''
+    INSERT INTO uranus.event (
+        id, organizer_id, venue_id, space_id, title, description, created_at
+    )
+    OVERRIDING SYSTEM VALUE
+    SELECT event_id, organizer_id, venue_id, space_id, title, description,
+        CAST(:created_at AS timestamp)
+    FROM event_import
+''')
+
+
+def get_import_errors_stmt():
+    '''
+    Per row foreign key check of the staged rows in one statement, rows
+    without errors are left out. Types and genres are linked by the
+    type_id shared by their rows of every locale.
+    '''
+    staged = event_import.c
+
+    checks = [
+        (
+            ~exists().where(Organizer.id == staged.organizer_id),
+            func.concat('unknown event_organizer_id: ', staged.organizer_id)
+        ),
+        (
+            ~exists().where(Venue.id == staged.venue_id),
+            func.concat('unknown event_venue_id: ', staged.venue_id)
+        ),
+        (
+            staged.space_id.isnot(None) & ~exists().where(
+                Space.id == staged.space_id,
+                Space.venue_id == staged.venue_id
+            ),
+            func.concat(
+                'unknown event_space_id: ', staged.space_id,
+                ' for event_venue_id: ', staged.venue_id
+            )
+        ),
+        (
+            ~staged.event_type_ids.contained_by(
+                func.array(select(EventType.type_id).scalar_subquery())
+            ),
+            literal('unknown event_type_id')
+        ),
+        (
+            ~staged.genre_type_ids.contained_by(
+                func.array(select(GenreType.type_id).scalar_subquery())
+            ),
+            literal('unknown event_genre_type_id')
+        )
+    ]
+
+    errors = func.array_remove(
+        array([case((check, message), else_=null()) for check, message in checks]),
+        null()
+    )
+
+    subquery = (
+        select(staged.row_number, errors.label('errors'))
+        .subquery()
+    )
+
+    return (
+        select(subquery.c.row_number, subquery.c.errors)
+        .where(func.cardinality(subquery.c.errors) > 0)
+        .order_by(subquery.c.row_number)
+    )
+
+
+async def copy_import_rows(db: AsyncSession, rows: list):
+    '''
+    Stage the rows with COPY on the connection of the session, the temp
+    table lives in the current transaction and is dropped on commit.
+    '''
+    event_ids = (await db.execute(
+        select(func.nextval(func.pg_get_serial_sequence('uranus.event', 'id')))
+        .select_from(func.generate_series(1, len(rows)))
+    )).scalars().all()
+
+    records = [(
+        row_number,
+        event_id,
+        row.event_organizer_id,
+        row.event_venue_id,
+        row.event_space_id,
+        row.event_title,
+        row.event_description,
+        row.event_date_start,
+        row.event_date_end,
+        sorted(set(row.event_type_id)),
+        sorted(set(row.event_genre_type_id))
+    ) for (row_number, row), event_id in zip(rows, event_ids)]
+
+    connection = await db.connection()
+    raw_connection = await connection.get_raw_connection()
+
+    await raw_connection.driver_connection.copy_records_to_table(
+        event_import.name,
+        records=records,
+        columns=[column.name for column in event_import.columns]
+    )
+
+    return event_ids
+
+
+async def import_events(db: AsyncSession, rows: list):
+    '''
+    Load validated (row number, EventImportRow) pairs in the current
+    transaction, the caller commits. Returns the new event ids in row
+    order, or the per row errors when a reference does not resolve and
+    nothing should be committed.
+    '''
+    if not rows:
+        return [], []
+
+    await db.execute(CreateTable(event_import))
+
+    event_ids = await copy_import_rows(db, rows)
+
+    result = await db.execute(get_import_errors_stmt())
+
+    errors = [
+        EventImportError(row=row['row_number'], errors=row['errors'])
+        for row in result.mappings().all()
+    ]
+
+    if errors:
+        return [], errors
+
+    staged = event_import.c
+    created_at = datetime.now()
+
+    await db.execute(EVENT_INSERT, {'created_at': created_at})
+
+    await db.execute(insert(EventDate).from_select(
+        ['event_id', 'venue_id', 'space_id', 'date_start', 'date_end',
+         'created_at'],
+        select(
+            staged.event_id,
+            staged.venue_id,
+            staged.space_id,
+            staged.date_start,
+            staged.date_end,
+            literal(created_at, DateTime)
+        )
+    ))
+
+    await db.execute(insert(EventLinkTypes).from_select(
+        ['event_id', 'event_type_id'],
+        select(staged.event_id, func.unnest(staged.event_type_ids))
+    ))
+
+    await db.execute(insert(GenreLinkTypes).from_select(
+        ['event_id', 'genre_type_id'],
+        select(staged.event_id, func.unnest(staged.genre_type_ids))
+    ))
+
+    for start in range(0, len(event_ids), IMPORT_REFRESH_CHUNK_SIZE):
+        chunk = event_ids[start:start + IMPORT_REFRESH_CHUNK_SIZE]
+
+        await refresh_event_date_references(db, event_ids=chunk)
+        await refresh_event_search(db, event_ids=chunk)
+
+    return list(event_ids), []
@@ -0,0 +1,194 @@
+from typing import List
+
+from sqlalchemy import case, delete, insert, or_, true
+from sqlalchemy.future import select
+from sqlalchemy.sql import func
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.i18n_locale import I18nLocale
+from app.models.organizer import Organizer
+from app.models.event import Event
+from app.models.event_date import EventDate
+from app.models.event_search import EventSearch
+from app.models.event_link_types import EventLinkTypes
+from app.models.event_type import EventType
+from app.models.space import Space
+from app.models.space_type import SpaceType
+from app.models.venue_link_types import VenueLinkTypes
+from app.models.venue_type import VenueType
+from app.models.venue import Venue
+from app.models.genre_link_types import GenreLinkTypes
+from app.models.genre_type import GenreType
+from app.models.image import Image
+
+
+# descriptions longer than this are shortened for the teaser
+TEASER_LENGTH = 200
+
+
+def get_teaser():
+    '''
+    The teaser text of an event, else its description cut at the last word
+    boundary before TEASER_LENGTH.
+    '''
+    shortened = func.concat(
+        func.regexp_replace(
+            func.left(Event.description, TEASER_LENGTH), r'\s+\S*$', ''
+        ),
+        '…'
+    )
+
+    return func.coalesce(
+        func.nullif(func.btrim(Event.teaser_text), ''),
+        case(
+            (func.length(Event.description) > TEASER_LENGTH, shortened),
+            else_=Event.description
+        )
+    )
+
+
+def get_type_names(type_model, link_column, link_type_column, owner_column):
+    return (
+        select(func.string_agg(func.distinct(type_model.name), ', '))
+        .where(
+            link_column == owner_column,
+            type_model.type_id == link_type_column,
+            type_model.i18n_locale_id == I18nLocale.id
+        )
+        .scalar_subquery()
+    )
+
+
+def get_type_ids(link_column, link_type_column, owner_column):
+    return (
+        select(func.array_agg(func.distinct(link_type_column)))
+        .where(link_column == owner_column)
+        .scalar_subquery()
+    )
+
+
+def get_event_search_source():
+    '''
+    Build the select producing one event_search row per event date and
+    locale. Every link set is aggregated in its own correlated subquery, so
+    the cost grows with the sum of the links instead of their product.
+    '''
+    return (
+        select(
+            EventDate.id.label('event_date_id'),
+            I18nLocale.iso_639_1.label('iso_639_1'),
+            Event.id.label('event_id'),
+            Venue.id.label('venue_id'),
+            Venue.name.label('venue_name'),
+            Venue.postal_code.label('venue_postcode'),
+            Venue.city.label('venue_city'),
+            Space.id.label('space_id'),
+            Space.name.label('space_name'),
+            SpaceType.name.label('space_type'),
+            Organizer.id.label('organizer_id'),
+            Organizer.name.label('organizer_name'),
+            Event.title.label('event_title'),
+            Event.description.label('event_description'),
+            get_teaser().label('event_teaser'),
+            EventDate.date_start.label('event_date_start'),
+            func.coalesce(
+                EventDate.date_end, EventDate.date_start
+            ).label('event_date_end'),
+            Event.created_at.label('event_created_at'),
+            get_type_names(
+                EventType,
+                EventLinkTypes.event_id,
+                EventLinkTypes.event_type_id,
+                Event.id
+            ).label('event_type'),
+            get_type_names(
+                GenreType,
+                GenreLinkTypes.event_id,
+                GenreLinkTypes.genre_type_id,
+                Event.id
+            ).label('genre_type'),
+            get_type_names(
+                VenueType,
+                VenueLinkTypes.venue_id,
+                VenueLinkTypes.venue_type_id,
+                Venue.id
+            ).label('venue_type'),
+            get_type_ids(
+                EventLinkTypes.event_id,
+                EventLinkTypes.event_type_id,
+                Event.id
+            ).label('event_type_ids'),
+            get_type_ids(
+                GenreLinkTypes.event_id,
+                GenreLinkTypes.genre_type_id,
+                Event.id
+            ).label('genre_type_ids'),
+            get_type_ids(
+                VenueLinkTypes.venue_id,
+                VenueLinkTypes.venue_type_id,
+                Venue.id
+            ).label('venue_type_ids'),
+            Image.source_name.label('image_source_name'),
+            Venue.wkb_geometry.label('wkb_geometry'),
+            func.now().label('modified_at')
+        )
+        .select_from(Event)
+        .join(EventDate, Event.id == EventDate.event_id)
+        .join(I18nLocale, true())
+        .outerjoin(Venue, Venue.id == EventDate.resolved_venue_id)
+        .outerjoin(Space, Space.id == EventDate.resolved_space_id)
+        .outerjoin(
+            SpaceType,
+            (SpaceType.type_id == Space.space_type_id) &
+            (SpaceType.i18n_locale_id == I18nLocale.id)
+        )
+        .outerjoin(Organizer, Organizer.id == Event.organizer_id)
+        .outerjoin(Image, Image.id == EventDate.resolved_image_id)
+    )
+
+
+async def refresh_event_search(
+    db: AsyncSession,
+    event_ids: List[int] = None,
+    venue_ids: List[int] = None,
+    space_ids: List[int] = None,
+    organizer_ids: List[int] = None
+):
+    '''
+    Rebuild the event_search rows touched by a write inside the current
+    transaction, the caller commits. Without any ids the whole projection
+    is rebuilt.
+    '''
+    scopes = [
+        (event_ids, EventSearch.event_id, Event.id),
+        (venue_ids, EventSearch.venue_id, Venue.id),
+        (space_ids, EventSearch.space_id, Space.id),
+        (organizer_ids, EventSearch.organizer_id, Organizer.id)
+    ]
+
+    scopes = [scope for scope in scopes if scope[0] is not None]
+
+    delete_stmt = delete(EventSearch)
+    source = get_event_search_source()
+
+    if scopes:
+        if not any(ids for ids, _, _ in scopes):
+            return
+
+        delete_stmt = delete_stmt.where(or_(*[
+            search_column.in_(ids)
+            for ids, search_column, _ in scopes if ids
+        ]))
+
+        source = source.where(or_(*[
+            source_column.in_(ids)
+            for ids, _, source_column in scopes if ids
+        ]))
+
+    insert_stmt = insert(EventSearch).from_select(
+        [column.name for column in source.selected_columns],
+        source
+    )
+
+    await db.execute(delete_stmt)
+    await db.execute(insert_stmt)
@@ -1,5 +1,4 @@
 from sqlmodel import select
-from sqlalchemy import delete
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.event_link_types import EventLinkTypes
@@ -48,19 +47,3 @@ async def get_event_types_by_event_id(
     event_types = result.mappings().all()
 
     return event_types
-
-
-async def delete_event_link_type(
-    db: AsyncSession,
-    event_id: int,
-    event_type_id: int
-):
-    stmt = (
-        delete(EventLinkTypes)
-        .where(
-            EventLinkTypes.event_id == event_id,
-            EventLinkTypes.event_type_id == event_type_id
-        )
-    )
-    await db.execute(stmt)
-    await db.commit()
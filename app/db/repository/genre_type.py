@@ -1,9 +1,9 @@
+from typing import List
+
 from sqlmodel import select
-from sqlalchemy.sql.expression import distinct, delete
+from sqlalchemy.sql.expression import distinct
+from sqlalchemy import insert
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.exc import IntegrityError
-from fastapi import HTTPException, status
-import re
 
 from app.models.i18n_locale import I18nLocale
 from app.models.genre_type import GenreType
@@ -30,44 +30,28 @@ async def get_all_genre_types(db: AsyncSession, lang: str):
     return genres
 
 
-async def add_genre_link_type(
+async def add_genre_link_types(
     db: AsyncSession,
     event_id: int,
-    genre_type_id: int
+    genre_type_ids: List[int]
 ):
-    new_genre_type_link = GenreLinkTypes(
-        event_id=event_id,
-        genre_type_id=genre_type_id
-    )
-
-    db.add(new_genre_type_link)
-
-    try:
-        await db.commit()
-        await db.refresh(new_genre_type_link)
-
-        return new_genre_type_link
-    except IntegrityError as e:
-        await db.rollback()
+    '''
+    Link genre types with one multi row INSERT inside the current
+    transaction, the caller commits. The link table has no unique key,
+    repeated ids of the request are linked once.
+    '''
+    if not genre_type_ids:
+        return
 
-        error_message = str(e.orig)
-
-        match = re.search(r'\(([a-zA-Z\_]+)\)=\((-?\d+)\)', error_message)
-
-        if match:
-            column_name = match.group(1)
-            column_value = match.group(2)
+    stmt = (
+        insert(GenreLinkTypes)
+        .values([
+            {'event_id': event_id, 'genre_type_id': genre_type_id}
+            for genre_type_id in dict.fromkeys(genre_type_ids)
+        ])
+    )
 
-            if column_name in ['genre_type_id', 'event_id']:
-                raise HTTPException(
-                    status_code=status.HTTP_409_CONFLICT,
-                    detail=f'The {column_name} ({column_value}) provided is invalid.'
-                )
-        else:
-            raise HTTPException(
-                status_code=status.HTTP_409_CONFLICT,
-                detail='Foreign key constraint violation.'
-            )
+    await db.execute(stmt)
 
 
 async def get_genre_types_by_event_id(
@@ -87,19 +71,3 @@ async def get_genre_types_by_event_id(
     genre_types = result.mappings().all()
 
     return genre_types
-
-
-async def delete_genre_link_type(
-    db: AsyncSession,
-    event_id: int,
-    genre_type_id: int
-):
-    stmt = (
-        delete(GenreLinkTypes)
-        .where(
-            GenreLinkTypes.event_id == event_id,
-            GenreLinkTypes.genre_type_id == genre_type_id
-        )
-    )
-    await db.execute(stmt)
-    await db.commit()
@@ -1,10 +1,14 @@
+from datetime import datetime
+
 from sqlalchemy.future import select
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import and_
+from sqlalchemy import and_, update
 
 from app.models.event_link_images import EventLinkImages
 from app.models.image import Image
 
+from app.db.repository.validator import get_modified_at
+
 
 async def get_main_image_id_by_event_id(db: AsyncSession, event_id: int):
     print('event_id', event_id)
@@ -20,3 +24,37 @@ async def get_main_image_id_by_event_id(db: AsyncSession, event_id: int):
     print('PIPPPA', image)
 
     return image
+
+
+async def set_image_status(
+    db: AsyncSession,
+    image_id: int,
+    source_name: str,
+    status: str,
+    width: int = None,
+    height: int = None
+):
+    '''
+    Store the outcome of the image pipeline, the caller commits. A row
+    whose file was replaced in the meantime keeps its newer state.
+    '''
+    stmt = (
+        update(Image)
+        .where(Image.id == image_id, Image.source_name == source_name)
+        .values(status=status, width=width, height=height)
+    )
+
+    await db.execute(stmt)
+
+
+async def get_processing_images(db: AsyncSession, before: datetime):
+    stmt = (
+        select(Image.id, Image.source_name)
+        .where(Image.status == 'processing', get_modified_at(Image) < before)
+        .order_by(Image.id)
+    )
+
+    result = await db.execute(stmt)
+    images = result.mappings().all()
+
+    return images
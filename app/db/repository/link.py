@@ -0,0 +1,81 @@
+import re
+
+from typing import List
+
+from fastapi import HTTPException, status
+
+from sqlalchemy import Integer, all_, bindparam, delete, insert, literal
+from sqlalchemy.future import select
+from sqlalchemy.sql import func
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+def get_sync_links_stmt(owner_column, link_column, owner_id: int):
+    '''
+    Replace the links of one owner by the ids bound as link_ids: a data
+    modifying CTE deletes the links missing from the set and the INSERT
+    adds the ids not linked yet. Both read the same snapshot, so links
+    already present are left untouched. The event link tables have no
+    unique constraint, the INSERT must never repeat an existing link.
+    '''
+    link_ids = bindparam('link_ids', type_=ARRAY(Integer))
+    owner = literal(owner_id, Integer)
+
+    removed = (
+        delete(owner_column.table)
+        .where(owner_column == owner, link_column != all_(link_ids))
+        .returning(link_column)
+        .cte('removed')
+    )
+
+    # unnest keeps duplicates of the request, EXCEPT drops them as well
+    missing = (
+        select(func.unnest(link_ids).label('link_id'))
+        .except_(select(link_column).where(owner_column == owner))
+        .subquery('missing')
+    )
+
+    return (
+        insert(owner_column.table)
+        .from_select(
+            [owner_column.name, link_column.name],
+            select(owner, missing.c.link_id)
+        )
+        .add_cte(removed)
+    )
+
+
+async def sync_links(
+    db: AsyncSession,
+    owner_column,
+    link_column,
+    owner_id: int,
+    link_ids: List[int]
+):
+    '''
+    Sync a link table to the given ids with one statement inside the
+    current transaction, the caller commits. An empty list removes every
+    link of the owner, an unknown id rolls the transaction back.
+    '''
+    stmt = get_sync_links_stmt(owner_column, link_column, owner_id)
+
+    try:
+        await db.execute(stmt, {'link_ids': list(link_ids or [])})
+    except IntegrityError as e:
+        await db.rollback()
+
+        error_message = str(e.orig)
+        match = re.search(r'\(([a-zA-Z\_]+)\)=\((-?\d+)\)', error_message)
+
+        if match:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f'The {match.group(1)} ({match.group(2)}) provided is invalid.'
+            )
+
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail='Foreign key constraint violation.'
+        )
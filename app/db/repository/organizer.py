@@ -3,7 +3,8 @@ from fastapi import HTTPException, status
 from sqlmodel import select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy import func, or_
+from sqlalchemy import Integer, any_, bindparam, func, or_
+from sqlalchemy.dialects.postgresql import ARRAY
 from datetime import datetime
 from pydantic import EmailStr
 from typing import List
@@ -19,6 +20,8 @@ from app.models.event_date import EventDate
 
 from app.schemas.organizer import OrganizerCreate, OrganizerSchema
 
+from app.db.repository.validator import get_modified_at, get_validator_columns
+
 
 async def add_user_organizer(db: AsyncSession, user_id: int, organizer_id: int, user_role_id: int):
     new_user_organizer = UserOrganizerLinks(
@@ -62,6 +65,27 @@ async def add_organizer(db: AsyncSession, organizer: OrganizerCreate, current_us
         await db.rollback()
 
 
+async def get_organizer_validator(
+    db: AsyncSession,
+    organizer_id: int = None,
+    organizer_ids: List[int] = None
+):
+    stmt = select(*get_validator_columns(get_modified_at(Organizer)))
+
+    if organizer_id is not None:
+        stmt = stmt.where(Organizer.id == organizer_id)
+
+    if organizer_ids is not None:
+        stmt = stmt.where(Organizer.id == any_(
+            bindparam('organizer_ids', organizer_ids, type_=ARRAY(Integer))
+        ))
+
+    result = await db.execute(stmt)
+    validator = result.mappings().first()
+
+    return validator
+
+
 async def get_organizer_by_id(db: AsyncSession, organizer_id: int):
     stmt = (
         select(Organizer).where(Organizer.id == organizer_id)
@@ -132,28 +156,43 @@ async def delete_organizer_by_id(db: AsyncSession, organizer: Organizer):
         return False
 
 
+def get_organizer_schema(organizer: Organizer) -> OrganizerSchema:
+    return OrganizerSchema(
+        organizer_id=organizer.id,
+        organizer_name=organizer.name,
+        organizer_description=organizer.description,
+        organizer_contact_email=organizer.contact_email,
+        organizer_contact_phone=organizer.contact_phone,
+        organizer_website_url=organizer.website_url,
+        organizer_street=organizer.street,
+        organizer_house_number=organizer.house_number,
+        organizer_postal_code=organizer.postal_code,
+        organizer_city=organizer.city,
+        organizer_holding_organizer_id=organizer.holding_organizer_id,
+        organizer_nonprofit=organizer.nonprofit,
+        organizer_legal_form_id=organizer.legal_form_id,
+        organizer_address_addition=organizer.address_addition
+    )
+
+
 async def get_all_organizers(db: AsyncSession) -> List[OrganizerSchema]:
     stmt = select(Organizer).order_by(Organizer.name)
 
     result = await db.execute(stmt)
     organizers = result.scalars().all()
 
-    return [
-        OrganizerSchema(
-            organizer_id=organizer.id,
-            organizer_name=organizer.name,
-            organizer_description=organizer.description,
-            organizer_contact_email=organizer.contact_email,
-            organizer_contact_phone=organizer.contact_phone,
-            organizer_website_url=organizer.website_url,
-            organizer_street=organizer.street,
-            organizer_house_number=organizer.house_number,
-            organizer_postal_code=organizer.postal_code,
-            organizer_city=organizer.city,
-            organizer_holding_organizer_id=organizer.holding_organizer_id,
-            organizer_nonprofit=organizer.nonprofit,
-            organizer_legal_form_id=organizer.legal_form_id,
-            organizer_address_addition=organizer.address_addition
-        )
-        for organizer in organizers
-    ]
+    return [get_organizer_schema(organizer) for organizer in organizers]
+
+
+async def get_organizers_by_ids(
+    db: AsyncSession,
+    organizer_ids: List[int]
+) -> List[OrganizerSchema]:
+    stmt = select(Organizer).where(Organizer.id == any_(
+        bindparam('organizer_ids', organizer_ids, type_=ARRAY(Integer))
+    ))
+
+    result = await db.execute(stmt)
+    organizers = result.scalars().all()
+
+    return [get_organizer_schema(organizer) for organizer in organizers]
@@ -0,0 +1,62 @@
+from geoalchemy2.functions import ST_X, ST_Y
+from sqlalchemy.future import select
+
+from app.models.event import Event
+from app.models.event_date import EventDate
+from app.models.event_link_types import EventLinkTypes
+from app.models.genre_link_types import GenreLinkTypes
+from app.models.organizer import Organizer
+from app.models.space import Space
+from app.models.venue import Venue
+
+from app.db.repository.event_search import get_type_ids
+
+
+def get_columns(model, exclude=()):
+    return [
+        column for column in model.__table__.columns
+        if column.name not in exclude
+    ]
+
+
+def get_snapshot_stmts():
+    '''
+    One statement per snapshot dataset ordered by primary key, so the files
+    of two snapshots over the same data are identical.
+    '''
+    return {
+        'venues': (
+            select(
+                *get_columns(Venue, exclude=('wkb_geometry',)),
+                ST_X(Venue.wkb_geometry).label('longitude'),
+                ST_Y(Venue.wkb_geometry).label('latitude')
+            )
+            .order_by(Venue.id)
+        ),
+        'spaces': select(*get_columns(Space)).order_by(Space.id),
+        'organizers': select(*get_columns(Organizer)).order_by(Organizer.id),
+        'events': (
+            select(
+                *get_columns(Event),
+                get_type_ids(
+                    EventLinkTypes.event_id,
+                    EventLinkTypes.event_type_id,
+                    Event.id
+                ).label('event_type_ids'),
+                get_type_ids(
+                    GenreLinkTypes.event_id,
+                    GenreLinkTypes.genre_type_id,
+                    Event.id
+                ).label('genre_type_ids')
+            )
+            .order_by(Event.id)
+        ),
+        'event_dates': (
+            select(*get_columns(EventDate, exclude=(
+                'resolved_venue_id',
+                'resolved_space_id',
+                'resolved_image_id'
+            )))
+            .order_by(EventDate.id)
+        )
+    }
@@ -11,6 +11,20 @@ from app.models.space import Space
 
 from app.schemas.space import SpaceCreate
 
+from app.db.repository.validator import get_modified_at, get_validator_columns
+
+
+async def get_space_validator(db: AsyncSession, space_id: int = None):
+    stmt = select(*get_validator_columns(get_modified_at(Space)))
+
+    if space_id is not None:
+        stmt = stmt.where(Space.id == space_id)
+
+    result = await db.execute(stmt)
+    validator = result.mappings().first()
+
+    return validator
+
 
 async def get_all_spaces(db: AsyncSession):
     stmt = (
@@ -116,6 +130,10 @@ async def add_space(db: AsyncSession, space: SpaceCreate):
 
 
 async def update_space(db: AsyncSession, space_id: int, space_data):
+    '''
+    Update a space inside the current transaction, the caller refreshes
+    the event_search rows of the space and commits.
+    '''
     stmt = (
         select(Space)
         .where(Space.id == space_id)
@@ -139,7 +157,7 @@ async def update_space(db: AsyncSession, space_id: int, space_data):
     space.url = space_data.space_url
 
     try:
-        await db.commit()
+        await db.flush()
         await db.refresh(space)
         return space
     except IntegrityError as e:
@@ -0,0 +1,124 @@
+from datetime import datetime
+
+from sqlalchemy.future import select
+from sqlalchemy.sql import func
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.venue import Venue
+from app.models.event_search import EventSearch
+
+
+TILE_EXTENT = 4096
+TILE_BUFFER = 64
+
+# zoom levels from which the larger attribute sets are included
+VENUE_NAME_ZOOM = 10
+VENUE_ADDRESS_ZOOM = 14
+EVENT_DETAIL_ZOOM = 13
+
+
+def get_tile_geometry(column, envelope):
+    return func.ST_AsMVTGeom(
+        func.ST_Transform(column, 3857),
+        envelope,
+        TILE_EXTENT,
+        TILE_BUFFER
+    ).label('geom')
+
+
+def get_tile_bounds(envelope):
+    # tile envelope plus the buffer, in the srid of the stored geometries
+    return func.ST_Transform(
+        func.ST_Expand(
+            envelope,
+            (func.ST_XMax(envelope) - func.ST_XMin(envelope))
+            * TILE_BUFFER / TILE_EXTENT
+        ),
+        4326
+    )
+
+
+async def get_tile(db: AsyncSession, features, layer: str):
+    stmt = select(
+        func.ST_AsMVT(features.table_valued(), layer, TILE_EXTENT, 'geom')
+    )
+
+    result = await db.execute(stmt)
+    tile = result.scalar()
+
+    return bytes(tile) if tile else b''
+
+
+async def get_venue_tile(db: AsyncSession, z: int, x: int, y: int):
+    envelope = func.ST_TileEnvelope(z, x, y)
+
+    columns = [Venue.id.label('venue_id')]
+
+    if z >= VENUE_NAME_ZOOM:
+        columns.append(Venue.name.label('venue_name'))
+
+    if z >= VENUE_ADDRESS_ZOOM:
+        columns += [
+            Venue.street.label('venue_street'),
+            Venue.house_number.label('venue_house_number'),
+            Venue.postal_code.label('venue_postal_code'),
+            Venue.city.label('venue_city')
+        ]
+
+    features = (
+        select(*columns, get_tile_geometry(Venue.wkb_geometry, envelope))
+        .where(Venue.wkb_geometry.op('&&')(get_tile_bounds(envelope)))
+        .subquery('features')
+    )
+
+    return await get_tile(db, features, 'venues')
+
+
+async def get_event_tile(
+    db: AsyncSession,
+    z: int,
+    x: int,
+    y: int,
+    lang: str = 'de'
+):
+    envelope = func.ST_TileEnvelope(z, x, y)
+    bounds = get_tile_bounds(envelope)
+
+    if z >= EVENT_DETAIL_ZOOM:
+        features = (
+            select(
+                EventSearch.event_date_id,
+                EventSearch.event_id,
+                EventSearch.event_title,
+                func.to_char(
+                    EventSearch.event_date_start, 'YYYY-MM-DD"T"HH24:MI'
+                ).label('event_date_start'),
+                EventSearch.venue_id,
+                EventSearch.venue_name,
+                get_tile_geometry(EventSearch.wkb_geometry, envelope)
+            )
+            .where(
+                EventSearch.iso_639_1 == lang,
+                EventSearch.event_date_end >= datetime.now(),
+                EventSearch.wkb_geometry.op('&&')(bounds)
+            )
+            .subquery('features')
+        )
+    else:
+        # one feature per venue with the number of upcoming event dates
+        features = (
+            select(
+                EventSearch.venue_id,
+                func.count().label('event_count'),
+                get_tile_geometry(EventSearch.wkb_geometry, envelope)
+            )
+            .where(
+                EventSearch.iso_639_1 == lang,
+                EventSearch.event_date_end >= datetime.now(),
+                EventSearch.wkb_geometry.op('&&')(bounds)
+            )
+            .group_by(EventSearch.venue_id, EventSearch.wkb_geometry)
+            .subquery('features')
+        )
+
+    return await get_tile(db, features, 'events')
@@ -0,0 +1,24 @@
+from sqlalchemy.sql import func
+
+
+def get_modified_at(model):
+    '''
+    Last change of a row, modified_at is only set by the update trigger so
+    rows never updated fall back to their creation time.
+    '''
+    return func.coalesce(model.modified_at, model.created_at)
+
+
+def with_time_zone(timestamp):
+    # the naive columns hold server local time, make them comparable to
+    # the GMT dates of HTTP headers
+    return func.timezone(func.current_setting('TimeZone'), timestamp)
+
+
+def get_validator_columns(*timestamps):
+    return [
+        func.count().label('count'),
+        with_time_zone(
+            func.greatest(*[func.max(timestamp) for timestamp in timestamps])
+        ).label('modified_at')
+    ]
@@ -1,20 +1,22 @@
 from sqlalchemy.sql import func
+from sqlalchemy import Integer, any_, bindparam
 from datetime import datetime
-from sqlalchemy.types import JSON
+from typing import List
+from sqlalchemy.types import JSON, Text
 from sqlalchemy.orm import aliased
 from sqlalchemy.future import select
 from sqlalchemy.sql.expression import cast, or_, case, exists
+from sqlalchemy.sql.expression import false, null, true
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import IntegrityError
+from sqlalchemy.dialects.postgresql import ARRAY, aggregate_order_by, array_agg
 
 from geoalchemy2.functions import ST_AsGeoJSON, ST_MakeEnvelope
 
-from app.models.i18n_locale import I18nLocale
 from app.models.organizer import Organizer
 from app.models.user_organizer_links import UserOrganizerLinks
 from app.models.venue_link_types import VenueLinkTypes
 from app.models.user_venue_links import UserVenueLinks
-from app.models.venue_type import VenueType
 from app.models.venue import Venue
 from app.models.user import User
 from app.models.user_role import UserRole
@@ -22,6 +24,20 @@ from app.models.event import Event
 from app.models.event_date import EventDate
 from app.models.space import Space
 
+from app.core.config import settings
+from app.db.repository.document import (
+    get_geojson,
+    get_json_array,
+    get_json_array_stmt
+)
+from app.db.repository.event_search import get_type_ids
+from app.db.repository.validator import get_modified_at, get_validator_columns
+
+
+WEB_MERCATOR_WIDTH = 40075016.68557849
+CLUSTER_CELLS_PER_TILE = 4
+CLUSTER_SAMPLE_SIZE = 10
+
 
 async def get_venues_by_name_junk(db: AsyncSession, query: str):
     stmt = (
@@ -46,65 +62,127 @@ async def get_venues_by_name_junk(db: AsyncSession, query: str):
     return venues.mappings().all()
 
 
-async def get_all_venues(db: AsyncSession, lang: str = 'de'):
-    filtered_i18n = (
-        select(I18nLocale.id, I18nLocale.iso_639_1)
-        .where(I18nLocale.iso_639_1 == lang)
-        .cte('FilteredI18n')
-    )
+VENUE_LIST_FIELDS = (
+    'venue_id',
+    'venue_organizer_id',
+    'venue_organizer_name',
+    'venue_organizer_url',
+    'venue_name',
+    'venue_street',
+    'venue_house_number',
+    'venue_postal_code',
+    'venue_country_code',
+    'venue_state_code',
+    'venue_city',
+    'venue_type_ids',
+    'venue_opened_at',
+    'venue_closed_at',
+    'geojson'
+)
+
+
+def get_all_venues_stmt(precision: int = 15, fields: tuple = None):
+    '''
+    The venue list restricted to the given fields. The organizer is only
+    joined when one of its columns is selected and the venue types come
+    from a correlated subquery, so the list needs no grouping.
+    '''
+    fields = fields or VENUE_LIST_FIELDS
+
+    columns = {
+        'venue_id': Venue.id,
+        'venue_organizer_id': Venue.organizer_id,
+        'venue_organizer_name': Organizer.name,
+        'venue_organizer_url': Organizer.website_url,
+        'venue_name': Venue.name,
+        'venue_street': Venue.street,
+        'venue_house_number': Venue.house_number,
+        'venue_postal_code': Venue.postal_code,
+        'venue_country_code': Venue.country_code,
+        'venue_state_code': Venue.state_code,
+        'venue_city': Venue.city,
+        'venue_type_ids': get_type_ids(
+            VenueLinkTypes.venue_id,
+            VenueLinkTypes.venue_type_id,
+            Venue.id
+        ),
+        'venue_opened_at': Venue.opened_at,
+        'venue_closed_at': Venue.closed_at,
+        'geojson': get_geojson(Venue.wkb_geometry, precision)
+    }
+
+    stmt = select(*[
+        columns[name].label(name)
+        for name in VENUE_LIST_FIELDS if name in fields
+    ]).select_from(Venue)
+
+    if 'venue_organizer_name' in fields or 'venue_organizer_url' in fields:
+        stmt = stmt.outerjoin(Organizer, Organizer.id == Venue.organizer_id)
+
+    return stmt.order_by(func.lower(Venue.name).asc())
+
+
+async def get_all_venues(db: AsyncSession):
+    result = await db.execute(get_all_venues_stmt())
+    venues = result.mappings().all()
+
+    return venues
+
 
-    venue_types = (
-        select(VenueType, filtered_i18n.c.iso_639_1)
-        .join(filtered_i18n, filtered_i18n.c.id == VenueType.i18n_locale_id)
-        .cte('VenueTypes')
+async def get_all_venues_document(db: AsyncSession, fields: tuple = None):
+    '''
+    All venues as one JSON array built by Postgres, the API returns the
+    text as it is.
+    '''
+    stmt = get_json_array_stmt(
+        get_all_venues_stmt(settings.GEOJSON_PRECISION, fields).order_by(None),
+        [func.lower(Venue.name)]
     )
 
-    # Aliases
-    gvt = aliased(venue_types)
+    result = await db.execute(stmt)
+
+    return result.scalar_one()
+
+
+async def get_venue_validator(
+    db: AsyncSession,
+    venue_id: int = None,
+    venue_ids: List[int] = None
+):
+    '''
+    Count and last change of the venues and their organizers, type links
+    carry no timestamp so a checksum over them notices changed type sets.
+    '''
+    venue_types = select(
+        func.coalesce(func.sum(func.hashtext(func.concat(
+            VenueLinkTypes.venue_id, ':', VenueLinkTypes.venue_type_id
+        ))), 0)
+    )
 
     stmt = (
-        select(
-            Venue.id.label('venue_id'),
-            Venue.organizer_id.label('venue_organizer_id'),
-            Organizer.name.label('venue_organizer_name'),
-            Organizer.website_url.label('organizer_url'),
-            Venue.name.label('venue_name'),
-            Venue.street.label('venue_street'),
-            Venue.house_number.label('venue_house_number'),
-            Venue.postal_code.label('venue_postal_code'),
-            Venue.country_code.label('venue_country_code'),
-            Venue.state_code.label('venue_state_code'),
-            Venue.city.label('venue_city'),
-            func.string_agg(
-                func.distinct(gvt.c.name), ', ').label('venue_type'),
-            Venue.opened_at,
-            Venue.closed_at,
-            cast(ST_AsGeoJSON(Venue.wkb_geometry, 15), JSON).label('geojson')
-        )
-        .outerjoin(VenueLinkTypes, VenueLinkTypes.venue_id == Venue.id)
-        .outerjoin(gvt, gvt.c.type_id == VenueLinkTypes.venue_type_id)
+        select(*get_validator_columns(
+            get_modified_at(Venue),
+            get_modified_at(Organizer)
+        ))
+        .select_from(Venue)
         .outerjoin(Organizer, Organizer.id == Venue.organizer_id)
-        .group_by(
-            Venue.id,
-            Organizer.name,
-            Organizer.website_url,
-            Venue.name,
-            Venue.street,
-            Venue.house_number,
-            Venue.postal_code,
-            Venue.city,
-            Venue.opened_at,
-            Venue.closed_at,
-            Venue.wkb_geometry
-        ).order_by(
-            func.lower(Venue.name).asc()
-        )
     )
 
+    if venue_id is not None:
+        venue_types = venue_types.where(VenueLinkTypes.venue_id == venue_id)
+        stmt = stmt.where(Venue.id == venue_id)
+
+    if venue_ids is not None:
+        ids = bindparam('venue_ids', venue_ids, type_=ARRAY(Integer))
+        venue_types = venue_types.where(VenueLinkTypes.venue_id == any_(ids))
+        stmt = stmt.where(Venue.id == any_(ids))
+
+    stmt = stmt.add_columns(venue_types.scalar_subquery().label('venue_types'))
+
     result = await db.execute(stmt)
-    venues = result.mappings().all()
+    validator = result.mappings().first()
 
-    return venues
+    return validator
 
 
 async def get_simple_venue_by_id(db: AsyncSession, venue_id: int):
@@ -118,23 +196,8 @@ async def get_simple_venue_by_id(db: AsyncSession, venue_id: int):
     return venue
 
 
-async def get_venue_by_id(db: AsyncSession, venue_id: int, lang: str = 'de'):
-    filtered_i18n = (
-        select(I18nLocale.id, I18nLocale.iso_639_1)
-        .where(I18nLocale.iso_639_1 == lang)
-        .cte('FilteredI18n')
-    )
-
-    venue_types = (
-        select(VenueType, filtered_i18n.c.iso_639_1)
-        .join(filtered_i18n, filtered_i18n.c.id == VenueType.i18n_locale_id)
-        .cte('VenueTypes')
-    )
-
-    # Aliases
-    gvt = aliased(venue_types)
-
-    stmt = (
+def get_venue_stmt():
+    return (
         select(
             Venue.id.label('venue_id'),
             Venue.organizer_id.label('venue_organizer_id'),
@@ -148,16 +211,16 @@ async def get_venue_by_id(db: AsyncSession, venue_id: int, lang: str = 'de'):
             Venue.state_code.label('venue_state_code'),
             Venue.city.label('venue_city'),
             func.array_agg(
-                func.coalesce(gvt.c.type_id, None)
-            ).filter(gvt.c.type_id.isnot(None)).label('venue_type_ids'),
+                VenueLinkTypes.venue_type_id
+            ).filter(
+                VenueLinkTypes.venue_type_id.isnot(None)
+            ).label('venue_type_ids'),
             Venue.opened_at.label('venue_opened_at'),
             Venue.closed_at.label('venue_closed_at'),
             cast(ST_AsGeoJSON(Venue.wkb_geometry, 15), JSON).label('geojson')
         )
         .outerjoin(VenueLinkTypes, VenueLinkTypes.venue_id == Venue.id)
-        .outerjoin(gvt, gvt.c.type_id == VenueLinkTypes.venue_type_id)
         .outerjoin(Organizer, Organizer.id == Venue.organizer_id)
-        .where(Venue.id == venue_id)
         .group_by(
             Venue.id,
             Organizer.name,
@@ -173,12 +236,70 @@ async def get_venue_by_id(db: AsyncSession, venue_id: int, lang: str = 'de'):
         )
     )
 
+
+async def get_venue_by_id(db: AsyncSession, venue_id: int):
+    stmt = get_venue_stmt().where(Venue.id == venue_id)
+
+    result = await db.execute(stmt)
+    venue = result.mappings().first()
+
+    return venue
+
+
+async def get_venues_by_ids(db: AsyncSession, venue_ids: List[int]):
+    stmt = get_venue_stmt().where(
+        Venue.id == any_(
+            bindparam('venue_ids', venue_ids, type_=ARRAY(Integer))
+        )
+    )
+
     result = await db.execute(stmt)
-    venues = result.mappings().first()
+    venues = result.mappings().all()
 
     return venues
 
 
+def get_bounds_feature(
+    feature_id,
+    geometry,
+    label,
+    cluster=false(),
+    count=null(),
+    venue_ids=null()
+):
+    return func.json_build_object(
+        'type', 'Feature',
+        'id', feature_id,
+        'geometry', get_geojson(geometry),
+        'properties', func.json_build_object(
+            'label', label,
+            'cluster', cluster,
+            'count', count,
+            'venue_ids', venue_ids
+        )
+    )
+
+
+async def get_feature_collection(db: AsyncSession, stmt):
+    '''
+    Wrap the feature column of a select into a GeoJSON FeatureCollection
+    built by Postgres. Returns the number of features and the document.
+    '''
+    features = stmt.subquery('features')
+
+    collection = func.json_build_object(
+        'type', 'FeatureCollection',
+        'features', get_json_array(features.c.feature)
+    )
+
+    result = await db.execute(select(
+        func.count().label('count'),
+        cast(collection, Text).label('document')
+    ))
+
+    return result.mappings().first()
+
+
 async def get_venues_within_bounds(
     db: AsyncSession,
     xmin: float,
@@ -188,9 +309,9 @@ async def get_venues_within_bounds(
 ):
     stmt = (
         select(
-            Venue.id,
-            Venue.name,
-            ST_AsGeoJSON(Venue.wkb_geometry).label('geojson')
+            get_bounds_feature(
+                Venue.id, Venue.wkb_geometry, Venue.name
+            ).label('feature')
         )
         .where(
             Venue.wkb_geometry.ST_Within(
@@ -198,9 +319,97 @@ async def get_venues_within_bounds(
         )
     )
 
-    venues = await db.execute(stmt)
+    return await get_feature_collection(db, stmt)
 
-    return venues.mappings().all()
+
+async def get_venue_clusters_within_bounds(
+    db: AsyncSession,
+    xmin: float,
+    ymin: float,
+    xmax: float,
+    ymax: float,
+    zoom: int
+):
+    # grid cells of a fixed screen size in web mercator metres, so the
+    # number of clusters depends on the viewport and not on the density
+    cell_size = WEB_MERCATOR_WIDTH / (2 ** zoom) / CLUSTER_CELLS_PER_TILE
+    cell = func.ST_SnapToGrid(
+        func.ST_Transform(Venue.wkb_geometry, 3857), cell_size
+    )
+
+    count = func.count()
+    centroid = func.ST_Centroid(func.ST_Collect(Venue.wkb_geometry))
+
+    # a cell holding a single venue is rendered as that venue
+    feature = case(
+        (
+            count > 1,
+            get_bounds_feature(
+                null(),
+                centroid,
+                cast(count, Text),
+                cluster=true(),
+                count=count,
+                venue_ids=array_agg(
+                    aggregate_order_by(Venue.id, Venue.id)
+                )[1:CLUSTER_SAMPLE_SIZE]
+            )
+        ),
+        else_=get_bounds_feature(
+            func.min(Venue.id), centroid, func.min(Venue.name)
+        )
+    )
+
+    stmt = (
+        select(feature.label('feature'))
+        .where(
+            Venue.wkb_geometry.ST_Within(
+                ST_MakeEnvelope(xmin, ymin, xmax, ymax, 4326))
+        )
+        .group_by(cell)
+    )
+
+    return await get_feature_collection(db, stmt)
+
+
+async def get_venues_near_venue(
+    db: AsyncSession,
+    venue_id: int,
+    radius: int,
+    limit: int
+):
+    # geography(...) matches the venue_wkb_geography_idx expression, so the
+    # radius check and the KNN order both run on that index
+    point = (
+        select(func.geography(Venue.wkb_geometry))
+        .where(Venue.id == venue_id)
+        .scalar_subquery()
+    )
+    geography = func.geography(Venue.wkb_geometry)
+
+    stmt = (
+        select(
+            Venue.id.label('venue_id'),
+            Venue.name.label('venue_name'),
+            Venue.street.label('venue_street'),
+            Venue.house_number.label('venue_house_number'),
+            Venue.postal_code.label('venue_postal_code'),
+            Venue.city.label('venue_city'),
+            cast(ST_AsGeoJSON(Venue.wkb_geometry, 15), JSON).label('geojson'),
+            func.ST_Distance(geography, point).label('distance')
+        )
+        .where(
+            Venue.id != venue_id,
+            func.ST_DWithin(geography, point, radius)
+        )
+        .order_by(geography.op('<->')(point))
+        .limit(limit)
+    )
+
+    result = await db.execute(stmt)
+    venues = result.mappings().all()
+
+    return venues
 
 
 async def get_venues_by_user_id(db: AsyncSession, user_id: int):
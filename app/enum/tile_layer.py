@@ -0,0 +1,7 @@
+from enum import Enum
+
+
+
+class TileLayer(str, Enum):
+    venues = 'venues'
+    events = 'events'
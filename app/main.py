@@ -1,6 +1,7 @@
 from fastapi import FastAPI
 from fastapi.staticfiles import StaticFiles
 
+from contextlib import asynccontextmanager
 from pathlib import Path
 
 from app.api.v1.endpoints import (
@@ -18,16 +19,32 @@ from app.api.v1.endpoints import (
     image_type,
     i18n_locale,
     state,
-    country
+    country,
+    tile
 )
 
 from app.core.config import settings
+from app.db.session import AsyncSessionLocal
+from app.services.image_pipeline import image_pipeline
+from app.services.lookup import refresh_lookup_registry
 
 
 UPLOAD_DIR = Path(settings.UPLOAD_DIR)
 UPLOAD_DIR.mkdir(exist_ok=True)
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    async with AsyncSessionLocal() as session:
+        await refresh_lookup_registry(session)
+
+    yield
+
+    image_pipeline.shutdown()
+
+
 app = FastAPI(
+    lifespan=lifespan,
     docs_url='/docs',
     redoc_url='/redoc',
     title='Veranstaltungen finden',
@@ -66,6 +83,7 @@ app = FastAPI(
         {'name': 'Locale', 'description': 'Internationalization settings'},
         {'name': 'State', 'description': 'Geographic state information'},
         {'name': 'Country', 'description': 'Country information and settings'},
+        {'name': 'Tiles', 'description': 'Vector tiles of venues and events'},
     ],
     swagger_ui_parameters={
         'deepLinking': True,
@@ -78,6 +96,17 @@ app = FastAPI(
 
 app.mount('/uploads', StaticFiles(directory=UPLOAD_DIR), name='uploads')
 
+# dataset snapshots written by tools/export_snapshot.py
+if settings.SNAPSHOT_DIR:
+    SNAPSHOT_DIR = Path(settings.SNAPSHOT_DIR)
+    SNAPSHOT_DIR.mkdir(exist_ok=True)
+
+    app.mount(
+        '/snapshots',
+        StaticFiles(directory=SNAPSHOT_DIR),
+        name='snapshots'
+    )
+
 
 app.include_router(user.router, prefix='/user', tags=['User'])
 app.include_router(user_role.router, prefix='/user/role', tags=['User roles'])
@@ -96,3 +125,4 @@ app.include_router(image_type.router, prefix='/image/type', tags=['Image'])
 app.include_router(i18n_locale.router, prefix='/locale/type', tags=['Locale'])
 app.include_router(state.router, prefix='/state', tags=['State'])
 app.include_router(country.router, prefix='/country', tags=['Country'])
+app.include_router(tile.router, prefix='/tiles', tags=['Tiles'])
@@ -19,5 +19,7 @@ class Event(EventBase, table=True):
     __table_args__ = {'schema': 'uranus'}
 
     id: Optional[int] = Field(default=None, primary_key=True)
+    recurrence_rule: Optional[str] = None
+    teaser_text: Optional[str] = None
     created_at: datetime = Field(default_factory=datetime.now)
     modified_at: Optional[datetime] = None
\ No newline at end of file
@@ -19,5 +19,11 @@ class EventDate(EventDateBase, table=True):
     __table_args__ = {'schema': 'uranus'}
 
     id: Optional[int] = Field(default=None, primary_key=True)
+    resolved_venue_id: Optional[int] = Field(
+        foreign_key='uranus.venue.id', default=None)
+    resolved_space_id: Optional[int] = Field(
+        foreign_key='uranus.space.id', default=None)
+    resolved_image_id: Optional[int] = Field(
+        foreign_key='uranus.image.id', default=None)
     created_at: datetime = Field(default_factory=datetime.now)
     modified_at: Optional[datetime] = None
\ No newline at end of file
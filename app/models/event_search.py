@@ -0,0 +1,48 @@
+from geoalchemy2 import Geometry
+from sqlalchemy import Column, Integer
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlmodel import SQLModel, Field
+from typing import Optional, List
+from datetime import datetime
+
+
+
+class EventSearch(SQLModel, table=True):
+    __tablename__ = 'event_search'
+    __table_args__ = {'schema': 'uranus'}
+
+    event_date_id: int = Field(
+        foreign_key='uranus.event_date.id', primary_key=True)
+    iso_639_1: str = Field(max_length=2, primary_key=True)
+    event_id: int = Field(foreign_key='uranus.event.id')
+    venue_id: Optional[int] = None
+    venue_name: Optional[str] = None
+    venue_postcode: Optional[str] = None
+    venue_city: Optional[str] = None
+    space_id: Optional[int] = None
+    space_name: Optional[str] = None
+    space_type: Optional[str] = None
+    organizer_id: Optional[int] = None
+    organizer_name: Optional[str] = None
+    event_title: str
+    event_description: str
+    event_teaser: Optional[str] = None
+    event_date_start: datetime
+    event_date_end: Optional[datetime] = None
+    event_created_at: datetime
+    event_type: Optional[str] = None
+    genre_type: Optional[str] = None
+    venue_type: Optional[str] = None
+    event_type_ids: Optional[List[int]] = Field(
+        sa_column=Column(ARRAY(Integer)), default=None)
+    genre_type_ids: Optional[List[int]] = Field(
+        sa_column=Column(ARRAY(Integer)), default=None)
+    venue_type_ids: Optional[List[int]] = Field(
+        sa_column=Column(ARRAY(Integer)), default=None)
+    image_source_name: Optional[str] = Field(default=None, max_length=64)
+    wkb_geometry: Optional[Geometry] = Field(
+        sa_column=Column(Geometry('POINT', srid=4326)), default=None)
+    modified_at: datetime = Field(default_factory=datetime.now)
+
+    class Config:
+        arbitrary_types_allowed = True
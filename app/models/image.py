@@ -24,5 +24,6 @@ class Image(ImageBase, table=True):
     __table_args__ = {'schema': 'uranus'}
 
     id: Optional[int] = Field(default=None, primary_key=True)
+    status: str = Field(default='ready', max_length=16)
     created_at: datetime = Field(default_factory=datetime.now)
     modified_at: Optional[datetime] = None
@@ -1,8 +1,9 @@
-from pydantic import BaseModel, field_validator
+from pydantic import BaseModel, Field, field_validator, model_validator
 from datetime import datetime
-from typing import List, Optional
+from typing import Annotated, List, Optional
 
 from app.schemas.venue_response import VenueGeoJSONPoint
+from app.services.batch import MAX_BATCH_ID
 
 
 class EventUpdate(BaseModel):
@@ -39,6 +40,55 @@ class EventCreate(BaseModel):
         return v or None
 
 
+# the id columns are int32, COPY fails on anything outside
+ImportId = Annotated[int, Field(gt=0, le=MAX_BATCH_ID)]
+
+
+class EventImportRow(BaseModel):
+    event_title: str = Field(min_length=1, max_length=255)
+    event_description: str
+    event_organizer_id: ImportId
+    event_venue_id: ImportId
+    event_space_id: Optional[ImportId] = None
+    event_date_start: datetime
+    event_date_end: Optional[datetime] = None
+    event_type_id: List[ImportId] = Field(min_length=1)
+    event_genre_type_id: List[ImportId] = []
+
+    @field_validator('event_space_id', 'event_date_end', mode='before')
+    def set_empty_none(cls, v):
+        return v or None
+
+    @field_validator('event_type_id', 'event_genre_type_id', mode='before')
+    def split_type_ids(cls, v):
+        # csv cells hold several ids separated by semicolons
+        if isinstance(v, str):
+            return [value for value in v.split(';') if value.strip()]
+
+        return v or []
+
+    @field_validator('event_date_start', 'event_date_end')
+    def set_naive_date(cls, v):
+        return v.replace(tzinfo=None) if v else v
+
+    @model_validator(mode='after')
+    def check_date_end(self):
+        if self.event_date_end and self.event_date_end < self.event_date_start:
+            raise ValueError('event_date_end is before event_date_start')
+
+        return self
+
+
+class EventImportError(BaseModel):
+    row: int
+    errors: List[str]
+
+
+class EventImportResponse(BaseModel):
+    imported: int
+    event_ids: List[int]
+
+
 class EventResponse(BaseModel):
     event_id: int
     event_date_id: int
@@ -50,6 +100,9 @@ class EventResponse(BaseModel):
     event_space_id: Optional[int] = None
     event_date_start: datetime
     event_date_end: Optional[datetime] = None
+    event_date_ids: List[int] = []
+    event_image_id: Optional[int] = None
+    event_image_status: Optional[str] = None
     geojson: Optional[VenueGeoJSONPoint] = None
 
 
@@ -62,6 +115,7 @@ class EventQueryResponse(BaseModel):
     venue_city: str
     event_title: str
     event_description: str
+    event_teaser: Optional[str] = None
     event_date_start: datetime
     event_created_at: datetime
     image_url: Optional[str] = None
@@ -72,3 +126,26 @@ class EventQueryResponse(BaseModel):
     space_name: Optional[str] = None
     space_type: Optional[str] = None
     geojson: Optional[VenueGeoJSONPoint] = None
+
+
+class EventNearResponse(EventQueryResponse):
+    distance: float
+
+
+class EventQueryPage(BaseModel):
+    events: List[EventQueryResponse]
+    next_cursor: Optional[str] = None
+
+
+class EventFacetCount(BaseModel):
+    id: Optional[int] = None
+    value: Optional[str] = None
+    count: int
+
+
+class EventFacetsResponse(BaseModel):
+    event_types: List[EventFacetCount] = []
+    genre_types: List[EventFacetCount] = []
+    venue_types: List[EventFacetCount] = []
+    cities: List[EventFacetCount] = []
+    days: List[EventFacetCount] = []
@@ -8,10 +8,15 @@ class EventDateResponse(BaseModel):
     event_space_id: int
     event_venue_id: int
     event_type_ids: Optional[List[int]]
-    event_venue_type_id: int
+    event_venue_type_id: Optional[int] = None
     event_genre_type_ids: Optional[List[int]]
     event_title: str
     event_description: str
     event_date_start: datetime
     event_organizer_id: int
     event_image_url: Optional[str]
+
+
+class EventDateBatchResponse(BaseModel):
+    items: List[Optional[EventDateResponse]]
+    missing: List[int]
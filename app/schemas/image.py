@@ -12,5 +12,6 @@ class ImageCreate(BaseModel):
     image_caption: Optional[int] = None
     image_copyright: Optional[str] = None
     image_mime_type: str
-    image_width: int
-    image_height: int
+    image_width: Optional[int] = None
+    image_height: Optional[int] = None
+    image_status: str = 'ready'
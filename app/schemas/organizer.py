@@ -1,5 +1,5 @@
 from pydantic import BaseModel, EmailStr, field_validator
-from typing import Optional
+from typing import List, Optional
 
 
 class UserOrganizerResponse(BaseModel):
@@ -35,6 +35,11 @@ class OrganizerSchema(OrganizerCreate):
     organizer_id: int
 
 
+class OrganizerBatchResponse(BaseModel):
+    items: List[Optional[OrganizerSchema]]
+    missing: List[int]
+
+
 class OrganizerRead(BaseModel):
     organizer_id: int
     organizer_name: str
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import List, Literal
+from typing import List, Literal, Optional
 
 
 
@@ -10,13 +10,16 @@ class VenuePointGeometry(BaseModel):
 
 
 class VenueFeatureProperties(BaseModel):
-    label: str 
+    label: str
+    cluster: bool = False
+    count: Optional[int] = None
+    venue_ids: Optional[List[int]] = None
 
 
 
 class VenueFeature(BaseModel):
     type: Literal['Feature']
-    id: int 
+    id: Optional[int] = None
     geometry: VenuePointGeometry
     properties: VenueFeatureProperties
 
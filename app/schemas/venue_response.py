@@ -32,6 +32,22 @@ class VenueResponse(BaseModel):
         return validate_positive_int32(value)
 
 
+class VenueBatchResponse(BaseModel):
+    items: List[Optional[VenueResponse]]
+    missing: List[int]
+
+
+class VenueNearbyResponse(BaseModel):
+    venue_id: int
+    venue_name: str
+    venue_street: Optional[str] = None
+    venue_house_number: Optional[str] = None
+    venue_postal_code: Optional[str] = None
+    venue_city: Optional[str] = None
+    geojson: Optional[VenueGeoJSONPoint] = None
+    distance: float
+
+
 class UserVenueResponse(BaseModel):
     venue_id: int
     venue_name: str
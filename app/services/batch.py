@@ -0,0 +1,52 @@
+from typing import List
+
+from fastapi import HTTPException, status
+
+
+MAX_BATCH_IDS = 100
+MAX_BATCH_ID = 2147483647
+
+
+def parse_batch_ids(ids: List[str]) -> List[int]:
+    '''
+    Accept ids=1&ids=2 as well as ids=1,2 and keep the request order,
+    duplicates included.
+    '''
+    try:
+        batch_ids = [
+            int(value) for item in ids
+            for value in item.split(',') if value.strip()
+        ]
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail='ids must be integers'
+        )
+
+    # the id columns are int32, asyncpg fails on anything outside
+    if any(not 0 < id <= MAX_BATCH_ID for id in batch_ids):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f'ids must be between 1 and {MAX_BATCH_ID}'
+        )
+
+    if not batch_ids or len(batch_ids) > MAX_BATCH_IDS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f'Pass between 1 and {MAX_BATCH_IDS} ids'
+        )
+
+    return batch_ids
+
+
+def get_batch_response(ids: List[int], rows: dict) -> dict:
+    '''
+    Items in request order with null in place of every id that did not
+    resolve, missing lists those ids once each.
+    '''
+    missing = list(dict.fromkeys(id for id in ids if id not in rows))
+
+    return {
+        'items': [rows.get(id) for id in ids],
+        'missing': missing
+    }
@@ -0,0 +1,142 @@
+from datetime import date, datetime, timedelta, timezone
+from typing import Optional
+
+from fastapi import Request, Response, status
+from fastapi.responses import StreamingResponse
+from icalendar import Calendar, Event as ICalEvent
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.session import AsyncSessionLocal
+from app.db.repository.event import get_event_feed_stmt, get_events_validator
+from app.services.conditional import (
+    get_etag,
+    get_validator_headers,
+    is_not_modified
+)
+from app.services.response_cache import ResponseCache, get_cache_key
+from app.services.streaming import STREAM_BATCH_SIZE
+
+
+CALENDAR_PRODID = '-//Open Uranus//Events//DE'
+CALENDAR_END = b'END:VCALENDAR\r\n'
+CALENDAR_CACHE_SIZE = 4096
+CALENDAR_CACHE_MAX_BYTES = 16 * 1024 * 1024
+
+# feeds without a date filter start this many days in the past
+FEED_PAST_DAYS = 30
+
+# keys carry the modified_at of the event, entries never go stale
+CALENDAR_TTL = 86400
+
+
+def get_event_uid(event_date_id: int) -> str:
+    return f'event-date-{event_date_id}@open-uranus'
+
+
+def get_calendar(name: Optional[str] = None) -> Calendar:
+    calendar = Calendar()
+    calendar.add('prodid', CALENDAR_PRODID)
+    calendar.add('version', '2.0')
+
+    if name:
+        calendar.add('x-wr-calname', name)
+
+    return calendar
+
+
+def get_calendar_event(event) -> ICalEvent:
+    ical_event = ICalEvent()
+    ical_event.add('uid', get_event_uid(event['event_date_id']))
+    ical_event.add('dtstamp', datetime.now(timezone.utc))
+    ical_event.add('summary', event['event_title'])
+    ical_event.add('description', event['event_description'])
+    ical_event.add('dtstart', event['event_date_start'])
+
+    if event['event_date_end'] and (
+        event['event_date_end'] != event['event_date_start']
+    ):
+        ical_event.add('dtend', event['event_date_end'])
+
+    # every edit moves modified_at forward, clients replace their copy
+    # when the sequence grows
+    if event.get('event_modified_at'):
+        ical_event.add(
+            'sequence', int(event['event_modified_at'].timestamp())
+        )
+
+    if event['event_venue_address']:
+        ical_event.add('location', event['event_venue_address'])
+
+    return ical_event
+
+
+def render_calendar(events) -> bytes:
+    calendar = get_calendar()
+
+    for event in events:
+        calendar.add_component(get_calendar_event(event))
+
+    return calendar.to_ical()
+
+
+async def stream_calendar(stmt, params: dict, name: str):
+    '''
+    Write the calendar envelope around VEVENTs read from a server side
+    cursor in its own session, feeds of any size keep memory flat.
+    '''
+    stmt = stmt.execution_options(yield_per=STREAM_BATCH_SIZE)
+
+    yield get_calendar(name).to_ical()[:-len(CALENDAR_END)]
+
+    async with AsyncSessionLocal() as session:
+        result = await session.stream(stmt, params)
+
+        async for rows in result.mappings().partitions():
+            yield b''.join(get_calendar_event(row).to_ical() for row in rows)
+
+    yield CALENDAR_END
+
+
+async def event_feed_response(
+    request: Request,
+    db: AsyncSession,
+    filters: dict,
+    name: str,
+    lang: str = 'de'
+):
+    '''
+    Subscribable feed of the event dates matching the filters. Calendar
+    clients poll with If-None-Match, an unchanged feed costs one count
+    over the event_search indexes and never reaches the VEVENT query.
+    '''
+    if not filters.keys() & {'date', 'date_start', 'date_end'}:
+        since = date.today() - timedelta(days=FEED_PAST_DAYS)
+        filters = {**filters, 'date_end': f'>={since.isoformat()}'}
+
+    validator = await get_events_validator(db, filters, lang)
+    modified_at = validator['modified_at']
+
+    etag = get_etag(get_cache_key(request, lang), validator)
+    headers = get_validator_headers(etag, modified_at)
+
+    if is_not_modified(request, etag, modified_at):
+        return Response(
+            status_code=status.HTTP_304_NOT_MODIFIED,
+            headers=headers
+        )
+
+    stmt, params = get_event_feed_stmt(filters, lang)
+
+    return StreamingResponse(
+        stream_calendar(stmt, params, name),
+        media_type='text/calendar',
+        headers=headers
+    )
+
+
+calendar_cache = ResponseCache(
+    CALENDAR_CACHE_SIZE,
+    CALENDAR_CACHE_MAX_BYTES,
+    CALENDAR_TTL,
+    0
+)
@@ -0,0 +1,140 @@
+import hashlib
+
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Awaitable, Callable, Optional
+
+from fastapi import Request, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.session import AsyncSessionLocal
+from app.services.response_cache import (
+    RenderedResponse,
+    get_cache_key,
+    response_cache
+)
+
+
+# lists change with every new event, single records rarely
+LIST_CACHE_CONTROL = 'public, max-age=60, stale-while-revalidate=300'
+DETAIL_CACHE_CONTROL = 'public, max-age=300, stale-while-revalidate=3600'
+
+
+def get_etag(cache_key: tuple, validator) -> str:
+    '''
+    Strong validator over the normalized request and the count and last
+    change of the rows it reads, deletions change the count.
+    '''
+    fingerprint = repr((cache_key, tuple(validator.values())))
+    digest = hashlib.sha1(fingerprint.encode()).hexdigest()
+
+    return f'"{digest}"'
+
+
+def is_etag_match(request: Request, etag: str) -> bool:
+    if_none_match = request.headers.get('if-none-match')
+
+    if if_none_match.strip() == '*':
+        return True
+
+    # the weak comparison function applies to GET, W/ prefixes are ignored
+    tags = [tag.strip().removeprefix('W/') for tag in if_none_match.split(',')]
+
+    return etag in tags
+
+
+def is_unmodified_since(request: Request, modified_at: datetime) -> bool:
+    try:
+        since = parsedate_to_datetime(request.headers.get('if-modified-since'))
+    except (TypeError, ValueError):
+        return False
+
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+
+    return modified_at.replace(microsecond=0) <= since
+
+
+def get_validator_headers(
+    etag: str,
+    modified_at: Optional[datetime],
+    detail: bool = False
+) -> dict:
+    cache_control = DETAIL_CACHE_CONTROL if detail else LIST_CACHE_CONTROL
+    headers = {'ETag': etag, 'Cache-Control': cache_control}
+
+    if modified_at:
+        headers['Last-Modified'] = format_datetime(
+            modified_at.astimezone(timezone.utc), usegmt=True
+        )
+
+    return headers
+
+
+def is_not_modified(
+    request: Request,
+    etag: str,
+    modified_at: Optional[datetime],
+    detail: bool = False
+) -> bool:
+    '''
+    If-Modified-Since is only honoured for single records, the last change
+    of a list does not move when a row of it is deleted.
+    '''
+    if 'if-none-match' in request.headers:
+        return is_etag_match(request, etag)
+
+    if detail and modified_at and 'if-modified-since' in request.headers:
+        return is_unmodified_since(request, modified_at)
+
+    return False
+
+
+async def conditional_response(
+    request: Request,
+    validate: Callable[[AsyncSession], Awaitable[dict]],
+    render: Callable[[], Awaitable[bytes]],
+    tags: tuple,
+    detail: bool = False,
+    lang: Optional[str] = None
+):
+    '''
+    Answer a GET from the response cache, keyed by the normalized request
+    and locale only. Every body is cached with the ETag and last change of
+    the validator row read right before it was rendered, so a hit costs no
+    query. Writes drop the entries of their tags, an expired entry is
+    served stale while one background render refreshes it. 304 when the
+    client copy matches the cached ETag.
+    '''
+    cache_key = get_cache_key(request, lang)
+
+    async def render_response():
+        async with AsyncSessionLocal() as session:
+            validator = await validate(session)
+
+        # nothing matched, the render answers with its 404
+        body = await render()
+
+        return RenderedResponse(
+            body, get_etag(cache_key, validator), validator['modified_at']
+        )
+
+    rendered = await response_cache.get_or_render(
+        cache_key, render_response, tags
+    )
+
+    headers = get_validator_headers(
+        rendered.etag, rendered.modified_at, detail
+    )
+
+    if is_not_modified(request, rendered.etag, rendered.modified_at, detail):
+        return Response(
+            status_code=status.HTTP_304_NOT_MODIFIED,
+            headers=headers
+        )
+
+    return Response(
+        content=rendered.body,
+        media_type='application/json',
+        headers=headers
+    )
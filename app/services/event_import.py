@@ -0,0 +1,101 @@
+import io
+import csv
+import json
+
+from typing import Optional
+
+from fastapi import HTTPException, Request, status
+from pydantic import ValidationError
+
+from app.schemas.event import EventImportError, EventImportRow
+
+
+IMPORT_MEDIA_TYPES = {
+    'application/x-ndjson': 'ndjson',
+    'application/jsonl': 'ndjson',
+    'text/csv': 'csv'
+}
+
+# rows are validated up front, the import never writes half a file
+MAX_IMPORT_ROWS = 100000
+
+
+def get_import_format(request: Request, format: Optional[str]):
+    '''
+    Resolve the format of an import body from the format query parameter
+    or the Content-Type header.
+    '''
+    if not format:
+        content_type = request.headers.get('content-type', '')
+        format = IMPORT_MEDIA_TYPES.get(content_type.split(';')[0].strip())
+
+    if format not in ('ndjson', 'csv'):
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail='Send application/x-ndjson or text/csv'
+        )
+
+    return format
+
+
+def read_import_records(text: str, format: str):
+    if format == 'csv':
+        reader = csv.DictReader(io.StringIO(text))
+
+        # quoted cells may span lines, count the last line of each row
+        for record in reader:
+            yield reader.line_num, record
+
+        return
+
+    for row_number, line in enumerate(text.splitlines(), start=1):
+        if not line.strip():
+            continue
+
+        try:
+            yield row_number, json.loads(line)
+        except json.JSONDecodeError as e:
+            yield row_number, e
+
+
+def get_error_messages(error: Exception):
+    if isinstance(error, ValidationError):
+        return [
+            f"{'.'.join(str(part) for part in e['loc']) or 'row'}: {e['msg']}"
+            for e in error.errors()
+        ]
+
+    return [str(error)]
+
+
+def parse_import_rows(text: str, format: str):
+    '''
+    Validate every row of an NDJSON or CSV import. Returns the rows as
+    (row number, EventImportRow) pairs and the errors of all invalid rows,
+    row numbers are the line numbers of the file.
+    '''
+    rows = []
+    errors = []
+
+    for row_number, record in read_import_records(text, format):
+        if len(rows) + len(errors) >= MAX_IMPORT_ROWS:
+            errors.append(EventImportError(
+                row=row_number,
+                errors=[f'More than {MAX_IMPORT_ROWS} rows']
+            ))
+            break
+
+        if isinstance(record, Exception):
+            errors.append(EventImportError(
+                row=row_number, errors=get_error_messages(record)
+            ))
+            continue
+
+        try:
+            rows.append((row_number, EventImportRow.model_validate(record)))
+        except ValidationError as e:
+            errors.append(EventImportError(
+                row=row_number, errors=get_error_messages(e)
+            ))
+
+    return rows, errors
@@ -0,0 +1,33 @@
+from typing import Iterable, List, Optional
+
+from fastapi import HTTPException, status
+
+
+def parse_fields(
+    fields: Optional[List[str]],
+    available: Iterable[str]
+) -> Optional[tuple]:
+    '''
+    Resolve fields=a,b or fields=a&fields=b to the requested output columns
+    in their canonical order, None selects every column.
+    '''
+    if not fields:
+        return None
+
+    requested = {
+        value.strip() for item in fields
+        for value in item.split(',') if value.strip()
+    }
+
+    if not requested:
+        return None
+
+    unknown = requested.difference(available)
+
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f'Unknown fields: {", ".join(sorted(unknown))}'
+        )
+
+    return tuple(name for name in available if name in requested)
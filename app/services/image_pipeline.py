@@ -0,0 +1,76 @@
+import asyncio
+import logging as log
+import multiprocessing
+
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from app.core.config import settings
+from app.core.image import process_image_file
+from app.db.session import AsyncSessionLocal
+from app.db.repository.image import set_image_status
+from app.services.response_cache import response_cache
+
+
+class ImagePipeline:
+    '''
+    Resize uploaded images in a bounded pool of worker processes. The
+    upload request only stores the file and returns, decoding never holds
+    the GIL of the API process. Image rows move from processing to ready,
+    or to failed when the file cannot be decoded. Rows left behind by a
+    restart are finished by tools/process_images.py.
+    '''
+
+    def __init__(self, max_workers: int):
+        self.max_workers = max_workers
+        self._executor = None
+        self._tasks = set()
+
+    def get_executor(self):
+        # spawned workers only import PIL, not the state of the API process
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context('spawn')
+            )
+
+        return self._executor
+
+    def submit(self, image_id: int, source_name: str):
+        task = asyncio.create_task(self.process(image_id, source_name))
+
+        # the loop only keeps weak references to running tasks
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def process(self, image_id: int, source_name: str):
+        path = Path(settings.UPLOAD_DIR) / source_name
+        loop = asyncio.get_running_loop()
+
+        status, width, height = 'failed', None, None
+
+        try:
+            width, height = await loop.run_in_executor(
+                self.get_executor(), process_image_file, str(path)
+            )
+            status = 'ready'
+        except Exception:
+            log.exception(f'processing image {image_id} failed')
+
+        async with AsyncSessionLocal() as session:
+            await set_image_status(
+                session, image_id, source_name, status, width, height
+            )
+            await session.commit()
+
+        response_cache.invalidate('event')
+
+        return status
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+image_pipeline = ImagePipeline(settings.IMAGE_WORKERS)
@@ -0,0 +1,156 @@
+import asyncio
+
+from types import MappingProxyType
+from typing import Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.repository.event_type import get_all_event_types
+from app.db.repository.genre_type import get_all_genre_types
+from app.db.repository.venue_type import get_all_venue_types
+from app.db.repository.space_type import get_all_space_types
+from app.db.repository.license_type import get_all_license_types
+from app.db.repository.image_type import get_all_image_types
+from app.db.repository.i18n_locale import get_all_i18n_locales
+from app.db.repository.country import get_all_countrys
+from app.db.repository.state import get_all_states
+
+
+DEFAULT_LOCALE = 'de'
+
+# table name -> (loader, id key, name key, locale id key)
+TYPE_TABLES = {
+    'event_type': (
+        get_all_event_types,
+        'event_type_id', 'event_type_name', 'event_locale_id'
+    ),
+    'genre_type': (
+        get_all_genre_types,
+        'genre_type_id', 'genre_type_name', 'genre_locale_id'
+    ),
+    'venue_type': (
+        get_all_venue_types,
+        'venue_type_id', 'venue_type_name', 'venue_locale_id'
+    ),
+    'space_type': (
+        get_all_space_types,
+        'space_type_id', 'space_type_name', 'space_locale_id'
+    ),
+    'license_type': (
+        get_all_license_types,
+        'license_type_id', 'license_type_name', 'license_locale_id'
+    ),
+    'image_type': (
+        get_all_image_types,
+        'image_type_id', 'image_type_name', 'image_locale_id'
+    )
+}
+
+
+class LookupRegistry:
+    '''
+    Immutable snapshot of the small i18n lookup tables. A refresh builds a
+    new snapshot and swaps it in, readers never see a partial state.
+    '''
+
+    def __init__(self, locales, types, countries, states):
+        self.locales = tuple(MappingProxyType(row) for row in locales)
+        self.countries = tuple(MappingProxyType(row) for row in countries)
+        self.states = tuple(MappingProxyType(row) for row in states)
+
+        locale_codes = {
+            row['locale_id']: row['locale_code'] for row in self.locales
+        }
+
+        rows_by_table = {}
+        names_by_table = {}
+
+        for table, rows in types.items():
+            _, id_key, name_key, locale_key = TYPE_TABLES[table]
+
+            table_rows = {}
+            table_names = {}
+
+            for row in rows:
+                iso_639_1 = locale_codes.get(row[locale_key])
+
+                table_rows.setdefault(iso_639_1, []).append(
+                    MappingProxyType(dict(row))
+                )
+                table_names[(row[id_key], iso_639_1)] = row[name_key]
+
+            rows_by_table[table] = MappingProxyType({
+                iso_639_1: tuple(table_rows[iso_639_1])
+                for iso_639_1 in table_rows
+            })
+            names_by_table[table] = MappingProxyType(table_names)
+
+        self._rows = MappingProxyType(rows_by_table)
+        self._names = MappingProxyType(names_by_table)
+
+    def get_types(self, table: str, lang: Optional[str] = None):
+        rows = self._rows.get(table, {})
+
+        if not lang:
+            return sorted(
+                (row for locale_rows in rows.values() for row in locale_rows),
+                key=lambda row: row[TYPE_TABLES[table][2]]
+            )
+
+        if lang not in rows:
+            lang = DEFAULT_LOCALE
+
+        return list(rows.get(lang, ()))
+
+    def get_type_name(self, table: str, type_id: int, lang: str):
+        names = self._names.get(table, {})
+
+        for iso_639_1 in (lang, DEFAULT_LOCALE):
+            name = names.get((type_id, iso_639_1))
+
+            if name is not None:
+                return name
+
+        return next(
+            (name for (key, _), name in names.items() if key == type_id),
+            None
+        )
+
+    def get_countries(self, lang: str):
+        countries = [
+            row for row in self.countries
+            if row['country_iso_639_1'] == lang
+        ]
+
+        if not countries and lang != DEFAULT_LOCALE:
+            return self.get_countries(DEFAULT_LOCALE)
+
+        return countries
+
+
+registry = LookupRegistry([], {}, [], [])
+_refresh_lock = asyncio.Lock()
+
+
+async def refresh_lookup_registry(db: AsyncSession):
+    '''
+    Reload all lookup tables into a fresh snapshot. Call on startup and
+    after every write to one of the lookup tables.
+    '''
+    global registry
+
+    async with _refresh_lock:
+        locales = [dict(row) for row in await get_all_i18n_locales(db)]
+        countries = [dict(row) for row in await get_all_countrys(db, None)]
+        states = [dict(row) for row in await get_all_states(db)]
+
+        types = {}
+
+        for table, (loader, *_) in TYPE_TABLES.items():
+            types[table] = await loader(db, None)
+
+        registry = LookupRegistry(locales, types, countries, states)
+
+
+def get_lookup_registry() -> LookupRegistry:
+    return registry
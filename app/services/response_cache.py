@@ -0,0 +1,187 @@
+import time
+import asyncio
+import logging as log
+
+from collections import OrderedDict
+from datetime import datetime
+from functools import lru_cache
+from typing import Awaitable, Callable, NamedTuple, Optional
+
+from fastapi import HTTPException, Request
+from pydantic import TypeAdapter
+
+
+RESPONSE_CACHE_SIZE = 2048
+RESPONSE_CACHE_MAX_BYTES = 64 * 1024 * 1024
+RESPONSE_TTL = 60
+RESPONSE_STALE_TTL = 600
+
+# tables an endpoint reads mapped to the writes that invalidate it
+EVENT_CACHE_TAGS = ('event', 'venue', 'space', 'organizer')
+VENUE_CACHE_TAGS = ('venue', 'organizer')
+ORGANIZER_CACHE_TAGS = ('organizer',)
+SPACE_CACHE_TAGS = ('space',)
+
+
+@lru_cache(maxsize=None)
+def get_type_adapter(response_model):
+    return TypeAdapter(response_model)
+
+
+def encode_response(response_model, data) -> bytes:
+    adapter = get_type_adapter(response_model)
+
+    return adapter.dump_json(adapter.validate_python(data))
+
+
+class RenderedResponse(NamedTuple):
+    body: bytes
+    etag: str
+    modified_at: Optional[datetime]
+
+
+def get_entry_size(entry) -> int:
+    # rendered responses count by their body, plain entries are bytes
+    if isinstance(entry, RenderedResponse):
+        return len(entry.body)
+
+    return len(entry)
+
+
+def get_cache_key(request: Request, lang: Optional[str] = None):
+    '''
+    Normalize a request to its cache key: the order of query parameters
+    and empty values do not matter, the locale and base url do.
+    '''
+    params = tuple(sorted(
+        (key, value) for key, value in request.query_params.multi_items()
+        if value != '' and key != 'lang'
+    ))
+
+    return (str(request.base_url), request.url.path, params, lang)
+
+
+class ResponseCache:
+    '''
+    In process LRU of serialized response bodies bounded by entry count and
+    total size. Expired entries are served stale while a single background
+    render replaces them, concurrent misses share one render. Writes bump
+    the generation and drop the entries of their tags.
+    '''
+
+    def __init__(
+        self,
+        max_entries: int,
+        max_bytes: int,
+        ttl: int,
+        stale_ttl: int
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self._entries = OrderedDict()
+        self._pending = {}
+        self._size = 0
+        self._generation = 0
+
+    async def get_or_render(
+        self,
+        key: tuple,
+        render: Callable[[], Awaitable[bytes]],
+        tags: tuple
+    ) -> bytes:
+        entry = self._entries.get(key)
+
+        if entry:
+            body, _, created_at = entry
+            age = time.monotonic() - created_at
+
+            if age < self.ttl:
+                self._entries.move_to_end(key)
+
+                return body
+
+            if age < self.ttl + self.stale_ttl:
+                self._entries.move_to_end(key)
+
+                if key not in self._pending:
+                    self._start_render(key, render, tags)
+
+                return body
+
+        task = self._pending.get(key) or self._start_render(key, render, tags)
+
+        # a disconnecting client must not cancel the render others wait on
+        return await asyncio.shield(task)
+
+    def _start_render(self, key: tuple, render, tags: tuple):
+        task = asyncio.create_task(self._render(key, render, tags))
+        task.add_done_callback(self._finish_render)
+        self._pending[key] = task
+
+        return task
+
+    def _finish_render(self, task: asyncio.Task):
+        if task.cancelled():
+            return
+
+        # http errors reach the waiting request, anything else is logged
+        # because a background refresh has nobody waiting on it
+        error = task.exception()
+
+        if error and not isinstance(error, HTTPException):
+            log.warning(f'Response cache render failed: {error}')
+
+    async def _render(self, key: tuple, render, tags: tuple):
+        generation = self._generation
+
+        try:
+            body = await render()
+        finally:
+            self._pending.pop(key, None)
+
+        # a write landed while rendering, the body may predate it
+        if generation == self._generation:
+            self._store(key, body, tags)
+
+        return body
+
+    def _store(self, key: tuple, body: bytes, tags: tuple):
+        self._discard(key)
+
+        size = get_entry_size(body)
+
+        if size > self.max_bytes:
+            return
+
+        self._entries[key] = (body, frozenset(tags), time.monotonic())
+        self._size += size
+
+        while (
+            len(self._entries) > self.max_entries
+            or self._size > self.max_bytes
+        ):
+            _, (evicted, _, _) = self._entries.popitem(last=False)
+            self._size -= get_entry_size(evicted)
+
+    def _discard(self, key: tuple):
+        entry = self._entries.pop(key, None)
+
+        if entry:
+            self._size -= get_entry_size(entry[0])
+
+    def invalidate(self, *tags: str):
+        self._generation += 1
+
+        for key, (_, entry_tags, _) in list(self._entries.items()):
+            if entry_tags.intersection(tags):
+                self._discard(key)
+
+
+response_cache = ResponseCache(
+    RESPONSE_CACHE_SIZE,
+    RESPONSE_CACHE_MAX_BYTES,
+    RESPONSE_TTL,
+    RESPONSE_STALE_TTL
+)
@@ -0,0 +1,179 @@
+import os
+import gzip
+import json
+import shutil
+import hashlib
+
+from datetime import datetime, timezone
+from pathlib import Path
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.repository.snapshot import get_snapshot_stmts
+from app.services.streaming import STREAM_BATCH_SIZE, json_default
+
+
+SNAPSHOT_MANIFEST = 'manifest.json'
+
+# older snapshots stay until downloads started before the swap are done
+SNAPSHOT_KEEP = 2
+
+GEOJSON_HEAD = b'{"type":"FeatureCollection","features":[\n'
+GEOJSON_TAIL = b'\n]}\n'
+
+
+def encode_ndjson(rows, is_first_batch: bool) -> bytes:
+    return ''.join(
+        json.dumps(dict(row), default=json_default) + '\n' for row in rows
+    ).encode()
+
+
+def encode_geojson(rows, is_first_batch: bool) -> bytes:
+    features = []
+
+    for row in rows:
+        properties = dict(row)
+        longitude = properties.pop('longitude')
+        latitude = properties.pop('latitude')
+
+        geometry = None
+
+        if longitude is not None and latitude is not None:
+            geometry = {'type': 'Point', 'coordinates': [longitude, latitude]}
+
+        features.append(json.dumps({
+            'type': 'Feature',
+            'id': properties['id'],
+            'geometry': geometry,
+            'properties': properties
+        }, default=json_default))
+
+    separator = '' if is_first_batch else ',\n'
+
+    return (separator + ',\n'.join(features)).encode()
+
+
+# dataset -> files written from one pass over its rows
+SNAPSHOT_FILES = {
+    'venues': [
+        ('venues.ndjson.gz', encode_ndjson, b'', b''),
+        ('venues.geojson.gz', encode_geojson, GEOJSON_HEAD, GEOJSON_TAIL)
+    ],
+    'spaces': [('spaces.ndjson.gz', encode_ndjson, b'', b'')],
+    'organizers': [('organizers.ndjson.gz', encode_ndjson, b'', b'')],
+    'events': [('events.ndjson.gz', encode_ndjson, b'', b'')],
+    'event_dates': [('event_dates.ndjson.gz', encode_ndjson, b'', b'')]
+}
+
+
+def get_checksum(path: Path) -> str:
+    digest = hashlib.sha256()
+
+    with open(path, 'rb') as file:
+        for chunk in iter(lambda: file.read(1024 * 1024), b''):
+            digest.update(chunk)
+
+    return digest.hexdigest()
+
+
+def write_atomic(path: Path, content: bytes):
+    temp_path = path.with_name(f'.{path.name}.tmp')
+    temp_path.write_bytes(content)
+    os.replace(temp_path, path)
+
+
+async def write_dataset(db: AsyncSession, stmt, directory: Path, files: list):
+    '''
+    Stream one dataset from a server side cursor into its gzip files, a
+    batch of rows is encoded once per file and never held longer.
+    '''
+    outputs = []
+    count = 0
+
+    try:
+        for name, encode, head, tail in files:
+            output = gzip.GzipFile(directory / name, 'wb', mtime=0)
+            outputs.append((output, encode, tail))
+            output.write(head)
+
+        result = await db.stream(
+            stmt.execution_options(yield_per=STREAM_BATCH_SIZE)
+        )
+
+        async for rows in result.mappings().partitions():
+            for output, encode, _ in outputs:
+                output.write(encode(rows, count == 0))
+
+            count += len(rows)
+
+        for output, _, tail in outputs:
+            output.write(tail)
+    finally:
+        for output, _, _ in outputs:
+            output.close()
+
+    return count
+
+
+async def export_snapshot(db: AsyncSession, target: Path):
+    '''
+    Write every dataset into a new snapshot directory below target, then
+    swap the manifest pointing at it. Consumers read the manifest first and
+    never see a partially written snapshot. All datasets are read in one
+    repeatable read transaction and reference each other consistently.
+    '''
+    await db.connection(execution_options={'isolation_level': 'REPEATABLE READ'})
+
+    generated_at = datetime.now(timezone.utc)
+    name = generated_at.strftime('%Y%m%dT%H%M%SZ')
+
+    directory = target / name
+    temp_directory = target / f'.{name}.tmp'
+    temp_directory.mkdir(parents=True)
+
+    manifest_files = []
+
+    try:
+        for dataset, stmt in get_snapshot_stmts().items():
+            files = SNAPSHOT_FILES[dataset]
+            count = await write_dataset(db, stmt, temp_directory, files)
+
+            for file_name, _, _, _ in files:
+                path = temp_directory / file_name
+
+                manifest_files.append({
+                    'dataset': dataset,
+                    'path': f'{name}/{file_name}',
+                    'count': count,
+                    'bytes': path.stat().st_size,
+                    'sha256': get_checksum(path)
+                })
+    except BaseException:
+        shutil.rmtree(temp_directory, ignore_errors=True)
+        raise
+
+    os.replace(temp_directory, directory)
+
+    manifest = {
+        'generated_at': generated_at.isoformat(),
+        'snapshot': name,
+        'files': manifest_files
+    }
+
+    write_atomic(
+        target / SNAPSHOT_MANIFEST,
+        json.dumps(manifest, indent=2).encode()
+    )
+
+    remove_old_snapshots(target)
+
+    return manifest
+
+
+def remove_old_snapshots(target: Path, keep: int = SNAPSHOT_KEEP):
+    snapshots = sorted(
+        path for path in target.glob('*T*Z') if path.is_dir()
+    )
+
+    for path in snapshots[:-keep]:
+        shutil.rmtree(path, ignore_errors=True)
@@ -0,0 +1,131 @@
+import io
+import csv
+import json
+
+from datetime import date, datetime, time
+from decimal import Decimal
+from typing import Optional
+
+from fastapi import HTTPException, Request, status
+from fastapi.responses import StreamingResponse
+
+from app.db.session import AsyncSessionLocal
+
+
+STREAM_BATCH_SIZE = 500
+
+STREAM_MEDIA_TYPES = {
+    'ndjson': 'application/x-ndjson',
+    'json': 'application/json',
+    'csv': 'text/csv'
+}
+
+
+def get_stream_format(request: Request, format: Optional[str]):
+    '''
+    Resolve the requested streaming format from the format query parameter
+    or the Accept header. Returns None for the regular paged JSON response.
+    '''
+    if format:
+        if format not in STREAM_MEDIA_TYPES:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f'Unknown format: {format}'
+            )
+
+        return format
+
+    accept = request.headers.get('accept', '')
+
+    if 'application/x-ndjson' in accept:
+        return 'ndjson'
+
+    if 'text/csv' in accept:
+        return 'csv'
+
+    return None
+
+
+def json_default(value):
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+
+    if isinstance(value, Decimal):
+        return float(value)
+
+    raise TypeError(f'{type(value).__name__} is not JSON serializable')
+
+
+def csv_value(value):
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, default=json_default)
+
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+
+    return value
+
+
+async def stream_rows(stmt, format: str, params: dict = None):
+    '''
+    Run the statement on a server side cursor in its own session and yield
+    the encoded rows batch by batch, so memory stays flat for any result
+    size.
+    '''
+    stmt = stmt.execution_options(yield_per=STREAM_BATCH_SIZE)
+
+    async with AsyncSessionLocal() as session:
+        result = await session.stream(stmt, params)
+        is_first_batch = True
+
+        if format == 'json':
+            yield '['
+
+        async for rows in result.mappings().partitions():
+            buffer = io.StringIO()
+
+            if format == 'csv':
+                writer = csv.writer(buffer)
+
+                if is_first_batch:
+                    writer.writerow(rows[0].keys())
+
+                for row in rows:
+                    writer.writerow([csv_value(value) for value in row.values()])
+
+            elif format == 'json':
+                for index, row in enumerate(rows):
+                    if not is_first_batch or index > 0:
+                        buffer.write(',')
+
+                    buffer.write(json.dumps(dict(row), default=json_default))
+
+            else:
+                for row in rows:
+                    buffer.write(json.dumps(dict(row), default=json_default))
+                    buffer.write('\n')
+
+            is_first_batch = False
+
+            yield buffer.getvalue()
+
+        if format == 'json':
+            yield ']'
+
+
+def streaming_response(
+    stmt,
+    format: str,
+    filename: str,
+    params: dict = None
+):
+    headers = {}
+
+    if format == 'csv':
+        headers['Content-Disposition'] = f'attachment; filename="{filename}.csv"'
+
+    return StreamingResponse(
+        stream_rows(stmt, format, params),
+        media_type=STREAM_MEDIA_TYPES[format],
+        headers=headers
+    )
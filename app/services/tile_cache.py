@@ -0,0 +1,187 @@
+import asyncio
+import math
+import os
+import tempfile
+import time
+
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional
+from geoalchemy2.shape import to_shape
+
+from app.core.config import settings
+
+
+TILE_CACHE_SIZE = 4096
+MAX_TILE_ZOOM = 20
+
+# seconds a cached tile stays valid, upcoming events expire on their own
+TILE_TTL = {
+    'venues': 86400,
+    'events': 300
+}
+
+# a write only clears the memory of its own worker, the others hold a
+# changed tile at most this long before rereading the shared directory
+TILE_MEMORY_TTL = 60
+
+
+def get_tile_xy(lon: float, lat: float, z: int):
+    lat = max(min(lat, 85.0511), -85.0511)
+    n = 2 ** z
+
+    x = int((lon + 180.0) / 360.0 * n)
+    y = int(
+        (1.0 - math.asinh(math.tan(math.radians(lat))) / math.pi) / 2.0 * n
+    )
+
+    return min(max(x, 0), n - 1), min(max(y, 0), n - 1)
+
+
+class TileCache:
+    '''
+    LRU cache of encoded vector tiles in memory, backed by an optional tile
+    directory shared between workers. Entries expire after the layer TTL
+    and are dropped early for every tile around a changed venue. Memory
+    entries live at most TILE_MEMORY_TTL, the directory is the copy every
+    worker invalidates. The variant separates renderings of the same tile,
+    like the locale. File access runs in a thread, never on the loop.
+    '''
+
+    def __init__(self, max_entries: int, cache_dir: Optional[str] = None):
+        self.max_entries = max_entries
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self._tiles = OrderedDict()
+
+    def get_path(self, key: tuple):
+        layer, variant, z, x, y = key
+
+        return self.cache_dir / layer / variant / str(z) / str(x) / f'{y}.mvt'
+
+    async def get(self, layer: str, variant: str, z: int, x: int, y: int):
+        key = (layer, variant, z, x, y)
+        entry = self._tiles.get(key)
+
+        if entry:
+            created_at, stored_at, tile = entry
+            now = time.time()
+
+            if (now - created_at < TILE_TTL[layer]
+                    and now - stored_at < TILE_MEMORY_TTL):
+                self._tiles.move_to_end(key)
+
+                return tile
+
+            del self._tiles[key]
+
+        if not self.cache_dir:
+            return None
+
+        entry = await asyncio.to_thread(
+            read_tile, self.get_path(key), TILE_TTL[layer]
+        )
+
+        if entry is None:
+            return None
+
+        created_at, tile = entry
+        self._store(key, tile, created_at)
+
+        return tile
+
+    async def set(
+        self,
+        layer: str,
+        variant: str,
+        z: int,
+        x: int,
+        y: int,
+        tile: bytes
+    ):
+        key = (layer, variant, z, x, y)
+
+        self._store(key, tile, time.time())
+
+        if self.cache_dir:
+            await asyncio.to_thread(write_tile, self.get_path(key), tile)
+
+    def _store(self, key: tuple, tile: bytes, created_at: float):
+        self._tiles[key] = (created_at, time.time(), tile)
+        self._tiles.move_to_end(key)
+
+        while len(self._tiles) > self.max_entries:
+            self._tiles.popitem(last=False)
+
+    async def invalidate_point(self, lon: float, lat: float):
+        '''
+        Drop every cached tile on any zoom level that may contain the
+        point, including the neighbours reaching it through the buffer.
+        '''
+        touched = set()
+
+        for z in range(MAX_TILE_ZOOM + 1):
+            tile_x, tile_y = get_tile_xy(lon, lat, z)
+            n = 2 ** z
+
+            for x in range(max(tile_x - 1, 0), min(tile_x + 2, n)):
+                for y in range(max(tile_y - 1, 0), min(tile_y + 2, n)):
+                    touched.add((z, x, y))
+
+        for key in list(self._tiles):
+            if key[2:] in touched:
+                del self._tiles[key]
+
+        if self.cache_dir:
+            await asyncio.to_thread(self._unlink_tiles, touched)
+
+    def _unlink_tiles(self, touched: set):
+        for layer in TILE_TTL:
+            layer_dir = self.cache_dir / layer
+
+            if not layer_dir.is_dir():
+                continue
+
+            for variant_dir in layer_dir.iterdir():
+                for z, x, y in touched:
+                    key = (layer, variant_dir.name, z, x, y)
+                    self.get_path(key).unlink(missing_ok=True)
+
+
+def read_tile(path: Path, ttl: int):
+    # the mtime is the creation time of the tile in every worker
+    try:
+        created_at = path.stat().st_mtime
+
+        if time.time() - created_at >= ttl:
+            return None
+
+        return created_at, path.read_bytes()
+    except FileNotFoundError:
+        return None
+
+
+def write_tile(path: Path, tile: bytes):
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    # every writer gets its own temp file, readers never see a partial tile
+    with tempfile.NamedTemporaryFile(
+        dir=path.parent, prefix=f'.{path.name}.', delete=False
+    ) as f:
+        f.write(tile)
+
+    try:
+        os.replace(f.name, path)
+    except OSError:
+        os.unlink(f.name)
+        raise
+
+
+tile_cache = TileCache(TILE_CACHE_SIZE, settings.TILE_CACHE_DIR)
+
+
+async def invalidate_venue_tiles(wkb_geometry):
+    if wkb_geometry is None:
+        return
+
+    point = to_shape(wkb_geometry)
+    await tile_cache.invalidate_point(point.x, point.y)
@@ -0,0 +1,32 @@
+--
+-- Effective venue, space and main image per event date, the date values
+-- win over the event values, maintained by the API on write
+--
+
+ALTER TABLE uranus.event_date ADD COLUMN IF NOT EXISTS resolved_venue_id integer;
+ALTER TABLE uranus.event_date ADD COLUMN IF NOT EXISTS resolved_space_id integer;
+ALTER TABLE uranus.event_date ADD COLUMN IF NOT EXISTS resolved_image_id integer;
+
+
+ALTER TABLE uranus.event_date DROP CONSTRAINT IF EXISTS event_date_resolved_venue_id_fkey;
+ALTER TABLE uranus.event_date ADD CONSTRAINT event_date_resolved_venue_id_fkey FOREIGN KEY (resolved_venue_id) REFERENCES uranus.venue(id) ON DELETE SET NULL;
+ALTER TABLE uranus.event_date DROP CONSTRAINT IF EXISTS event_date_resolved_space_id_fkey;
+ALTER TABLE uranus.event_date ADD CONSTRAINT event_date_resolved_space_id_fkey FOREIGN KEY (resolved_space_id) REFERENCES uranus.space(id) ON DELETE SET NULL;
+ALTER TABLE uranus.event_date DROP CONSTRAINT IF EXISTS event_date_resolved_image_id_fkey;
+ALTER TABLE uranus.event_date ADD CONSTRAINT event_date_resolved_image_id_fkey FOREIGN KEY (resolved_image_id) REFERENCES uranus.image(id) ON DELETE SET NULL;
+
+
+UPDATE uranus.event_date AS ed SET
+    resolved_venue_id = COALESCE(ed.venue_id, e.venue_id),
+    resolved_space_id = COALESCE(ed.space_id, e.space_id),
+    resolved_image_id = COALESCE(
+        (SELECT edli.image_id FROM uranus.event_date_link_images AS edli WHERE edli.event_date_id = ed.id AND edli.main_image ORDER BY edli.image_id LIMIT 1),
+        (SELECT eli.image_id FROM uranus.event_link_images AS eli WHERE eli.event_id = e.id AND eli.main_image ORDER BY eli.image_id LIMIT 1)
+    )
+FROM uranus.event AS e
+WHERE e.id = ed.event_id;
+
+
+CREATE INDEX IF NOT EXISTS event_date_resolved_venue_id_idx ON uranus.event_date USING btree (resolved_venue_id);
+CREATE INDEX IF NOT EXISTS event_date_resolved_space_id_idx ON uranus.event_date USING btree (resolved_space_id);
+CREATE INDEX IF NOT EXISTS event_date_resolved_image_id_idx ON uranus.event_date USING btree (resolved_image_id);
@@ -0,0 +1,10 @@
+--
+-- Recurrence rule of event series, the API materialises the dates into
+-- event_date and tools/extend_event_series.py extends open ended series
+--
+
+ALTER TABLE uranus.event ADD COLUMN IF NOT EXISTS recurrence_rule text;
+
+
+CREATE INDEX IF NOT EXISTS event_recurrence_rule_idx ON uranus.event USING btree (id) WHERE recurrence_rule IS NOT NULL;
+CREATE INDEX IF NOT EXISTS event_date_event_id_date_start_idx ON uranus.event_date USING btree (event_id, date_start);
@@ -0,0 +1,60 @@
+--
+-- Flat per locale projection of event dates, maintained by the API on write
+--
+
+CREATE TABLE IF NOT EXISTS uranus.event_search (
+    event_date_id integer NOT NULL,
+    iso_639_1 character varying(2) NOT NULL,
+    event_id integer NOT NULL,
+    venue_id integer,
+    venue_name character varying(255),
+    venue_postcode character varying(20),
+    venue_city character varying(100),
+    space_id integer,
+    space_name character varying(255),
+    space_type text,
+    organizer_id integer,
+    organizer_name character varying(255),
+    event_title character varying(255) NOT NULL,
+    event_description text NOT NULL,
+    event_date_start timestamp without time zone NOT NULL,
+    event_date_end timestamp without time zone,
+    event_created_at timestamp without time zone NOT NULL,
+    event_type text,
+    genre_type text,
+    venue_type text,
+    event_type_ids integer[],
+    genre_type_ids integer[],
+    venue_type_ids integer[],
+    image_source_name character varying(64),
+    wkb_geometry public.geometry(Point,4326),
+    modified_at timestamp without time zone DEFAULT CURRENT_TIMESTAMP NOT NULL,
+    CONSTRAINT event_search_pkey PRIMARY KEY (event_date_id, iso_639_1),
+    CONSTRAINT event_search_event_date_id_fkey FOREIGN KEY (event_date_id) REFERENCES uranus.event_date(id) ON DELETE CASCADE,
+    CONSTRAINT event_search_event_id_fkey FOREIGN KEY (event_id) REFERENCES uranus.event(id) ON DELETE CASCADE
+);
+
+
+-- added with date range filtering, holds date_end or date_start when unset
+ALTER TABLE uranus.event_search ADD COLUMN IF NOT EXISTS event_date_end timestamp without time zone;
+
+-- added with the teaser mode of the event lists, holds teaser_text or the
+-- shortened description, refresh the projection afterwards
+ALTER TABLE uranus.event ADD COLUMN IF NOT EXISTS teaser_text text;
+ALTER TABLE uranus.event_search ADD COLUMN IF NOT EXISTS event_teaser text;
+
+
+CREATE INDEX IF NOT EXISTS event_search_date_start_idx ON uranus.event_search USING btree (iso_639_1, event_date_start, event_date_id);
+CREATE INDEX IF NOT EXISTS event_search_date_end_idx ON uranus.event_search USING btree (iso_639_1, event_date_end);
+CREATE INDEX IF NOT EXISTS event_search_created_at_idx ON uranus.event_search USING btree (iso_639_1, event_created_at, event_id, event_date_id);
+CREATE INDEX IF NOT EXISTS event_search_event_id_idx ON uranus.event_search USING btree (event_id);
+CREATE INDEX IF NOT EXISTS event_search_venue_id_idx ON uranus.event_search USING btree (venue_id);
+CREATE INDEX IF NOT EXISTS event_search_space_id_idx ON uranus.event_search USING btree (space_id);
+CREATE INDEX IF NOT EXISTS event_search_organizer_id_idx ON uranus.event_search USING btree (organizer_id);
+CREATE INDEX IF NOT EXISTS event_search_venue_city_idx ON uranus.event_search USING btree (venue_city);
+CREATE INDEX IF NOT EXISTS event_search_venue_postcode_idx ON uranus.event_search USING btree (venue_postcode);
+CREATE INDEX IF NOT EXISTS event_search_event_type_ids_idx ON uranus.event_search USING gin (event_type_ids);
+CREATE INDEX IF NOT EXISTS event_search_genre_type_ids_idx ON uranus.event_search USING gin (genre_type_ids);
+CREATE INDEX IF NOT EXISTS event_search_venue_type_ids_idx ON uranus.event_search USING gin (venue_type_ids);
+CREATE INDEX IF NOT EXISTS event_search_wkb_geometry_idx ON uranus.event_search USING gist (wkb_geometry);
+CREATE INDEX IF NOT EXISTS event_search_wkb_geography_idx ON uranus.event_search USING gist (geography(wkb_geometry));
@@ -0,0 +1,9 @@
+--
+-- Processing state of images, uploads are stored as they are and resized
+-- by the image pipeline of the API or tools/process_images.py
+--
+
+ALTER TABLE uranus.image ADD COLUMN IF NOT EXISTS status character varying(16) DEFAULT 'ready' NOT NULL;
+
+
+CREATE INDEX IF NOT EXISTS image_status_processing_idx ON uranus.image USING btree (id) WHERE status = 'processing';
@@ -0,0 +1,6 @@
+--
+-- Geography index next to venue_wkb_geometry_idx, radius searches and KNN
+-- ordering in metres use it through the geography(wkb_geometry) expression
+--
+
+CREATE INDEX IF NOT EXISTS venue_wkb_geography_idx ON uranus.venue USING gist (geography(wkb_geometry));
@@ -209,7 +209,7 @@ async function fetchItemDetailById(id) {
     throw new Error(`HTTP error! Status: ${response.status}`)
   }
 
-  const eventObjects = await response.json()
+  const { events: eventObjects } = await response.json()
   mapContainer.classList.add('hidden')
   listContainer.classList.remove('hidden')
   listResultsContainer.innerHTML = ''
@@ -522,7 +522,7 @@ async function handleFormChange() {
       throw new Error(`HTTP error! Status: ${response.status}`)
     }
 
-    const eventObjects = await response.json()
+    const { events: eventObjects } = await response.json()
 
     mapContainer.classList.add('hidden')
     listContainer.classList.remove('hidden')
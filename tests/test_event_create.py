@@ -0,0 +1,93 @@
+import asyncio
+
+from datetime import datetime
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+from app.api.v1.endpoints.event import create_event
+
+
+DATE_START = datetime(2026, 5, 1, 20, 0)
+
+
+class CountingSession:
+    '''
+    Stands in for the AsyncSession of create_event and counts every round
+    trip to the database, each execute is one statement.
+    '''
+
+    def __init__(self):
+        self.statements = []
+        self.commits = 0
+
+    async def execute(self, stmt, params=None):
+        self.statements.append(stmt)
+
+        result = MagicMock()
+        result.mappings.return_value.one.return_value = {
+            'id': 1,
+            'title': 'Jazz Night',
+            'description': 'Live music',
+            'organizer_id': 1,
+            'venue_id': 2,
+            'space_id': None
+        }
+        result.mappings.return_value.all.return_value = [
+            {'id': 10, 'date_start': DATE_START}
+        ]
+
+        return result
+
+    async def commit(self):
+        self.commits += 1
+
+    async def rollback(self):
+        pass
+
+    @property
+    def round_trips(self):
+        return len(self.statements) + self.commits
+
+
+def create(type_ids, genre_type_ids):
+    db = CountingSession()
+
+    asyncio.run(create_event(
+        event_title='Jazz Night',
+        event_description='Live music',
+        event_organizer_id=1,
+        event_venue_id=2,
+        event_type_id=type_ids,
+        event_space_id=None,
+        event_genre_type_id=genre_type_ids,
+        event_image_type_id=None,
+        event_image_license_type_id=None,
+        event_date_start=DATE_START,
+        event_date_end=None,
+        event_recurrence_rule=None,
+        event_dates=None,
+        event_image_alt=None,
+        event_image_caption=None,
+        file=None,
+        ext=None,
+        current_user=SimpleNamespace(user_id=1),
+        db=db
+    ))
+
+    return db
+
+
+def test_create_event_commits_once():
+    db = create([1, 2, 3], [4, 5])
+
+    assert db.commits == 1
+
+
+def test_create_event_round_trips_do_not_grow_with_links():
+    # event, dates, types, genres, date references, event_search delete
+    # and insert, commit
+    single = create([1], [4])
+    several = create([1, 2, 3], [4, 5, 6])
+
+    assert single.round_trips == 8
+    assert several.round_trips == single.round_trips
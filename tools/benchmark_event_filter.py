@@ -0,0 +1,115 @@
+import sys
+import click
+import time
+import traceback
+import logging as log
+
+from dotenv import load_dotenv
+from pathlib import Path
+
+
+# make the app package importable when run from the tools directory
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+
+# log uncaught exceptions
+def log_exceptions(type, value, tb):
+    for line in traceback.TracebackException(type, value, tb).format(chain=True):
+        log.exception(line)
+
+    log.exception(value)
+
+    sys.__excepthook__(type, value, tb) # calls default excepthook
+
+
+SAMPLE_FILTERS = [
+    {'city': 'Flensburg'},
+    {'city': 'Flensburg', 'date_start': '>=05.2025'},
+    {'venue_id': [1, 2, 3], 'event_type_id': [4]},
+    {'venue_id': [7], 'event_type_id': [1, 2], 'genre_type_id': [3, 5, 8]},
+    {'postal_code': '24937', 'date_start': '>=2025', 'date_end': '<2026'}
+]
+
+
+def run_benchmark(iterations):
+    from sqlalchemy.dialects import postgresql
+
+    from app.db.repository.event import (
+        build_events_by_filter_stmt,
+        get_events_by_filter_params,
+        get_events_by_filter_stmt
+    )
+
+    dialect = postgresql.asyncpg.dialect()
+    base_url = 'http://localhost:8000/'
+    build_uncached = build_events_by_filter_stmt.__wrapped__
+    requests = iterations * len(SAMPLE_FILTERS)
+
+    # before: every request builds a new construct, generates its cache
+    # key and compiles it
+    construct = compile = 0
+
+    for _ in range(iterations):
+        for filters in SAMPLE_FILTERS:
+            started = time.perf_counter()
+            shape, params = get_events_by_filter_params(filters, base_url)
+            stmt = build_uncached(shape)
+            stmt._generate_cache_key()
+            construct += time.perf_counter() - started
+
+            started = time.perf_counter()
+            stmt.compile(dialect=dialect)
+            compile += time.perf_counter() - started
+
+    log.info(
+        f'before: construct {construct / requests * 1e6:.1f} us, '
+        f'compile {compile / requests * 1e6:.1f} us per request'
+    )
+
+    before = construct + compile
+
+    # after: the prebuilt statement is looked up by shape, its cache key is
+    # memoized and the compiled form is reused like the engine cache does
+    build_events_by_filter_stmt.cache_clear()
+    compiled_cache = {}
+    construct = compile = 0
+
+    for _ in range(iterations):
+        for filters in SAMPLE_FILTERS:
+            started = time.perf_counter()
+            stmt, params = get_events_by_filter_stmt(filters, base_url)
+            cache_key = stmt._generate_cache_key().key
+            construct += time.perf_counter() - started
+
+            started = time.perf_counter()
+
+            if cache_key not in compiled_cache:
+                compiled_cache[cache_key] = stmt.compile(dialect=dialect)
+
+            compile += time.perf_counter() - started
+
+    log.info(
+        f'after: construct {construct / requests * 1e6:.1f} us, '
+        f'compile {compile / requests * 1e6:.1f} us per request'
+    )
+
+    after = construct + compile
+
+    log.info(f'speedup: {before / after:.1f}x over {requests} requests')
+
+
+@click.command()
+@click.option('--env', '-e', type=str, required=True, help='Path to local dot env file')
+@click.option('--iterations', '-i', type=int, default=1000, help='Repetitions of the sample filter set')
+def main(env, iterations):
+    log.basicConfig(format='%(levelname)s: %(message)s', level=log.INFO)
+
+    load_dotenv(dotenv_path=Path(env))
+
+    run_benchmark(iterations)
+
+
+if __name__ == '__main__':
+    sys.excepthook = log_exceptions
+
+    main()
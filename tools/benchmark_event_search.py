@@ -0,0 +1,217 @@
+import sys
+import click
+import time
+import asyncio
+import traceback
+import logging as log
+
+from dotenv import load_dotenv
+from pathlib import Path
+from datetime import datetime
+
+
+# make the app package importable when run from the tools directory
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+
+# log uncaught exceptions
+def log_exceptions(type, value, tb):
+    for line in traceback.TracebackException(type, value, tb).format(chain=True):
+        log.exception(line)
+
+    log.exception(value)
+
+    sys.__excepthook__(type, value, tb) # calls default excepthook
+
+
+def get_fan_out_source():
+    '''
+    The previous projection query, every link table joined before a single
+    group by, kept here as the baseline.
+    '''
+    from sqlalchemy import true
+    from sqlalchemy.future import select
+    from sqlalchemy.sql import func
+
+    from app.models.i18n_locale import I18nLocale
+    from app.models.event import Event
+    from app.models.event_date import EventDate
+    from app.models.event_link_types import EventLinkTypes
+    from app.models.event_type import EventType
+    from app.models.genre_link_types import GenreLinkTypes
+    from app.models.genre_type import GenreType
+    from app.models.venue_link_types import VenueLinkTypes
+    from app.models.venue_type import VenueType
+    from app.models.venue import Venue
+
+    return (
+        select(
+            EventDate.id.label('event_date_id'),
+            I18nLocale.iso_639_1.label('iso_639_1'),
+            Event.id.label('event_id'),
+            func.string_agg(func.distinct(EventType.name), ', '),
+            func.string_agg(func.distinct(GenreType.name), ', '),
+            func.string_agg(func.distinct(VenueType.name), ', '),
+            func.array_agg(func.distinct(EventLinkTypes.event_type_id)),
+            func.array_agg(func.distinct(GenreLinkTypes.genre_type_id)),
+            func.array_agg(func.distinct(VenueLinkTypes.venue_type_id))
+        )
+        .select_from(Event)
+        .join(EventDate, Event.id == EventDate.event_id)
+        .join(I18nLocale, true())
+        .outerjoin(Venue, Venue.id == func.coalesce(
+            EventDate.venue_id, Event.venue_id)
+        )
+        .outerjoin(EventLinkTypes, EventLinkTypes.event_id == Event.id)
+        .outerjoin(
+            EventType,
+            (EventType.type_id == EventLinkTypes.event_type_id) &
+            (EventType.i18n_locale_id == I18nLocale.id)
+        )
+        .outerjoin(GenreLinkTypes, GenreLinkTypes.event_id == Event.id)
+        .outerjoin(
+            GenreType,
+            (GenreType.type_id == GenreLinkTypes.genre_type_id) &
+            (GenreType.i18n_locale_id == I18nLocale.id)
+        )
+        .outerjoin(VenueLinkTypes, VenueLinkTypes.venue_id == Venue.id)
+        .outerjoin(
+            VenueType,
+            (VenueType.type_id == VenueLinkTypes.venue_type_id) &
+            (VenueType.i18n_locale_id == I18nLocale.id)
+        )
+        .group_by(EventDate.id, I18nLocale.id, Event.id)
+    )
+
+
+async def insert_tagged_events(session, events, tags):
+    from sqlalchemy import insert
+    from sqlalchemy.future import select
+    from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+    from app.models.event import Event
+    from app.models.event_date import EventDate
+    from app.models.event_link_types import EventLinkTypes
+    from app.models.event_type import EventType
+    from app.models.genre_link_types import GenreLinkTypes
+    from app.models.genre_type import GenreType
+    from app.models.venue_link_types import VenueLinkTypes
+    from app.models.venue_type import VenueType
+    from app.models.venue import Venue
+    from app.models.organizer import Organizer
+
+    venue = (await session.execute(select(Venue).limit(1))).scalars().first()
+    organizer_id = (
+        await session.execute(select(Organizer.id).limit(1))
+    ).scalar()
+
+    if not venue or not organizer_id:
+        raise click.ClickException(
+            'The benchmark needs at least one venue and organizer')
+
+    async def first_ids(model):
+        result = await session.execute(
+            select(model.id).order_by(model.id).limit(tags))
+
+        return result.scalars().all()
+
+    event_type_ids = await first_ids(EventType)
+    genre_type_ids = await first_ids(GenreType)
+    venue_type_ids = await first_ids(VenueType)
+
+    result = await session.execute(
+        insert(Event).returning(Event.id),
+        [{
+            'organizer_id': organizer_id,
+            'venue_id': venue.id,
+            'title': f'Benchmark {index}',
+            'description': 'Benchmark',
+            'created_at': datetime.now()
+        } for index in range(events)]
+    )
+    event_ids = result.scalars().all()
+
+    await session.execute(insert(EventDate), [{
+        'event_id': event_id,
+        'venue_id': venue.id,
+        'date_start': datetime.now(),
+        'created_at': datetime.now()
+    } for event_id in event_ids])
+
+    await session.execute(insert(EventLinkTypes), [
+        {'event_id': event_id, 'event_type_id': type_id}
+        for event_id in event_ids for type_id in event_type_ids
+    ])
+
+    await session.execute(insert(GenreLinkTypes), [
+        {'event_id': event_id, 'genre_type_id': type_id}
+        for event_id in event_ids for type_id in genre_type_ids
+    ])
+
+    await session.execute(
+        pg_insert(VenueLinkTypes).on_conflict_do_nothing(),
+        [{'venue_id': venue.id, 'venue_type_id': type_id}
+         for type_id in venue_type_ids]
+    )
+
+    log.info(
+        f'inserted {len(event_ids)} events with {len(event_type_ids)} event '
+        f'types, {len(genre_type_ids)} genres and {len(venue_type_ids)} '
+        'venue types each'
+    )
+
+    return event_ids
+
+
+async def time_source(session, source, event_ids, repeat):
+    from app.models.event import Event
+
+    stmt = source.where(Event.id.in_(event_ids))
+    timings = []
+
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = await session.execute(stmt)
+        rows = len(result.all())
+        timings.append(time.perf_counter() - started)
+
+    return rows, min(timings)
+
+
+async def run_benchmark(events, tags, repeat):
+    from app.db.session import AsyncSessionLocal
+    from app.db.repository.event_search import get_event_search_source
+
+    async with AsyncSessionLocal() as session:
+        try:
+            event_ids = await insert_tagged_events(session, events, tags)
+
+            rows, fan_out = await time_source(
+                session, get_fan_out_source(), event_ids, repeat)
+            log.info(f'fan out join: {rows} rows in {fan_out * 1000:.1f} ms')
+
+            rows, subqueries = await time_source(
+                session, get_event_search_source(), event_ids, repeat)
+            log.info(f'subqueries: {rows} rows in {subqueries * 1000:.1f} ms')
+        finally:
+            # nothing written by the benchmark is kept
+            await session.rollback()
+
+
+@click.command()
+@click.option('--env', '-e', type=str, required=True, help='Path to local dot env file')
+@click.option('--events', type=int, default=500, help='Number of benchmark events')
+@click.option('--tags', type=int, default=6, help='Event types, genres and venue types per event')
+@click.option('--repeat', type=int, default=5, help='Runs per query, the fastest one counts')
+def main(env, events, tags, repeat):
+    log.basicConfig(format='%(levelname)s: %(message)s', level=log.INFO)
+
+    load_dotenv(dotenv_path=Path(env))
+
+    asyncio.run(run_benchmark(events, tags, repeat))
+
+
+if __name__ == '__main__':
+    sys.excepthook = log_exceptions
+
+    main()
@@ -0,0 +1,65 @@
+import sys
+import click
+import asyncio
+import traceback
+import logging as log
+
+from dotenv import load_dotenv
+from pathlib import Path
+
+
+# make the app package importable when run from the tools directory
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+
+# log uncaught exceptions
+def log_exceptions(type, value, tb):
+    for line in traceback.TracebackException(type, value, tb).format(chain=True):
+        log.exception(line)
+
+    log.exception(value)
+
+    sys.__excepthook__(type, value, tb) # calls default excepthook
+
+
+async def export(target):
+    from app.core.config import settings
+    from app.db.session import AsyncSessionLocal
+    from app.services.snapshot import export_snapshot
+
+    target = target or settings.SNAPSHOT_DIR
+
+    if not target:
+        log.error('Pass --target or set SNAPSHOT_DIR')
+        sys.exit(1)
+
+    target = Path(target)
+
+    async with AsyncSessionLocal() as session:
+        manifest = await export_snapshot(session, target)
+
+    for file in manifest['files']:
+        log.info(f'{file["path"]}: {file["count"]} rows, {file["bytes"]} bytes')
+
+    log.info(f'wrote snapshot {manifest["snapshot"]} to {target}')
+
+
+@click.command()
+@click.option('--env', '-e', type=str, required=True, help='Path to local dot env file')
+@click.option('--target', '-t', type=str, help='Snapshot directory, defaults to SNAPSHOT_DIR')
+@click.option('--verbose', '-v', is_flag=True, help='Print more verbose output')
+def main(env, target, verbose):
+    if verbose:
+        log.basicConfig(format='%(levelname)s: %(message)s', level=log.INFO)
+    else:
+        log.basicConfig(format='%(levelname)s: %(message)s')
+
+    load_dotenv(dotenv_path=Path(env))
+
+    asyncio.run(export(target))
+
+
+if __name__ == '__main__':
+    sys.excepthook = log_exceptions
+
+    main()
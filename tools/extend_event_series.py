@@ -0,0 +1,60 @@
+import sys
+import click
+import asyncio
+import traceback
+import logging as log
+
+from dotenv import load_dotenv
+from pathlib import Path
+
+
+# make the app package importable when run from the tools directory
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+
+# log uncaught exceptions
+def log_exceptions(type, value, tb):
+    for line in traceback.TracebackException(type, value, tb).format(chain=True):
+        log.exception(line)
+
+    log.exception(value)
+
+    sys.__excepthook__(type, value, tb) # calls default excepthook
+
+
+async def extend_series():
+    from app.db.session import AsyncSessionLocal
+    from app.db.repository.event_date import (
+        extend_event_series,
+        refresh_event_date_references
+    )
+    from app.db.repository.event_search import refresh_event_search
+
+    async with AsyncSessionLocal() as session:
+        event_ids = await extend_event_series(session)
+
+        await refresh_event_date_references(session, event_ids=event_ids)
+        await refresh_event_search(session, event_ids=event_ids)
+        await session.commit()
+
+    log.info(f'extended {len(event_ids)} event series')
+
+
+@click.command()
+@click.option('--env', '-e', type=str, required=True, help='Path to local dot env file')
+@click.option('--verbose', '-v', is_flag=True, help='Print more verbose output')
+def main(env, verbose):
+    if verbose:
+        log.basicConfig(format='%(levelname)s: %(message)s', level=log.INFO)
+    else:
+        log.basicConfig(format='%(levelname)s: %(message)s')
+
+    load_dotenv(dotenv_path=Path(env))
+
+    asyncio.run(extend_series())
+
+
+if __name__ == '__main__':
+    sys.excepthook = log_exceptions
+
+    main()
@@ -0,0 +1,74 @@
+import sys
+import click
+import asyncio
+import traceback
+import logging as log
+
+from dotenv import load_dotenv
+from pathlib import Path
+
+
+# make the app package importable when run from the tools directory
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+
+# log uncaught exceptions
+def log_exceptions(type, value, tb):
+    for line in traceback.TracebackException(type, value, tb).format(chain=True):
+        log.exception(line)
+
+    log.exception(value)
+
+    sys.__excepthook__(type, value, tb) # calls default excepthook
+
+
+async def import_file(path, format):
+    from app.db.session import AsyncSessionLocal
+    from app.db.repository.event_import import import_events
+    from app.services.event_import import parse_import_rows
+
+    rows, errors = parse_import_rows(path.read_text(encoding='utf-8-sig'), format)
+
+    if not errors:
+        async with AsyncSessionLocal() as session:
+            event_ids, errors = await import_events(session, rows)
+
+            if errors:
+                await session.rollback()
+            else:
+                await session.commit()
+
+    for error in errors:
+        log.error(f'row {error.row}: {"; ".join(error.errors)}')
+
+    if errors:
+        return False
+
+    log.info(f'imported {len(event_ids)} events from {path}')
+
+    return True
+
+
+@click.command()
+@click.option('--env', '-e', type=str, required=True, help='Path to local dot env file')
+@click.option('--file', '-f', 'path', type=click.Path(exists=True, dir_okay=False, path_type=Path), required=True, help='NDJSON or CSV file of events')
+@click.option('--format', type=click.Choice(['ndjson', 'csv']), help='File format, defaults to the file extension')
+@click.option('--verbose', '-v', is_flag=True, help='Print more verbose output')
+def main(env, path, format, verbose):
+    if verbose:
+        log.basicConfig(format='%(levelname)s: %(message)s', level=log.INFO)
+    else:
+        log.basicConfig(format='%(levelname)s: %(message)s')
+
+    load_dotenv(dotenv_path=Path(env))
+
+    format = format or ('csv' if path.suffix.lower() == '.csv' else 'ndjson')
+
+    if not asyncio.run(import_file(path, format)):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    sys.excepthook = log_exceptions
+
+    main()
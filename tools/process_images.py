@@ -0,0 +1,72 @@
+import sys
+import click
+import asyncio
+import traceback
+import logging as log
+
+from dotenv import load_dotenv
+from datetime import datetime, timedelta
+from pathlib import Path
+
+
+# make the app package importable when run from the tools directory
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+
+# log uncaught exceptions
+def log_exceptions(type, value, tb):
+    for line in traceback.TracebackException(type, value, tb).format(chain=True):
+        log.exception(line)
+
+    log.exception(value)
+
+    sys.__excepthook__(type, value, tb) # calls default excepthook
+
+
+async def process_images(workers, min_age):
+    from app.db.session import AsyncSessionLocal
+    from app.db.repository.image import get_processing_images
+    from app.services.image_pipeline import ImagePipeline
+
+    # younger uploads are still handled by the API that received them
+    before = datetime.now() - timedelta(minutes=min_age)
+
+    async with AsyncSessionLocal() as session:
+        images = await get_processing_images(session, before)
+
+    pipeline = ImagePipeline(workers)
+
+    try:
+        statuses = await asyncio.gather(*[
+            pipeline.process(image['id'], image['source_name'])
+            for image in images
+        ])
+    finally:
+        pipeline.shutdown()
+
+    log.info(
+        f'processed {statuses.count("ready")} images, '
+        f'{statuses.count("failed")} failed'
+    )
+
+
+@click.command()
+@click.option('--env', '-e', type=str, required=True, help='Path to local dot env file')
+@click.option('--workers', '-w', type=int, default=2, help='Number of worker processes')
+@click.option('--min-age', '-m', type=int, default=10, help='Minutes an image must be processing before it is picked up')
+@click.option('--verbose', '-v', is_flag=True, help='Print more verbose output')
+def main(env, workers, min_age, verbose):
+    if verbose:
+        log.basicConfig(format='%(levelname)s: %(message)s', level=log.INFO)
+    else:
+        log.basicConfig(format='%(levelname)s: %(message)s')
+
+    load_dotenv(dotenv_path=Path(env))
+
+    asyncio.run(process_images(workers, min_age))
+
+
+if __name__ == '__main__':
+    sys.excepthook = log_exceptions
+
+    main()